@@ -0,0 +1,104 @@
+"""Benchmark of the commands answered by the devices of a ship.
+
+It measures how many commands per second a single core answers for the
+commands that controllers send the most, without any process or pipe in the
+way, only the parsing and the dispatch of the command and the formatting of
+the answer. Run it from the root of the repository:
+
+    python3 -m benchmarks.devicecommands [-n COMMANDS] [-r REPEAT]
+"""
+
+import time
+import argparse
+from typing import TYPE_CHECKING
+
+import pymunk
+
+from src.devices.engine import LinearEngine
+from src.devices.sensors import AngleSensor, XPositionSensor
+from src.devices.structure import StructuralPart, Structure
+
+if TYPE_CHECKING:
+    # pylint: disable=ungrouped-imports
+    from typing import Callable, List, Tuple
+    # pylint: enable=ungrouped-imports
+
+COMMANDS = (
+    'body:x:read',
+    'body:angle:read',
+    'body:engine:set-property intensity 0.5',
+    'body:engine:get-property intensity',
+    '0:0:read',
+    'body:x:reading-time'
+)
+
+def createShip() -> 'Structure':
+
+    space = pymunk.Space()
+    body = pymunk.Body(1, 1)
+    space.add(body)
+
+    ship = Structure('benchmark', space, body)
+
+    part = StructuralPart()
+    ship.addDevice(part, name='body')
+
+    part.addDevice(XPositionSensor(part, 0), name='x')
+    part.addDevice(AngleSensor(part, 0), name='angle')
+    part.addDevice(LinearEngine(part, 0, 1, 0, 0), name='engine')
+
+    return ship
+
+def measure(function: 'Callable[[str], object]', commands: 'List[str]',
+            repeat: int) -> float:
+    """Measure the commands answered per second by a function.
+
+    Returns:
+        The best rate of the repetitions.
+    """
+
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for command in commands:
+            function(command)
+        best = max(best, len(commands)/(time.perf_counter() - start))
+
+    return best
+
+def getProgramArguments() -> 'argparse.Namespace':
+
+    parser = argparse.ArgumentParser(description=(
+        'Measure the commands per second answered by the devices of a ship '
+        'in a single core'))
+    parser.add_argument('-n', '--commands', type=int, default=200000,
+                        help='Commands sent in each repetition')
+    parser.add_argument('-r', '--repeat', type=int, default=5,
+                        help='Repetitions, the best one is reported')
+
+    return parser.parse_args()
+
+def main() -> None:
+
+    args = getProgramArguments()
+
+    ship = createShip()
+    commands = [COMMANDS[i % len(COMMANDS)] for i in range(args.commands)]
+
+    results: 'List[Tuple[str, float]]' = [
+        ('communicate (line protocol)',
+         measure(ship.communicate, commands, args.repeat)),
+        ('query (binary protocol)',
+         measure(ship.query, commands, args.repeat))
+    ]
+
+    for command in COMMANDS:
+        results.append((command, measure(ship.communicate, [command]*(
+            args.commands//len(COMMANDS)), args.repeat)))
+
+    width = max(len(name) for name, _ in results)
+    for name, rate in results:
+        print(f'{name:<{width}}  {rate:12,.0f} commands/s')
+
+if __name__ == '__main__':
+    main()
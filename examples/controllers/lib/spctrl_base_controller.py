@@ -1,7 +1,12 @@
 #!/usr/bin/env python3
 
 import sys
+import mmap
 import time
+import json
+import shlex
+import struct
+import itertools
 
 import collections
 from enum import Enum
@@ -13,28 +18,119 @@ from PyQt5.QtCore import Qt
 __device_comm_write = sys.__stdout__
 __device_comm_read = sys.__stdin__
 
+def __readProgramArgs():
+    try:
+        return json.loads(sys.argv[1])
+    except (IndexError, ValueError):
+        return {}
+
+__program_args = __readProgramArgs()
+
+LOCKSTEP = bool(__program_args.get('lockstep', False))
+STEP_TIME = __program_args.get('step-time', 0.02)
+
+# Binary protocol, it is described in 'src/utils/controllerprotocol.py' of the
+# simulator, the line protocol is used if the simulator does not support it
+PROTOCOL = 1
+
+# If the simulator supports the 'batch' command, with it many messages are
+# sent in a single round trip with the line protocol too
+BATCH = False
+
+# If the simulator supports the 'open' command, with the line protocol the
+# devices are addressed by a handle instead of by their path
+HANDLES = False
+
+# If the simulator supports the 'get-tick' and 'wait-next-tick' commands, the
+# controller waits for the steps of the simulation instead of sleeping
+TICKS = False
+
+# Register file of the ship, if the simulator shares one the sensors are read
+# and the engines are set through memory, without sending messages
+REGISTERS = None
+
+_PROTOCOL_VERSION = 2
+
+_OPCODE_TEXT = 0
+_OPCODE_RESOLVE = 1
+_OPCODE_HANDLE = 2
+_OPCODE_BATCH = 3
+_OPCODE_END_TICK = 4
+_OPCODE_WAIT_TICKS = 5
+
+_VALUE_NONE = 0
+_VALUE_BOOL = 1
+_VALUE_INT = 2
+_VALUE_FLOAT = 3
+_VALUE_TEXT = 4
+_VALUE_LIST = 5
+
+# Readings of the subscribed sensors, which the simulator sends without being
+# asked, use this request id in the binary protocol and start with this
+# character in the line protocol
+_PUSH_REQUEST_ID = 0
+_PUSH_LINE_PREFIX = '\x1e'
+
+_REQUEST_HEADER = struct.Struct('<IIB')
+_RESPONSE_HEADER = struct.Struct('<II')
+_UINT32 = struct.Struct('<I')
+_INT64 = struct.Struct('<q')
+_FLOAT64 = struct.Struct('<d')
+_HANDLE_COMMAND = struct.Struct('<II')
+
+__request_ids = itertools.count(1)
+
+# Readings received and not returned by waitUpdate yet, pairs of the tick and
+# a list of handles and readings
+__pushes = collections.deque()
+# Device subscribed by the handle of its readings
+__subscriptions = {}
+
 class Device(ABC):
 
     _DEVICE_TYPE_MAP = {}
 
-    def __init__(self, device_path='', parent=None):
+    def __init__(self, device_path='', parent=None, tree=None):
 
         if isinstance(device_path, Device):
             parent = device_path.parent
+            tree = device_path.tree
             device_path = device_path.device_path
 
         self.__device_path = device_path
         self.__parent = parent
 
+        # The whole tree of devices is described in a single message, the
+        # ship asks for it and gives each device its part
+        if tree is None and parent is None and device_path == '':
+            tree = describeTree()
+        self.__tree = tree
+
+        # Devices are addressed by a handle in the binary protocol, so the
+        # simulator does not look for the device in each message
+        if PROTOCOL >= 2:
+            self.__handle = resolveDevice(device_path) if tree is None else \
+                tree['handle']
+        else:
+            self.__handle = None
+
+        # With the line protocol the handle is the prefix of the messages, the
+        # ship has no prefix
+        if PROTOCOL < 2 and HANDLES and device_path:
+            handle = openDevice(device_path) if tree is None else \
+                tree['handle']
+            self.__address = f'@{handle}:'
+        else:
+            self.__address = device_path
+
+        if tree is not None:
+            self.__initFromTree(tree)
+            return
+
         if self.sendMessage('get-info is-device-group') == 'yes':
 
             children_count = int(self.sendMessage('device-count'))
 
-            if device_path == '':
-                dev_path_prefix = ':'
-            else:
-                dev_path_prefix = device_path
-
             children = []
             for i in range(children_count):
                 child_type = self.sendMessage(f'{i}: device-type')
@@ -53,6 +149,22 @@ class Device(ABC):
         if self.__device_name == '<<null>>':
             self.__device_name = self.__device_type
 
+    def __initFromTree(self, tree):
+
+        children = tree.get('children')
+        if children is None:
+            self.__children = None
+        else:
+            self.__children = tuple(
+                self._DEVICE_TYPE_MAP.get(child['type'], Device)(
+                    device_path=f'{self.__device_path}{i}:', parent=self,
+                    tree=child)
+                for i, child in enumerate(children))
+
+        self.__device_type = tree['type']
+        self.__device_desc = tree['description']
+        self.__device_name = tree['name'] or self.__device_type
+
     @property
     def device_path(self):
         return self.__device_path
@@ -61,6 +173,22 @@ class Device(ABC):
     def parent(self):
         return self.__parent
 
+    @property
+    def handle(self):
+        return self.__handle
+
+    @property
+    def tree(self):
+        """Description of the device sent by the simulator with
+        'describe-tree', None if the simulator does not support it."""
+        return self.__tree
+
+    @property
+    def address(self):
+        """Prefix of the messages sent to this device with the line
+        protocol."""
+        return self.__address
+
     @property
     def children(self):
         return self.__children
@@ -92,7 +220,18 @@ class Device(ABC):
         return self.__get_repr()
 
     def sendMessage(self, message):
-        return send(self.__device_path + message)
+        if self.__handle is None:
+            return send(self.__address + message)
+
+        return _toText(queryHandle(self.__handle, message))
+
+    def query(self, message):
+        """Same as sendMessage, but with the binary protocol the answer is
+        not converted to text, so numbers are received as numbers."""
+        if self.__handle is None:
+            return send(self.__address + message)
+
+        return queryHandle(self.__handle, message)
 
 class Engine(Device):
 
@@ -111,7 +250,15 @@ class Engine(Device):
     @intensity.setter
     def intensity(self, value):
         self.__intensity = None
-        self.sendMessage(f'set-property intensity {value}')
+
+        key = f'{self.device_path}intensity'
+        if REGISTERS is not None and REGISTERS.hasActuator(key):
+            REGISTERS.setActuators({key: float(value)})
+        else:
+            self.sendMessage(f'set-property intensity {value}')
+
+    def forgetIntensity(self):
+        self.__intensity = None
 
 Device._DEVICE_TYPE_MAP['engine'] = Engine
 Device._DEVICE_TYPE_MAP['linear-engine'] = Engine
@@ -121,6 +268,19 @@ class Sensor(Device):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+        tree = self.tree
+        if tree is not None:
+            if None in (tree.get('reading-time'), tree.get('max-error'),
+                        tree.get('max-offset')):
+                self.__reading_time = self.__max_offset = \
+                    self.__max_error = None
+            else:
+                self.__reading_time = float(tree['reading-time'])
+                self.__max_offset = float(tree['max-offset'])
+                self.__max_error = float(tree['max-error']) - \
+                    self.__max_offset
+            return
+
         try:
             self.__reading_time = float(self.sendMessage('reading-time'))
             self.__max_offset = float(self.sendMessage('max-offset'))
@@ -141,16 +301,63 @@ class Sensor(Device):
     def max_offset(self):
         return self.__max_offset
 
-    def read(self, subdevice=None):
+    def registerPath(self, subdevice=None):
+        """Path of the sensor or of one of its subdevices in the register
+        file, None if it is not in it."""
+
+        if REGISTERS is None:
+            return None
+
         if subdevice is None:
-            msg = 'read'
+            path = self.device_path
         else:
-            msg = f'{subdevice}:read'
+            path = next((child.device_path for i, child in
+                         enumerate(self.children or ())
+                         if subdevice in (child.name, str(i))), None)
 
-        try:
-            return float(self.sendMessage(msg))
-        except ValueError:
-            return float('NaN')
+        return path if REGISTERS.hasSensor(path) else None
+
+    @staticmethod
+    def _readMessage(subdevice):
+        return 'read' if subdevice is None else f'{subdevice}:read'
+
+    def read(self, subdevice=None):
+
+        path = self.registerPath(subdevice)
+        if path is not None:
+            return REGISTERS.readSensors((path,))[1][0]
+
+        return _toReading(self.query(self._readMessage(subdevice)))
+
+    def readMany(self, subdevices):
+        """Read many subdevices, from the register file or with a single
+        message."""
+        return readSensors((self, subdevice) for subdevice in subdevices)
+
+    def subscribe(self, every=1):
+        """Receive the readings of the sensor with waitUpdate."""
+        return subscribe(self, every)
+
+def _toReading(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('NaN')
+
+def readSensors(reads):
+    """Read many sensors at once, 'reads' are pairs of a Sensor and a
+    subdevice or None. All of them are read from the same tick."""
+
+    reads = tuple(reads)
+
+    if REGISTERS is not None:
+        paths = [sensor.registerPath(subdevice) for sensor, subdevice in reads]
+        if None not in paths:
+            return tuple(REGISTERS.readSensors(paths)[1])
+
+    return tuple(_toReading(value) for value in queryMany(
+        (sensor, sensor._readMessage(subdevice))
+        for sensor, subdevice in reads))
 
 Device._DEVICE_TYPE_MAP['position-sensor'] = Sensor
 Device._DEVICE_TYPE_MAP['angle-sensor'] = Sensor
@@ -161,6 +368,9 @@ Device._DEVICE_TYPE_MAP['line-dist-sensor'] = Sensor
 SensorInfo = collections.namedtuple('SensorInfo', (
     'reading_time', 'max_error', 'max_offset', 'estimated_offset'))
 
+ShipState = collections.namedtuple('ShipState', (
+    'position', 'angle', 'speed', 'angular_speed'))
+
 class TextInputDevice(Device):
 
     @abstractmethod
@@ -176,8 +386,8 @@ class TextInputDevice(Device):
 
 class SimpleKeyboardInputDevice(TextInputDevice):
 
-    def __init__(self, device_path='', parent=None):
-        super().__init__(device_path=device_path, parent=parent)
+    def __init__(self, device_path='', parent=None, tree=None):
+        super().__init__(device_path=device_path, parent=parent, tree=tree)
 
         self.__buffer = None
 
@@ -278,8 +488,8 @@ class SimpleConsoleOutputDevice(TextOutputDevice):
 
     WriteMode = _SimpleConsoleOutputDevice_WriteMode
 
-    def __init__(self, device_path='', parent=None):
-        super().__init__(device_path=device_path, parent=parent)
+    def __init__(self, device_path='', parent=None, tree=None):
+        super().__init__(device_path=device_path, parent=parent, tree=tree)
 
         self.__message_buffer = ''
         self.__current_message_mode = \
@@ -386,8 +596,26 @@ class Ship:
         if self.__main_console is not None:
             self.__main_console.flush()
 
+        # Each call waits for whole steps of the simulation, so a loop that
+        # runs for STEP_TIME seconds runs once per step
+        if LOCKSTEP or TICKS:
+            self.waitTicks(max(round(seconds/STEP_TIME), 1))
+            return
+
         time.sleep(max(seconds - (time.time() - start_time), 0))
 
+    def waitTicks(self, ticks=1):
+        if TICKS:
+            return waitNextTick(ticks)
+
+        tick = endTick()
+
+        target_tick = tick + ticks - 1
+        while tick < target_tick:
+            tick = endTick()
+
+        return tick
+
     def listInterfaceDevices(self, device_type=None):
         if device_type is None:
             return self.__interface_devices
@@ -438,7 +666,7 @@ class Ship:
 
         device = position_devices[0]
 
-        return (device.read('x'), device.read('y'))
+        return device.readMany(('x', 'y'))
 
     @property
     def angle(self):
@@ -482,6 +710,56 @@ class Ship:
 
         return device.read()
 
+    def readState(self):
+        """Read the position, angle, speed and angular speed in a single
+        round trip, the ones without a sensor are None."""
+
+        reads = []
+        for sensor_type, subdevices in Ship.__STATE_READS:
+            devices = self.__sensor_devices.get(sensor_type)
+            if devices:
+                reads.extend((devices[0], subdevice)
+                             for subdevice in subdevices)
+
+        values = iter(readSensors(reads))
+
+        state = []
+        for sensor_type, subdevices in Ship.__STATE_READS:
+            if self.__sensor_devices.get(sensor_type):
+                state.append(tuple(next(values) for _ in subdevices))
+            else:
+                state.append(None)
+
+        position, angle, speed, angular_speed = state
+
+        return ShipState(position=position,
+                         angle=None if angle is None else angle[0],
+                         speed=None if speed is None else speed[0],
+                         angular_speed=None if angular_speed is None else
+                         angular_speed[0])
+
+    __STATE_READS = (('position-sensor', ('x', 'y')),
+                     ('angle-sensor', (None,)),
+                     ('speed-sensor', (None,)),
+                     ('ang-speed-sensor', (None,)))
+
+    @staticmethod
+    def setIntensities(engines, intensities):
+        """Set the intensity of many engines in a single round trip, or
+        through the register file if there is one."""
+        for engine, intensity in zip(engines, intensities):
+            engine.forgetIntensity()
+
+        if REGISTERS is not None:
+            setpoints = {f'{engine.device_path}intensity': float(intensity)
+                         for engine, intensity in zip(engines, intensities)}
+            if all(REGISTERS.hasActuator(key) for key in setpoints):
+                REGISTERS.setActuators(setpoints)
+                return
+
+        queryMany((engine, f'set-property intensity {intensity}')
+                  for engine, intensity in zip(engines, intensities))
+
     @property
     def device(self):
         return self.__device
@@ -521,18 +799,344 @@ class Ship:
         for child in device.children:
             self.__find_devices(child)
 
+def __request(opcode, payload=b''):
+
+    request_id = next(__request_ids) & 0xffffffff
+
+    output = __device_comm_write.buffer
+    output.write(_REQUEST_HEADER.pack(len(payload), request_id, opcode))
+    output.write(payload)
+    output.flush()
+
+    # The readings sent before the answer are kept for waitUpdate
+    while True:
+        response_id, value = __readFrame()
+        if response_id != _PUSH_REQUEST_ID:
+            return value
+
+        __queuePush(value)
+
+def __queuePush(value):
+    # The value is a list with the tick followed by pairs of a handle and a
+    # reading
+    __pushes.append((value[0], list(zip(value[1::2], value[2::2]))))
+
+def __readFrame():
+
+    input_ = __device_comm_read.buffer
+    header = input_.read(_RESPONSE_HEADER.size)
+    if len(header) < _RESPONSE_HEADER.size:
+        raise EOFError('The simulator closed the connection')
+
+    size, response_id = _RESPONSE_HEADER.unpack(header)
+
+    value, _ = __decodeValue(input_.read(size), 0)
+    return response_id, value
+
+def __decodeValue(data, offset):
+
+    tag = data[offset]
+    offset += 1
+
+    if tag == _VALUE_BOOL:
+        return bool(data[offset]), offset + 1
+
+    if tag == _VALUE_INT:
+        return _INT64.unpack_from(data, offset)[0], offset + _INT64.size
+
+    if tag == _VALUE_FLOAT:
+        return _FLOAT64.unpack_from(data, offset)[0], offset + _FLOAT64.size
+
+    if tag == _VALUE_TEXT:
+        size, = _UINT32.unpack_from(data, offset)
+        offset += _UINT32.size
+        return data[offset:offset + size].decode(), offset + size
+
+    if tag == _VALUE_LIST:
+        count, = _UINT32.unpack_from(data, offset)
+        offset += _UINT32.size
+
+        values = []
+        for _ in range(count):
+            value, offset = __decodeValue(data, offset)
+            values.append(value)
+
+        return values, offset
+
+    return None, offset
+
+def _toText(value):
+    # The same text the simulator sends with the line protocol
+    if isinstance(value, list):
+        return ' '.join(shlex.quote(_toText(item)) for item in value)
+
+    return str(value)
+
 def send(message):
 
+    if PROTOCOL >= 2:
+        return _toText(__request(_OPCODE_TEXT, message.encode()))
+
     __device_comm_write.write(message)
     __device_comm_write.write('\n')
     __device_comm_write.flush()
 
-    return __device_comm_read.readline()[:-1]
+    # The readings sent before the answer are kept for waitUpdate
+    while True:
+        answer = __readLine()
+        if answer is not None:
+            return answer
+
+def __readLine():
+    # None if the line has the readings of the subscribed sensors
+
+    line = __device_comm_read.readline()
+    if not line.startswith(_PUSH_LINE_PREFIX):
+        return line[:-1]
+
+    tick, *readings = line[1:].split()
+    __pushes.append((int(tick), [
+        (int(handle), _toReading(reading)) for handle, reading in
+        (reading.split('=', 1) for reading in readings)]))
+    return None
+
+def describeTree():
+    """Get the description of every device of the ship in a single message,
+    None if the simulator does not support it."""
+
+    try:
+        return json.loads(send('describe-tree'))
+    except ValueError:
+        return None
+
+def resolveDevice(path):
+    """Get the handle of the device with a path ('' for the ship, '0:',
+    'sensors:x:'), only with the binary protocol."""
+    return __request(_OPCODE_RESOLVE, path.encode())
+
+def openDevice(path):
+    """Get the handle of the device with a path with the line protocol,
+    messages that start with '@<handle>:' are sent to that device."""
+    return int(send('open ' + shlex.quote(path)))
+
+def queryHandle(handle, message):
+    """Send a message to the device with a handle and get the answer
+    without converting it to text, only with the binary protocol."""
+    return __request(_OPCODE_HANDLE,
+                     _UINT32.pack(handle) + message.encode())
+
+def queryMany(requests):
+    """Send many messages at once, 'requests' are pairs of a Device and a
+    message, the answers are returned in the same order. The simulator runs
+    them all against the same state."""
+
+    requests = tuple(requests)
+
+    if PROTOCOL < 2 or any(device.handle is None for device, _ in requests):
+        if not BATCH:
+            return [device.query(message) for device, message in requests]
+
+        return batch(device.address + message
+                     for device, message in requests)
+
+    payload = bytearray(_UINT32.pack(len(requests)))
+    for device, message in requests:
+        message = message.encode()
+        payload += _HANDLE_COMMAND.pack(device.handle, len(message))
+        payload += message
+
+    return __request(_OPCODE_BATCH, bytes(payload))
+
+def batch(messages):
+    """Send many messages, each one with the path of its device, in a
+    single round trip, only if the simulator supports it (BATCH)."""
+
+    message = 'batch ' + ' '.join(shlex.quote(message)
+                                  for message in messages)
+
+    if PROTOCOL >= 2:
+        return __request(_OPCODE_TEXT, message.encode())
+
+    return shlex.split(send(message))
+
+class RegisterFile:
+    """Sensors and actuators of the ship shared through memory, the layout
+    is described in 'src/simulation/registerfile.py' of the simulator. The
+    values set are applied before the next tick."""
+
+    def __init__(self, layout):
+
+        with open(layout['path'], 'r+b') as file:
+            self.__memory = mmap.mmap(file.fileno(), layout['size'])
+
+        header = layout['header']
+        self.__sensors_sequence = header['sensors-sequence']
+        self.__tick = header['tick']
+        self.__actuators_sequence = header['actuators-sequence']
+
+        self.__sensors = layout['sensors']
+        self.__actuators = layout['actuators']
+        self.__actuator_writes = layout['actuator-writes']
+
+        # The simulator only writes the readings once the file is mapped
+        _INT64.pack_into(self.__memory, header['mapped'], 1)
+
+    def hasSensor(self, path):
+        return path in self.__sensors
+
+    def hasActuator(self, key):
+        return key in self.__actuators
+
+    def readSensors(self, paths):
+        """Read the sensors with the given paths, returns the tick of the
+        readings and the readings."""
+
+        offsets = [self.__sensors[path] for path in paths]
+        memory = self.__memory
+
+        while True:
+            sequence, = _INT64.unpack_from(memory, self.__sensors_sequence)
+            if sequence & 1:
+                continue
+
+            tick, = _INT64.unpack_from(memory, self.__tick)
+            values = [_FLOAT64.unpack_from(memory, offset)[0]
+                      for offset in offsets]
+
+            if _INT64.unpack_from(memory, self.__sensors_sequence)[0] == \
+                    sequence:
+                return tick, values
+
+    @property
+    def tick(self):
+        return self.readSensors(())[0]
+
+    def setActuators(self, values):
+        """Set actuator properties, 'values' maps the path of the actuator
+        followed by the name of the property ('1:0:intensity') to the value."""
+
+        memory = self.__memory
+        sequence, = _INT64.unpack_from(memory, self.__actuators_sequence)
+
+        _INT64.pack_into(memory, self.__actuators_sequence, sequence + 1)
+        for key, value in values.items():
+            _FLOAT64.pack_into(memory, self.__actuators[key], value)
+            writes_offset = self.__actuator_writes[key]
+            writes, = _INT64.unpack_from(memory, writes_offset)
+            _INT64.pack_into(memory, writes_offset, writes + 1)
+        _INT64.pack_into(memory, self.__actuators_sequence, sequence + 2)
+
+def subscribe(sensor, every=1):
+    """Make the simulator send the readings of a Sensor every 'every'
+    ticks, they are received with waitUpdate. A sensor with subdevices, like
+    a position sensor, sends the reading of each subdevice."""
+
+    answer = send(f'subscribe {shlex.quote(sensor.device_path)} '
+                  f'every {every}')
+    handles = [int(handle) for handle in answer.split()]
+
+    children = sensor.children
+    if children is not None and len(children) == len(handles):
+        __subscriptions.update(zip(handles, children))
+    else:
+        __subscriptions.update((handle, sensor) for handle in handles)
+
+    return handles
+
+def unsubscribe(sensor=None):
+    """Stop receiving the readings of a Sensor, or of every sensor."""
+
+    if sensor is None:
+        send('unsubscribe')
+        __subscriptions.clear()
+        return
+
+    send(f'unsubscribe {shlex.quote(sensor.device_path)}')
+    for handle, device in tuple(__subscriptions.items()):
+        if device is sensor or device.parent is sensor:
+            del __subscriptions[handle]
+
+def pendingUpdates():
+    """Amount of readings received that waitUpdate returns without
+    waiting."""
+    return len(__pushes)
+
+def waitUpdate():
+    """Wait until the simulator sends the readings of the subscribed
+    sensors, returns the tick and a dict from each sensor (or subdevice) to
+    its reading. The readings of a tick arrive before the answer of the
+    'end-tick' that waits for it."""
+
+    while not __pushes:
+        if PROTOCOL >= 2:
+            response_id, value = __readFrame()
+            if response_id == _PUSH_REQUEST_ID:
+                __queuePush(value)
+        elif __readLine() == '':
+            raise EOFError('The simulator closed the connection')
+
+    tick, readings = __pushes.popleft()
+    return tick, {__subscriptions.get(handle, handle): reading
+                  for handle, reading in readings}
+
+def endTick():
+    if PROTOCOL >= 2:
+        return __request(_OPCODE_END_TICK)
+
+    return int(send('end-tick'))
+
+def getTick():
+    """Tick of the last step of the simulation."""
+    return int(send('get-tick'))
+
+def getSimTime():
+    """Simulated time of the last step, in seconds."""
+    return float(send('get-sim-time'))
+
+def waitNextTick(ticks=1):
+    """Wait until the simulation has performed 'ticks' more steps, returns
+    the tick. In lockstep mode it finishes the current tick, like
+    endTick."""
+
+    if PROTOCOL >= 2:
+        return __request(_OPCODE_WAIT_TICKS, _UINT32.pack(ticks))
+
+    return int(send(f'wait-next-tick {ticks}'))
 
 def debug(*args, **kwargs):
     print(*args, **kwargs, file=sys.stderr)
     sys.stderr.flush()
 
+def __negotiateProtocol():
+
+    if _PROTOCOL_VERSION not in __program_args.get('protocols', ()):
+        return 1
+
+    if send(f'protocol {_PROTOCOL_VERSION}') != str(_PROTOCOL_VERSION):
+        return 1
+
+    return _PROTOCOL_VERSION
+
+# An empty batch is answered with an empty line
+BATCH = send('batch') == ''
+# The ship is the device opened by default, its handle is 0
+HANDLES = send('open') == '0'
+TICKS = send('get-tick').isdigit()
+PROTOCOL = __negotiateProtocol()
+
+def __openRegisterFile():
+
+    layout = send('get-info register-layout')
+    if layout == '<<null>>':
+        return None
+
+    try:
+        return RegisterFile(json.loads(layout))
+    except (OSError, ValueError, KeyError):
+        return None
+
+REGISTERS = __openRegisterFile()
+
 ship = Ship()
 
 sys.stdout = ship.console_printer
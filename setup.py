@@ -75,6 +75,10 @@ setup(
 
         'gui_scripts': [
             'spaceshipcontrol = spaceship_control.main:main',
+        ],
+        'console_scripts': [
+            'spaceshipcontrol-batch = spaceship_control.batch:main',
+            'spaceshipcontrol-compile = spaceship_control.compilescenario:main',
         ]
     },
     data_files = [
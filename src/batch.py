@@ -0,0 +1,87 @@
+import sys
+import argparse
+
+from .simulation.batch import (
+    BatchOptions, BatchResultsWriter, createBatchRuns, runBatch
+)
+from .simulation.sweep import createSweepRuns, loadSweepSpec
+
+def getProgramArguments() -> 'argparse.Namespace':
+
+    parser = argparse.ArgumentParser(description=(
+        'Run scenarios without graphical interface, in parallel, and '
+        'aggregate their results'))
+    runs_group = parser.add_mutually_exclusive_group(required=True)
+    runs_group.add_argument('-s', '--scenarios', nargs='+',
+                            help='Scenarios that will be run')
+    runs_group.add_argument('--sweep', help=(
+        'Path to a file specifying the scenarios and the values of their '
+        'variables that will be run, the controllers and repetitions are read '
+        'from this file'))
+    parser.add_argument('-c', '--controllers', nargs='+', default=(None,),
+                        help=(
+                            'Controllers used by every ship of the scenarios, '
+                            'each scenario is run with each controller, if not '
+                            'specified the controllers of the scenarios are '
+                            'used'))
+    parser.add_argument('-r', '--repetitions', type=int, default=1, help=(
+        'Number of times each scenario and controller combination is run'))
+    parser.add_argument('-j', '--jobs', type=int, help=(
+        'Number of worker processes, by default the number of processors'))
+    parser.add_argument('-o', '--output', help=(
+        'Path to the yaml file where the results will be written, by default '
+        'they are written to the standard output'))
+    parser.add_argument('-t', '--time-limit', type=float, help=(
+        'If specified, the objectives will fail after \'n\' seconds'))
+    parser.add_argument('--lockstep', action='store_true', help=(
+        'Each simulation step waits for the controllers to finish their '
+        'commands'))
+    parser.add_argument('--tick-budget', type=float, default=1, help=(
+        'Maximum time in seconds a simulation step waits for a controller when '
+        '\'--lockstep\' is used'))
+    parser.add_argument('--max-time', type=float, help=(
+        'Simulated seconds after which a run is stopped if its objectives '
+        'have no result, 3600 by default'))
+    parser.add_argument('--seed', type=int, help=(
+        'Base seed of the random generators, each repetition uses a seed '
+        'derived from it, so the batch can be reproduced'))
+
+    return parser.parse_args()
+
+def main() -> None:
+
+    args = getProgramArguments()
+
+    if args.sweep is None:
+        runs = createBatchRuns(args.scenarios, controllers=args.controllers,
+                               repetitions=args.repetitions)
+    else:
+        try:
+            runs = createSweepRuns(loadSweepSpec(args.sweep))
+        except Exception as err: # pylint: disable=broad-except
+            print(f'Invalid sweep file: {type(err).__name__}: {err}',
+                  file=sys.stderr)
+            sys.exit(-1)
+
+    options = BatchOptions(time_limit=args.time_limit,
+                           lockstep=args.lockstep,
+                           tick_budget=args.tick_budget,
+                           seed=args.seed)
+    if args.max_time is not None:
+        options = options._replace(max_time=args.max_time)
+
+    if args.output is None:
+        output = sys.stdout
+    else:
+        output = open(args.output, 'w')
+
+    try:
+        writer = BatchResultsWriter(output)
+        runBatch(runs, options, jobs=args.jobs, callback=writer)
+        writer.close()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+if __name__ == '__main__':
+    main()
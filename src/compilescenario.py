@@ -0,0 +1,51 @@
+import os
+import sys
+import argparse
+
+from PyQt5.QtWidgets import QApplication
+
+from .simulation.simulation import Simulation
+from .storage.scenariobundle import BUNDLE_SUFFIX
+
+def getProgramArguments() -> 'argparse.Namespace':
+
+    parser = argparse.ArgumentParser(description=(
+        'Create a bundle with a scenario and every model it uses, so it can be '
+        'run without reading the model library'))
+    parser.add_argument('scenario', help='Scenario that will be compiled')
+    parser.add_argument('-o', '--output', help=(
+        f'Path to the bundle, by default the name of the scenario followed by '
+        f'\'{BUNDLE_SUFFIX}\' in the current directory'))
+    parser.add_argument('-c', '--controller', help=(
+        'Controller used by every ship of the scenario when it is checked, it '
+        'is not stored in the bundle'))
+
+    return parser.parse_args()
+
+def main() -> None:
+
+    args = getProgramArguments()
+
+    output = args.output
+    if output is None:
+        output = args.scenario.replace('/', '_') + BUNDLE_SUFFIX
+
+    # Interface devices create widgets while the scenario is loaded, nothing is
+    # ever shown
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    _app = QApplication(sys.argv)
+
+    simulation = Simulation()
+
+    try:
+        bundle = simulation.compileScenario(args.scenario,
+                                            controller=args.controller)
+    except Exception as err: # pylint: disable=broad-except
+        print('An error occurred loading the scenario: '
+              f'{type(err).__name__}: {err}', file=sys.stderr)
+        sys.exit(-1)
+
+    bundle.save(output)
+
+if __name__ == '__main__':
+    main()
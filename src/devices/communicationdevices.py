@@ -2,16 +2,20 @@
 from abc import ABC, abstractmethod, abstractproperty
 from typing import TYPE_CHECKING
 
-import random
+import copy
 import math
+from threading import Lock
 
 from pymunk import Vec2d
 
 from .device import DefaultDevice
 
+from ..utils.errorgenerator import NoiseBuffer, createRandomGenerator
+
 if TYPE_CHECKING:
     # pylint: disable=ungrouped-imports
     from typing import Any, List, Tuple, Dict, Callable
+    from numpy.random import Generator
     from ..utils.errorgenerator import ErrorGenerator
     from .structure import StructuralPart
     # pylint: enable=ungrouped-imports
@@ -61,7 +65,7 @@ class CommunicationEngine:
             dist = Vec2d(receiver.position).get_dist_sqrd(self.__start)
 
             if self.__sqrd_min_distance < dist < self.__sqrd_max_distance:
-                noise = (random.random() - 0.5)*self.__engine._noise_max # pylint: disable=protected-access
+                noise = self.__engine._noise() # pylint: disable=protected-access
                 intensity = self.__inital_intensity if dist < 1 else \
                     self.__inital_intensity/dist
                 if intensity < self.__engine._ignore_lesser: # pylint: disable=protected-access
@@ -75,14 +79,52 @@ class CommunicationEngine:
             return self.__valid
 
     def __init__(self, max_noise: float, speed: float,
-                 negligible_intensity: float) -> None:
+                 negligible_intensity: float, rng: 'Generator' = None) -> None:
         self._noise_max = max_noise
         self._ignore_lesser = negligible_intensity
         self._speed = speed
 
+        self.rng = createRandomGenerator() if rng is None else rng
+
         self.__signals: 'List[CommunicationEngine._Signal]' = []
         self.__receivers: 'List[CommunicationEngine.Receiver]' = []
 
+        # Signals are sent by the commands of the ships, which can be handled
+        # at the same time
+        self.__signals_lock = Lock()
+
+    @property
+    def rng(self) -> 'Generator':
+        return self.__rng
+
+    @rng.setter
+    def rng(self, rng: 'Generator') -> None:
+
+        half_noise = self._noise_max/2
+
+        self.__rng = rng
+        self._noise = NoiseBuffer(
+            lambda size: rng.uniform(-half_noise, half_noise, size))
+
+    def getState(self) -> 'Tuple[Any, ...]':
+        """Get the state of the signals being propagated and of the noise.
+
+        Returns:
+            A value that can be given to `setState` to bring the engine back to
+            this moment.
+        """
+
+        return (self.__rng.bit_generator.state, self._noise.getState(),
+                [copy.copy(signal) for signal in self.__signals])
+
+    def setState(self, state: 'Tuple[Any, ...]') -> None:
+
+        rng_state, noise_state, signals = state
+
+        self.__rng.bit_generator.state = rng_state
+        self._noise.setState(noise_state)
+        self.__signals = [copy.copy(signal) for signal in signals]
+
     def step(self) -> None:
 
         invalid_signals_indexes = []
@@ -103,8 +145,12 @@ class CommunicationEngine:
 
     def newSignal(self, start_point: 'Vec2d', initial_intensity: float,
                   frequency: float) -> None:
-        self.__signals.append(CommunicationEngine._Signal(
-            start_point, initial_intensity, frequency, self))
+
+        signal = CommunicationEngine._Signal(start_point, initial_intensity,
+                                             frequency, self)
+
+        with self.__signals_lock:
+            self.__signals.append(signal)
 
     def addReceiver(self, receiver: 'CommunicationEngine.Receiver') -> None:
         self.__receivers.append(receiver)
@@ -155,11 +201,6 @@ class BasicReceiver(DefaultDevice, CommunicationEngine.Receiver):
 
         self.__received_signals.append(intensity - self._sensibility)
 
-    def command(self, command: 'List[str]',
-                *args: 'Dict[str, Callable]') -> 'Any':
-        return DefaultDevice.command(self, command,
-                                     BasicReceiver.__COMMANDS, *args)
-
     def __getReceived(self) -> str:
         signals = ','.join(str(signal) for signal in self.__received_signals)
         self.__received_signals.clear()
@@ -179,10 +220,6 @@ class ConfigurableReceiver(BasicReceiver):
         self.__min_freq = min_frequency
         self.__max_freq = max_frequency
 
-    def command(self, command: 'List[str]',
-                *args: 'Dict[str, Callable]') -> 'Any':
-        return super().command(command, ConfigurableReceiver.__COMMANDS, *args)
-
     @property
     def frequency(self) -> float:
         return self._frequency
@@ -232,10 +269,6 @@ class BasicSender(DefaultDevice):
 
         self.__engine.newSignal(self.__part.position, intensity, frequency)
 
-    def command(self, command: 'List[str]',
-                *args: 'Dict[str, Callable]') -> 'Any':
-        return super().command(command, BasicSender.__COMMANDS, *args)
-
     __COMMANDS: 'Dict[str, Callable]' = {
         'get-frequency': lambda self: self._frequency, # pylint: disable=protected-access
         'get-intensity': lambda self: self._intensity, # pylint: disable=protected-access
@@ -254,10 +287,6 @@ class ConfigurableSender(BasicSender):
         self.__min_int = min_intensity
         self.__max_int = max_intensity
 
-    def command(self, command: 'List[str]',
-                *args: 'Dict[str, Callable]') -> 'Any':
-        return super().command(command, ConfigurableSender.__COMMANDS, *args)
-
     @property
     def frequency(self) -> float:
         return self._frequency
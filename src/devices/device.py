@@ -5,15 +5,48 @@ are inherited by classes inside `structure.py` to represent a ship structure, a
 sensor, an actuator or another device.
 """
 
+import re
 import shlex
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING, cast as typingcast
 
+from ..utils.errorgenerator import ErrorGenerator
+
 if TYPE_CHECKING:
     from typing import (
         Any, Dict, Optional, Callable, Iterable, List, Tuple, Union
     )
 
+# Types of the attributes that are saved as they are by `Device.getState`
+_STATE_VALUE_TYPES = (bool, int, float, complex, str, bytes, tuple,
+                      type(None))
+
+# Characters that have a meaning for `shlex.split` and ASCII characters that
+# `str.split` takes as whitespace but `shlex.split` does not
+_SHLEX_CHARACTERS = re.compile(r'[\'"\\\x0b\x0c\x1c-\x1f]')
+
+def _splitCommand(input_: str) -> 'List[str]':
+    """Split a shell-like command.
+
+    Most commands have no quotes or escapes, those are split with `str.split`,
+    which gives the same result as `shlex.split` much faster.
+    """
+
+    if input_.isascii() and _SHLEX_CHARACTERS.search(input_) is None:
+        return input_.split()
+
+    return shlex.split(input_)
+
+class AnswerList(list):
+    """Answers of the commands of a batch.
+
+    Its string is the answers quoted as shell-like arguments, so the
+    controller can split them with the same rules used for the commands.
+    """
+
+    def __str__(self) -> str:
+        return ' '.join(shlex.quote(str(answer)) for answer in self)
+
 class Device(ABC):
     """Base class for all devices.
 
@@ -67,10 +100,70 @@ class Device(ABC):
 
         """
 
+    def query(self, input_: str) -> 'Any':
+        """Method used to communicate with the device without text answers.
+
+        It is the same as `communicate` but the answer is the value before it
+        is converted to a string, so numbers can be sent to the controller
+        without formatting them. By default it returns the answer of
+        `communicate`.
+
+        Args:
+            input_: The message sent to the device.
+
+        Returns:
+            The answer, its string must contain no control characters.
+
+        """
+        return self.communicate(input_)
+
     @property
     def mirror(self) -> 'Device.Mirror':
         return Device.Mirror(self)
 
+    def getState(self) -> 'Dict[str, Any]':
+        """Method used to save the values that change while the device is used.
+
+        The state has the value of every attribute that is a number, a string,
+        a tuple or None, a copy of every list and the state of every error
+        generator. Devices that keep other kinds of values that change must
+        extend this method and `setState`.
+
+        Returns:
+            A value that can be given to `setState` to bring the device back to
+            this moment.
+
+        """
+
+        state: 'Dict[str, Any]' = {}
+        for name, value in vars(self).items():
+            if isinstance(value, ErrorGenerator):
+                state[name] = value.getState()
+            elif isinstance(value, (list, bytearray)):
+                state[name] = value.copy()
+            elif isinstance(value, _STATE_VALUE_TYPES):
+                state[name] = value
+
+        return state
+
+    def setState(self, state: 'Dict[str, Any]') -> None:
+        """Method used to restore a state returned by `getState`.
+
+        Args:
+            state: The state that will be restored.
+
+        """
+
+        attributes = vars(self)
+        for name, value in state.items():
+            current = attributes.get(name)
+            if isinstance(current, ErrorGenerator):
+                current.setState(value)
+            elif isinstance(value, (list, bytearray)):
+                attributes[name] = value.copy()
+            else:
+                attributes[name] = value
+
 class DefaultDevice(Device): # pylint: disable=abstract-method
     """Device that use shell-like command to communicate.
 
@@ -81,7 +174,9 @@ class DefaultDevice(Device): # pylint: disable=abstract-method
     Note:
         This class implements `Device` communicate method and declare the method
         `command` to be used instead, but it should't be overriden without
-        calling the this class `command` method.
+        calling the this class `command` method. The commands of a subclass are
+        the functions of its private `__COMMANDS` dictionary, the dictionaries
+        of every class are merged once when the class is created.
 
     Args:
         device_type: String that represent what the device is meant to be,
@@ -112,6 +207,24 @@ class DefaultDevice(Device): # pylint: disable=abstract-method
         self.__device_info = {} if device_info is None else device_info.copy()
         self.__properties = {} if properties is None else properties.copy()
 
+    def __init_subclass__(cls, **kwargs: 'Any') -> None:
+        super().__init_subclass__(**kwargs)
+
+        # The commands are looked for from the base classes to the subclasses
+        # and in the commands of this class at the end, when a command returns
+        # None the next one with the same name is tried
+        mro = cls.__mro__
+        dispatch: 'Dict[str, Tuple[Callable, ...]]' = {}
+        for klass in (*reversed(mro[:mro.index(DefaultDevice)]),
+                      DefaultDevice):
+            class_name = klass.__name__.lstrip('_')
+            commands = vars(klass).get(f'_{class_name}__COMMANDS')
+            if commands is not None:
+                for name, command_func in commands.items():
+                    dispatch[name] = (*dispatch.get(name, ()), command_func)
+
+        cls.__dispatch = dispatch
+
     def communicate(self, input_: str) -> str:
         """Method used to communicate with the device controller.
 
@@ -139,9 +252,13 @@ class DefaultDevice(Device): # pylint: disable=abstract-method
 
         """
 
+        return str(self.query(input_))
+
+    def query(self, input_: str) -> 'Any':
+
         try:
-            return str(self.command(shlex.split(input_)))
-        except Exception:
+            return self.command(_splitCommand(input_))
+        except Exception: # pylint: disable=broad-except
             return 'Invalid command'
 
     def setInfo(self, name: str, value: 'Optional[str]') -> None:
@@ -186,6 +303,28 @@ class DefaultDevice(Device): # pylint: disable=abstract-method
 
         return self.__device_info.get(name)
 
+    def describe(self) -> 'Dict[str, Any]':
+        """This method is used to get the description of the device.
+
+        The description is used by the command `describe-tree` of the ship,
+        it has the values that the commands that describe the device answer,
+        subclasses may add their own.
+
+        Returns:
+            A dictionary that can be converted to json with the type, the
+            description, the name in its group, the info and the names of the
+            properties of the device.
+
+        """
+
+        return {
+            'type': self.__device_type,
+            'description': self.__device_desc,
+            'name': self.__device_info.get('device-name-in-group'),
+            'info': self.__device_info.copy(),
+            'properties': list(self.__properties)
+        }
+
     def deviceType(self) -> str:
         """This method is used to get the device type.
 
@@ -219,18 +358,18 @@ class DefaultDevice(Device): # pylint: disable=abstract-method
     def __command(self, command: 'List[str]',
                   command_actions: 'Dict[str, Callable]') -> 'Any':
 
-        if not command:
-            return None
-
         command_func = command_actions.get(command[0])
 
         if command_func is None:
             return None
 
+        return self.__run(command_func, command)
+
+    def __run(self, command_func: 'Callable',
+              command: 'List[str]') -> 'Any':
+
         try:
-            command_args = iter(command)
-            next(command_args)
-            return command_func(self, *command_args)
+            return command_func(self, *command[1:])
         except Exception: # pylint: disable=broad-except
             return 'An error ocurred running the command'
 
@@ -243,18 +382,19 @@ class DefaultDevice(Device): # pylint: disable=abstract-method
         method will use the first element of `command` to locate a function
         that will be called passing the rest of the list as parameter.
 
-        More arguments may be passed to be used to be looked upon for a command,
-        that is not an original command.
+        The function is looked for in the `__COMMANDS` dictionaries of the
+        class, merged when the class was created. More arguments may be passed
+        to be looked upon for a command before them.
 
         Note:
             This method should be called even if overriden, if you desire to
-            add commands, use the variadic positional parameters.
+            add commands, define a `__COMMANDS` dictionary in the class.
 
         Args:
             command: List with the first argument being the command name and
                 the rest as the arguments.
             *args: Dicionary containing pair string and callable that will where
-                the command will be looked for if it was not found yet.
+                the command will be looked for first.
 
         Returns:
             'Invalid command' if the command is not found.
@@ -264,6 +404,9 @@ class DefaultDevice(Device): # pylint: disable=abstract-method
 
         """
 
+        if not command:
+            return 'Invalid command'
+
         for command_actions in args:
 
             if command_actions is not None:
@@ -272,12 +415,13 @@ class DefaultDevice(Device): # pylint: disable=abstract-method
                 if result is not None:
                     return result
 
-        result = self.__command(command, DefaultDevice.__COMMANDS)
+        for command_func in self.__dispatch.get(command[0], ()):
 
-        if result is None:
-            return 'Invalid command'
+            result = self.__run(command_func, command)
+            if result is not None:
+                return result
 
-        return result
+        return 'Invalid command'
 
     def getProperty(self, prop_name: str) -> 'Any':
         prop = self.__properties.get(prop_name)
@@ -325,6 +469,9 @@ class DefaultDevice(Device): # pylint: disable=abstract-method
         'show-properties': __showPropertiesStr
     }
 
+    __dispatch: 'Dict[str, Tuple[Callable, ...]]' = {
+        name: (command_func,) for name, command_func in __COMMANDS.items()}
+
 class DeviceGroup(DefaultDevice):
     """A device that can have multiple subdevices.
 
@@ -410,6 +557,22 @@ class DeviceGroup(DefaultDevice):
         """
         return len(self.__device_list)
 
+    def getState(self) -> 'Dict[str, Any]':
+
+        state = super().getState()
+        state['devices'] = [device.getState() for device in self.__device_list]
+
+        return state
+
+    def setState(self, state: 'Dict[str, Any]') -> None:
+
+        state = state.copy()
+        for device, device_state in zip(self.__device_list,
+                                        state.pop('devices')):
+            device.setState(device_state)
+
+        super().setState(state)
+
     def accessDevice(self, index: 'Union[str, int]', *args: 'Union[str, int]') \
             -> 'Optional[Device]':
 
@@ -439,7 +602,12 @@ class DeviceGroup(DefaultDevice):
         for device in self.__device_list:
             device.act()
 
-    def communicate(self, input_: str) -> str:
+    def query(self, input_: str) -> 'Any':
+
+        # The commands of a batch have their own device paths, so it is never
+        # sent to a subdevice
+        if input_.lstrip().partition(' ')[0] == 'batch':
+            return super().query(input_)
 
         sp_input = input_.split(':', 1)
 
@@ -458,19 +626,38 @@ class DeviceGroup(DefaultDevice):
             if device is None:
                 return 'Invalid device'
 
-            return device.communicate(sp_input[1])
+            return device.query(sp_input[1])
 
-        return super().communicate(input_)
-
-    def command(self, command: 'List[str]', *args: 'Dict[str, Callable]') \
-            -> 'Any':
-        return super().command(command, DeviceGroup.__COMMANDS, *args)
+        return super().query(input_)
 
     @property
     def mirror(self) -> 'DeviceGroup.Mirror':
         return DeviceGroup.Mirror(self)
 
+    def batch(self, *commands: str) -> 'AnswerList':
+        """Run many commands, each one with the path of its device.
+
+        The commands are run one after the other by the same call to
+        `communicate`, so the controller gets every answer in a single reply
+        and, since the controller thread holds the simulation lock during the
+        call, they all see the same state of the simulation.
+
+        Note:
+            This method is called by the command `batch <command>...`, where
+            each command is a single shell-like argument, for example
+            `batch '0:0: get-property intensity' 'sensors:x:read'`.
+
+        Args:
+            *commands: Commands as they would be sent to this device.
+
+        Returns:
+            The answer of each command.
+
+        """
+        return AnswerList(self.query(command) for command in commands)
+
     __COMMANDS = {
 
-        'device-count': deviceCount
+        'device-count': deviceCount,
+        'batch': batch
     }
@@ -4,7 +4,7 @@ from typing import TYPE_CHECKING
 
 from PyQt5.QtGui import QFontMetricsF, QFont
 from PyQt5.QtWidgets import QLabel, QTextEdit
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QObject, QThread, pyqtSignal
 
 from .device import DefaultDevice
 
@@ -14,18 +14,49 @@ from ..interface.panelpushbutton import PanelPushButton
 from ..interface.keyboardbutton import KeyboardButton
 
 if TYPE_CHECKING:
-    from typing import Any, List, Callable, Dict
+    from typing import Any, List, Callable, Dict, Sequence
     from PyQt5.QtWidgets import QWidget
 
+class _ActionDispatcher(QObject):
+    """Run actions in the thread the dispatcher was created in.
+
+    Widgets can only be modified from the thread that owns them, when the
+    simulation is stepped from another thread the actions are sent through a
+    queued signal and run by the event loop of the widgets thread.
+    """
+
+    actions_ready = pyqtSignal(object)
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.actions_ready.connect(self.__runActions, Qt.QueuedConnection)
+
+    def dispatch(self, actions: 'Sequence[Action]') -> None:
+
+        if not actions:
+            return
+
+        if QThread.currentThread() == self.thread():
+            self.__runActions(actions)
+        else:
+            self.actions_ready.emit(actions)
+
+    @staticmethod
+    def __runActions(actions: 'Sequence[Action]') -> None:
+        for action in actions:
+            action.function(*action.args)
+
 class InterfaceDevice(DefaultDevice):
 
     def __init__(self, **kwargs: 'Any') -> None:
         super().__init__(**kwargs)
 
         self.__queue = ActionQueue()
+        self.__dispatcher = _ActionDispatcher()
 
     def act(self) -> None:
-        self.__queue.processItems()
+        self.__dispatcher.dispatch(self.__queue.takeItems())
 
     def addAction(self, action: 'Action') -> None:
         self.__queue.add(action)
@@ -51,13 +82,23 @@ class TextDisplayDevice(InterfaceDevice):
     def widget(self) -> 'QWidget':
         return self.__label
 
-    def command(self, command: 'List[str]',
-                *args: 'Dict[str, Callable[..., Any]]') -> 'Any':
-        return super().command(command, TextDisplayDevice.__COMMANDS, *args)
-
     def setText(self, text: str) -> None:
         self.addAction(Action(QLabel.setText, self.__label, text))
 
+    def getState(self) -> 'Dict[str, Any]':
+
+        state = super().getState()
+        state['text'] = self.__label.text()
+
+        return state
+
+    def setState(self, state: 'Dict[str, Any]') -> None:
+
+        state = state.copy()
+        self.setText(state.pop('text'))
+
+        super().setState(state)
+
     __COMMANDS = {
 
         'set-text': setText
@@ -78,13 +119,14 @@ class ButtonDevice(InterfaceDevice):
     def widget(self) -> 'QWidget':
         return self.__button
 
-    def command(self, command: 'List[str]',
-                *args: 'Dict[str, Callable[..., Any]]') -> 'Any':
-        return super().command(command, ButtonDevice.__COMMANDS, *args)
-
     def __clicked(self) -> str:
         return '1' if self.__button.getPressed() else '0'
 
+    def setState(self, state: 'Dict[str, Any]') -> None:
+        super().setState(state)
+
+        self.__button.getPressed()
+
     __COMMANDS = {
 
         'clicked': __clicked
@@ -101,20 +143,21 @@ class KeyboardReceiverDevice(InterfaceDevice):
     def widget(self) -> 'QWidget':
         return self.__receiver
 
-    def command(self, command: 'List[str]',
-                *args: 'Dict[str, Callable[..., Any]]') -> 'Any':
-        return super().command(command,
-                               KeyboardReceiverDevice.__COMMANDS, *args)
-
     def __get(self) -> 'Any':
         return self.__receiver.getAll()
 
+    def setState(self, state: 'Dict[str, Any]') -> None:
+        super().setState(state)
+
+        # Discard the keys pressed before the state is restored
+        self.__receiver.getAll()
+
     def __activate(self) -> str:
-        self.__receiver.setFocus()
+        self.addAction(Action(KeyboardButton.setFocus, self.__receiver))
         return '<<OK>>'
 
     def __desactivate(self) -> str:
-        self.__receiver.clearFocus()
+        self.addAction(Action(KeyboardButton.clearFocus, self.__receiver))
         return '<<OK>>'
 
     __COMMANDS = {
@@ -174,9 +217,10 @@ class ConsoleDevice(InterfaceDevice):
     def widget(self) -> 'QWidget':
         return self.__text_widget
 
-    def command(self, command: 'List[str]',
-                *args: 'Dict[str, Callable]') -> 'Any':
-        return super().command(command, ConsoleDevice.__COMMANDS, *args)
+    def setState(self, state: 'Dict[str, Any]') -> None:
+        super().setState(state)
+
+        self.__update()
 
     def __setPosX(self, column_s: str) -> str:
 
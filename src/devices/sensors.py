@@ -1,5 +1,6 @@
 
 from math import pi, cos, sin
+from threading import Lock
 from typing import TYPE_CHECKING, cast as typingcast
 
 from pymunk import Vec2d, ShapeFilter
@@ -10,6 +11,10 @@ from .structure import Sensor, MultiSensor
 if TYPE_CHECKING:
     from typing import Any, Union
 
+# The commands of different ships are handled at the same time, chipmunk marks
+# the space as locked during a query with a counter that is not thread safe
+_SPACE_QUERY_LOCK = Lock()
+
 class XPositionSensor(Sensor):
 
     def __init__(self, *args: 'Any', **kwargs: 'Any') -> None:
@@ -161,8 +166,9 @@ class LineDetectSensor(Sensor):
         segment_end = Vec2d(self.__max_dist, 0)
         segment_end.angle = self.structural_part.angle + self.__angle
 
-        collisions = space.segment_query(pos, pos + segment_end, 10,
-                                         ShapeFilter())
+        with _SPACE_QUERY_LOCK:
+            collisions = space.segment_query(pos, pos + segment_end, 10,
+                                             ShapeFilter())
 
         first_collision = next((col for col in collisions
                                 if col.shape.body is not body), None)
@@ -192,7 +198,9 @@ class DetectCloserSensor(Sensor):
 
         pos = self.structural_part.position
 
-        collisions = space.point_query(pos, self.__max_dist, ShapeFilter())
+        with _SPACE_QUERY_LOCK:
+            collisions = space.point_query(pos, self.__max_dist,
+                                           ShapeFilter())
 
         first_collision = next((col for col in collisions
                                 if col.shape.body is not body), None)
@@ -2,16 +2,84 @@
 from abc import abstractmethod
 import time
 import math
+import json
 from typing import TYPE_CHECKING, cast as typingcast
 
-from .device import DeviceGroup, DefaultDevice
+from .device import AnswerList, DeviceGroup, DefaultDevice
 
 from ..utils.errorgenerator import NormalDistributionErrorGenerator
 
 if TYPE_CHECKING:
-    from typing import Any, Dict, Type, List, Tuple, Callable, Optional
+    from typing import (
+        Any, Dict, Type, List, Tuple, Callable, Optional, Union
+    )
     import pymunk
     from .device import Device
+    from ..simulation.clock import SimulationClock
+
+def _isIndex(device_id: str) -> bool:
+    # The same check `DeviceGroup.query` does to tell indexes from names
+    try:
+        int(device_id)
+    except ValueError:
+        return False
+
+    return True
+
+def _indexDevices(group: 'DeviceGroup', prefixes: 'Tuple[str, ...]',
+                  devices: 'List[Device]', paths: 'Dict[str, int]') -> None:
+
+    for i in range(group.deviceCount()):
+        device = typingcast('Device', group.accessDevice(i))
+
+        device_ids = [str(i)]
+        if isinstance(device, DefaultDevice):
+            name = device.getInfo('device-name-in-group')
+            if name is not None and not _isIndex(name):
+                device_ids.append(name)
+
+        handle = len(devices)
+        devices.append(device)
+
+        device_paths = tuple(f'{prefix}{device_id}' for prefix in prefixes
+                             for device_id in device_ids)
+        for path in device_paths:
+            paths[path] = handle
+
+        if isinstance(device, DeviceGroup):
+            _indexDevices(device, tuple(f'{path}:' for path in device_paths),
+                          devices, paths)
+
+def _parsePeriod(args: 'Tuple[str, ...]') -> int:
+    # The optional end of the command 'subscribe', 'every <n> [ticks]'
+
+    if not args:
+        return 1
+
+    if args[0] != 'every' or len(args) not in (2, 3) or \
+        args[2:] not in ((), ('tick',), ('ticks',)):
+        raise ValueError('Invalid period')
+
+    period = int(args[1])
+    if period < 1:
+        raise ValueError('Invalid period')
+
+    return period
+
+def _describeDevice(device: 'Device',
+                    handles: 'Dict[int, int]') -> 'Dict[str, Any]':
+
+    description = device.describe() if isinstance(device, DefaultDevice) \
+        else {}
+    description['handle'] = handles.get(id(device))
+
+    if isinstance(device, DeviceGroup):
+        description['children'] = [
+            _describeDevice(typingcast('Device', device.accessDevice(i)),
+                            handles)
+            for i in range(device.deviceCount())]
+
+    return description
 
 class Structure(DeviceGroup):
     """Class that represents a ship
@@ -22,14 +90,26 @@ class Structure(DeviceGroup):
     physical engine so the sensors and actuators connected to it can perform
     their functions.
 
+    Every device of the ship is indexed by its full path, with the names or the
+    numbers of the devices, so the device of a command is found with a single
+    lookup. The command `open <path>` gives the handle of a device and the
+    commands that start with `@<handle>:` are sent to that device. The command
+    `describe-tree` gives the whole tree of devices at once, see
+    `describeTree`, and the command `subscribe` makes the simulation send the
+    readings of a sensor after each tick, see `subscribe`. The commands
+    `get-tick` and `get-sim-time` give the tick and the simulated time of the
+    last step.
+
     Args:
         name: Name used to identify the ship.
         space: Representation of the space in the physical engine.
         body: Representation of the ship static and dynamic physical properties.
+        clock: Clock of the simulation, used by the devices that depend on
+            time, if not specified the wall time is used.
     """
 
     def __init__(self, name: str, space: 'pymunk.Space', body: 'pymunk.Body',
-                 **kwargs: 'Any') -> None:
+                 clock: 'SimulationClock' = None, **kwargs: 'Any') -> None:
 
         if 'device_type' not in kwargs:
             kwargs['device_type'] = 'structure'
@@ -39,6 +119,14 @@ class Structure(DeviceGroup):
         self.__body = body
         self.__space = space
         self.__name = name
+        self.__clock = clock
+
+        # Devices by handle and handles by path, see `buildDeviceIndex`
+        self.__devices: 'Optional[List[Device]]' = None
+        self.__paths: 'Dict[str, int]' = {}
+
+        # Sensors subscribed and their period in ticks by handle
+        self.__subscriptions: 'Dict[int, Tuple[Sensor, int]]' = {}
 
     @property
     def name(self) -> str:
@@ -50,6 +138,209 @@ class Structure(DeviceGroup):
         if isinstance(device, StructuralPart):
             device.structure = self
 
+        self.__devices = None
+
+    def buildDeviceIndex(self) -> None:
+        """Index every device of the ship by its path.
+
+        It is called by the ship loader once the ship has all its devices, if
+        it is not called the index is built the first time it is needed. The
+        devices added to the ship afterwards are indexed again, but not the
+        ones added to its parts.
+        """
+
+        devices: 'List[Device]' = [self]
+        paths = {'': 0}
+        _indexDevices(self, ('',), devices, paths)
+
+        self.__devices = devices
+        self.__paths = paths
+
+    def openDevice(self, path: str) -> 'Optional[int]':
+        """Get the handle of a device.
+
+        Args:
+            path: Path of the device, the names or numbers of the devices
+                separated by ':', it may end with ':', as the prefix of a
+                command. The path of the ship is ''.
+
+        Returns:
+            The handle or None if the device does not exist.
+        """
+
+        if self.__devices is None:
+            self.buildDeviceIndex()
+
+        return self.__paths.get(path.strip().rstrip(':'))
+
+    def deviceFromHandle(self, handle: int) -> 'Optional[Device]':
+
+        if self.__devices is None:
+            self.buildDeviceIndex()
+
+        devices = typingcast('List[Device]', self.__devices)
+        if 0 <= handle < len(devices):
+            return devices[handle]
+
+        return None
+
+    def describeTree(self) -> 'Dict[str, Any]':
+        """Describe the ship and every device in it.
+
+        Returns:
+            The description of the ship, see `DefaultDevice.describe`, where
+            each device also has its handle ('handle') and each device group
+            the descriptions of its devices in order ('children').
+        """
+
+        if self.__devices is None:
+            self.buildDeviceIndex()
+
+        handles = {id(device): handle for handle, device in
+                   enumerate(typingcast('List[Device]', self.__devices))}
+
+        return _describeDevice(self, handles)
+
+    def query(self, input_: str) -> 'Any':
+
+        if self.__devices is None:
+            self.buildDeviceIndex()
+        devices = typingcast('List[Device]', self.__devices)
+
+        if input_[:1] == '@':
+            handle, separator, command = input_[1:].partition(':')
+            try:
+                device = self.deviceFromHandle(int(handle)) \
+                    if separator else None
+            except ValueError:
+                device = None
+
+            if device is None:
+                return 'Invalid device'
+
+            return device.query(command)
+
+        # The arguments of these commands are paths, so they are never sent to
+        # a subdevice
+        if input_.lstrip().partition(' ')[0] in Structure.__PATH_COMMANDS:
+            return DefaultDevice.query(self, input_)
+
+        # The path is the text before the last ':', when it is not in the index
+        # the arguments of the command have ':' or the device does not exist,
+        # then the path is followed one level at a time as usual. The path of
+        # the ship is not valid in a command, it is left to the usual way too
+        path, separator, command = input_.rpartition(':')
+        if separator:
+            handle = self.__paths.get(path)
+            if handle:
+                return devices[handle].query(command)
+
+        return super().query(input_)
+
+    def __open(self, path: str = '') -> 'Union[int, str]':
+        handle = self.openDevice(path)
+        return 'Invalid device' if handle is None else handle
+
+    def subscribe(self, path: str, *period: str) -> 'Union[AnswerList, str]':
+        """Subscribe the controller to the readings of a sensor.
+
+        After each step the simulation sends the readings of the sensors
+        subscribed to the controller, see `subscriptionReadings`. Subscribing
+        to a sensor with many sensors, like a position sensor, subscribes to
+        each one of them.
+
+        Note:
+            This method is called by the command
+            `subscribe <path> [every <n> [ticks]]`, by default the readings
+            are sent every tick.
+
+        Args:
+            path: Path of the sensor.
+            *period: 'every' followed by the amount of ticks between readings
+                and optionally 'ticks'.
+
+        Returns:
+            The handles of the sensors subscribed, which identify their
+            readings.
+        """
+
+        every = _parsePeriod(period)
+
+        sensors = self.__sensorsAt(path)
+        if sensors is None:
+            return 'Invalid device'
+
+        if not sensors:
+            return '<<Not a sensor>>'
+
+        for handle, sensor in sensors:
+            self.__subscriptions[handle] = (sensor, every)
+
+        return AnswerList(handle for handle, _ in sensors)
+
+    def unsubscribe(self, path: str = None) -> str:
+        """Cancel the subscriptions to a sensor or every subscription.
+
+        Note:
+            This method is called by the command `unsubscribe [path]`.
+        """
+
+        if path is None:
+            self.__subscriptions.clear()
+            return '<<OK>>'
+
+        sensors = self.__sensorsAt(path)
+        if sensors is None:
+            return 'Invalid device'
+
+        for handle, _ in sensors:
+            self.__subscriptions.pop(handle, None)
+
+        return '<<OK>>'
+
+    def __sensorsAt(self, path: str) -> 'Optional[List[Tuple[int, Sensor]]]':
+        """Get the sensors of the device at a path with their handles.
+
+        Returns:
+            The sensor, the sensors of a `MultiSensor`, an empty list for
+            other devices or None if the device does not exist.
+        """
+
+        handle = self.openDevice(path)
+        if handle is None:
+            return None
+
+        device = self.deviceFromHandle(handle)
+        if isinstance(device, Sensor):
+            return [(handle, device)]
+
+        sensors = []
+        if isinstance(device, MultiSensor):
+            prefix = path.strip().rstrip(':')
+            for i in range(device.deviceCount()):
+                sensor = device.accessDevice(i)
+                sensor_handle = self.openDevice(f'{prefix}:{i}')
+                if isinstance(sensor, Sensor) and sensor_handle is not None:
+                    sensors.append((sensor_handle, sensor))
+
+        return sensors
+
+    def hasSubscriptions(self) -> bool:
+        return bool(self.__subscriptions)
+
+    def subscriptionReadings(self, tick: int) -> 'List[Tuple[int, float]]':
+        """Read the sensors subscribed that must be sent in a tick.
+
+        Args:
+            tick: Tick that has just been simulated.
+
+        Returns:
+            The handle and the reading of each sensor.
+        """
+
+        return [(handle, sensor.reading()) for handle, (sensor, every)
+                in self.__subscriptions.items() if tick % every == 0]
+
     def isDestroyed(self) -> bool:
         return self.__body.space is None
 
@@ -61,6 +352,37 @@ class Structure(DeviceGroup):
     def space(self) -> 'pymunk.Space':
         return self.__space
 
+    @property
+    def clock(self) -> 'Optional[SimulationClock]':
+        return self.__clock
+
+    @clock.setter
+    def clock(self, clock: 'Optional[SimulationClock]') -> None:
+        self.__clock = clock
+
+    def currentTime(self) -> float:
+
+        if self.__clock is None:
+            return time.time()
+
+        return self.__clock.time
+
+    def currentTick(self) -> int:
+        return 0 if self.__clock is None else self.__clock.tick
+
+    __COMMANDS = {
+
+        'open': __open,
+        'describe-tree': lambda self: json.dumps(self.describeTree(),
+                                                 default=str),
+        'subscribe': subscribe,
+        'unsubscribe': unsubscribe,
+        'get-tick': currentTick,
+        'get-sim-time': currentTime
+    }
+
+    __PATH_COMMANDS = frozenset(('open', 'subscribe', 'unsubscribe'))
+
 class StructuralPart(DeviceGroup):
 
     def __init__(self,
@@ -137,7 +459,7 @@ class Sensor(DefaultDevice):
         super().__init__(**kwargs)
 
         self.__st_part = st_part
-        self.__last_read_time: float = 0
+        self.__last_read_time: 'Optional[float]' = None
         self.__last_value: float = 0
         self.__read_time = read_time
         self.__error_gen = read_error_gen
@@ -161,13 +483,16 @@ class Sensor(DefaultDevice):
     def act(self) -> None:
         pass
 
-    def command(self, command: 'List[str]', *args) -> 'Any':
-        return super().command(command, Sensor.__COMMANDS, *args)
-
     def __read(self) -> float:
-        now = time.time()
 
-        if now - self.__last_read_time > self.__read_time:
+        structure = self.__st_part.structure
+        if structure is None:
+            now = time.time()
+        else:
+            now = structure.currentTime()
+
+        if self.__last_read_time is None or \
+            now - self.__last_read_time > self.__read_time:
 
             read_val = self.read()
             if self.__error_gen:
@@ -178,6 +503,32 @@ class Sensor(DefaultDevice):
 
         return self.__last_value
 
+    def describe(self) -> 'Dict[str, Any]':
+
+        description = super().describe()
+        description['reading-time'] = self.__read_time
+
+        # The same values answered by the commands 'max-error' and
+        # 'max-offset', which fail if the error generator does not have them
+        try:
+            description['max-error'] = self.max_read_error
+            description['max-offset'] = self.max_read_offset
+        except AttributeError:
+            description['max-error'] = description['max-offset'] = None
+
+        return description
+
+    def reading(self) -> float:
+        """Get the value answered by the command `read`.
+
+        The reading has the error of the sensor and is only updated after the
+        reading time, the same as when the controller reads it.
+
+        Returns:
+            The reading.
+        """
+        return self.__read()
+
     @abstractmethod
     def read(self) -> float:
         pass
@@ -213,6 +564,16 @@ class MultiSensor(DeviceGroup):
 
         return super().command(command, *args)
 
+    def describe(self) -> 'Dict[str, Any]':
+
+        description = super().describe()
+        if self.__sensors:
+            sensor_description = self.__sensors[0].describe()
+            for key in MultiSensor.__REDIRECT_COMMANDS:
+                description[key] = sensor_description[key]
+
+        return description
+
     __REDIRECT_COMMANDS = {'reading-time', 'max-error', 'max-offset'}
 
 class Actuator(DefaultDevice):
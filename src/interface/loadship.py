@@ -1,14 +1,8 @@
 
 from collections import namedtuple
-import json
 import math
 from typing import TYPE_CHECKING
 
-try:
-    from queue import SimpleQueue
-except ImportError:
-    from queue import Queue as SimpleQueue # type: ignore
-
 import anytree
 
 from .loadgraphicitem import loadGraphicItem
@@ -17,10 +11,10 @@ from ..storage.fileinfo import FileInfo
 
 if TYPE_CHECKING:
     # pylint: disable=ungrouped-imports
-    from threading import Lock
     from typing import Optional, Dict, Any, Callable, Sequence
     import pymunk
     from anytree import Node
+    from numpy.random import SeedSequence
     from ..devices.communicationdevices import CommunicationEngine
     from ..storage.loaders.scenarioloader import ShipInfo
     # pylint: enable=ungrouped-imports
@@ -28,8 +22,8 @@ if TYPE_CHECKING:
     DialogCallable = Callable[[Node], Optional[Sequence[str]]]
 
 ShipInterfaceInfo = namedtuple('ShipInfo', (
-    'device', 'gitem', 'widgets', 'thread',
-    'msg_queue', 'condition_graphic_items'))
+    'device', 'gitem', 'widgets', 'controller',
+    'controller_arguments', 'condition_graphic_items', 'model'))
 
 def __loadShipSelectModel(ship_model: 'Optional[Sequence[str]]',
                           options_dialog: 'Optional[DialogCallable]') \
@@ -72,10 +66,11 @@ def __loadShipSelectController(options_dialog: 'Optional[DialogCallable]') \
     return '/'.join(ship_controller)
 
 def loadShip(space: 'pymunk.Space', ship_info: 'ShipInfo',
-             arg_scenario_info: 'Dict[str, Any]', lock: 'Lock',
+             arg_scenario_info: 'Dict[str, Any]',
              ship_options_dialog: 'DialogCallable' = None,
              controller_options_dialog: 'DialogCallable' = None,
-             communication_engine: 'CommunicationEngine' = None) \
+             communication_engine: 'CommunicationEngine' = None,
+             seed: 'SeedSequence' = None) \
                  -> 'Optional[ShipInterfaceInfo]':
 
     arg_scenario_info['ship-name'] = ship_info.name
@@ -92,7 +87,7 @@ def loadShip(space: 'pymunk.Space', ship_info: 'ShipInfo',
     loaded_ship = FileInfo().loadShip(
         ship_model, ship_info.name, space,
         communication_engine=communication_engine,
-        variables=ship_info.variables)
+        variables=ship_info.variables, seed=seed)
 
     ship = loaded_ship.device
 
@@ -106,15 +101,10 @@ def loadShip(space: 'pymunk.Space', ship_info: 'ShipInfo',
         if ship_controller is None:
             return None
 
-    msg_queue: 'SimpleQueue' = SimpleQueue()
-    thread = FileInfo().loadController(ship_controller, ship,
-                                       json.dumps(arg_scenario_info),
-                                       msg_queue, lock)
-
     ship_gitem, condition_graphic_items = loadGraphicItem(
         ship.body.shapes, loaded_ship.images,
         condition_variables={'ship': ship.mirror})
 
     return ShipInterfaceInfo(ship, ship_gitem, loaded_ship.widgets,
-                             thread, msg_queue,
-                             condition_graphic_items)
+                             ship_controller, arg_scenario_info,
+                             condition_graphic_items, ship_model)
@@ -2,10 +2,8 @@
 import sys
 import time
 from math import pi
-from threading import Lock
 import traceback
 from pathlib import Path
-from queue import Empty as EmptyQueueException
 from typing import TYPE_CHECKING, cast as typingcast
 
 from PyQt5.QtWidgets import (
@@ -14,9 +12,8 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtGui import QImage
 from PyQt5.QtCore import QTimer, Qt
 
-import pymunk
-
 import anytree
+import pymunk
 
 from .choosefromtreedialog import ChooseFromTreeDialog
 from .helpdialog import HelpDialog
@@ -26,6 +23,10 @@ from .graphicsscene import GraphicsScene
 
 from ..storage.fileinfo import FileInfo
 
+from ..simulation.simulation import Simulation
+from ..simulation.simulationthread import SimulationThread
+from ..simulation.recording import TrajectoryRecording
+
 from ..objectives.objective import createObjectiveTree
 
 # sys.path manipulation used to import nodetreeview.py from ui
@@ -42,15 +43,15 @@ if TYPE_CHECKING:
     from typing import Tuple, Any, Dict, Optional, List, Sequence
     from PyQt5.QtWidgets import QGraphicsItem, QWidget
     from PyQt5.QtGui import QKeyEvent, QMoveEvent, QResizeEvent, QCloseEvent
-    from .loadship import ShipInterfaceInfo, SimpleQueue
+    from .loadship import ShipInterfaceInfo
     from .conditiongraphicspixmapitem import ConditionGraphicsPixmapItem
     from ..objectives.objective import Objective
-    from ..devices.structure import Structure
-    from ..devices.communicationdevices import CommunicationEngine
     from ..storage.loaders.scenarioloader import (
         ScenarioInfo, ShipInfo, ObjectInfo
     )
     from ..storage.loaders.imageloader import ImageInfo
+    from ..simulation.simulationthread import SimulationSnapshot
+    from ..simulation.recording import RecordedBody
     # pylint: enable=ungrouped-imports
 
 class ObjectiveNodeValue(NodeValue):
@@ -70,10 +71,25 @@ class ObjectiveNodeValue(NodeValue):
         self.name = f'{symbol}{self.__objective.name}'
 
 class MainWindow(QMainWindow):
+    """Main window of the program.
+
+    The simulation is advanced by a `SimulationThread` every `timer_interval`
+    milliseconds, the window is redrawn every `frame_interval` milliseconds
+    interpolating the last two snapshots published by the thread, so a slow
+    scene does not slow down the simulation, frames are dropped instead.
+
+    If `record_path` is specified the trajectories of every scenario loaded
+    are recorded there, recordings can be watched with `loadReplay`, which
+    moves the graphics items without running the physics or the controllers.
+    """
 
     def __init__(self, parent: 'QWidget' = None, one_shot: bool = False,
                  time_limit: float = None, follow_ship: int = None,
-                 start_zoom: float = None, timer_interval: int = 100) -> None:
+                 start_zoom: float = None, timer_interval: int = 100,
+                 lockstep: bool = False, tick_budget: float = 1,
+                 frame_interval: int = 16, seed: int = None,
+                 record_path: str = None,
+                 register_files: bool = False) -> None:
 
         super().__init__(parent=parent)
 
@@ -82,21 +98,30 @@ class MainWindow(QMainWindow):
 
         self.__ui.view.setScene(GraphicsScene(parent))
 
-        self.__lock = Lock()
+        self.__simulation = Simulation(time_limit=time_limit,
+                                       lockstep=lockstep,
+                                       tick_budget=tick_budget,
+                                       seed=seed,
+                                       register_files=register_files)
+
+        self.__simulation_thread = SimulationThread(
+            self.__simulation, timer_interval/1000)
+        self.__simulation_thread.start()
 
         self.__timer = QTimer(self)
         self.__timer.timeout.connect(self.__timerTimeout)
 
-        self.__timer.setInterval(timer_interval)
+        self.__timer.setInterval(frame_interval)
         self.__timer.start()
 
-        self.__space = pymunk.Space()
-        self.__space.gravity = (0, 0)
+        self.__record_path = record_path
+        self.__replay: 'Optional[TrajectoryRecording]' = None
+        self.__replay_items: 'List[QGraphicsItem]' = []
+        self.__replay_start = 0.
+        self.__replay_paused_at: 'Optional[float]' = None
 
         self.__ships: 'List[ShipInterfaceInfo]' = []
         self.__objects: 'List[Tuple[pymunk.Body, QGraphicsItem]]' = []
-        self.__scenario_objectives: 'List[Objective]' = []
-        self.__objectives_result: 'Optional[bool]' = None
         self.__current_scenario: 'Optional[str]' = None
 
         self.__widgets: 'List[QWidget]' = []
@@ -111,17 +136,12 @@ class MainWindow(QMainWindow):
 
         self.__current_ship_widgets_index = 0
 
-        self.__comm_engine: 'Optional[CommunicationEngine]' = None
-        self.__debug_msg_queues: 'Dict[str, SimpleQueue]' = {}
-
         self.__debug_messages_text_browsers: 'Dict[str, QTextBrowser]' = {}
         self.__condition_graphic_items: 'List[ConditionGraphicsPixmapItem]' = []
 
         self.__ship_to_follow = follow_ship
 
         self.__one_shot = one_shot
-        self.__start_scenario_time: float = 0
-        self.__time_limit = time_limit
 
         self.__ui.actionSimulationAutoRestart.setChecked(bool(
             FileInfo().readConfig('Simulation', 'auto_restart', default=False)))
@@ -171,11 +191,10 @@ class MainWindow(QMainWindow):
         if self.__current_scenario is None:
             self.setWindowTitle(self.__title_basename)
         else:
-            if not self.__scenario_objectives or \
-                self.__objectives_result is None:
-
+            objectives_result = self.__simulation.objectives_result
+            if not self.__simulation.objectives or objectives_result is None:
                 suffix = ''
-            elif self.__objectives_result is True:
+            elif objectives_result is True:
                 suffix = ' ✓'
             else:
                 suffix = ' ✗'
@@ -185,6 +204,7 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, _event: 'QCloseEvent') -> None:
         self.clear()
+        self.__simulation_thread.stop()
         self.__ui.view.setScene(None)
 
     def clear(self) -> None:
@@ -195,23 +215,28 @@ class MainWindow(QMainWindow):
         self.__ui.deviceInterfaceComponents.show()
         self.__ui.treeView.show()
 
-        self.__start_scenario_time = 0
         self.__center_view_on = None
 
-        with self.__lock:
-            self.__space.remove(*self.__space.bodies, *self.__space.shapes)
+        with self.__simulation_thread.paused():
+            self.__simulation_thread.running = False
+            self.__simulation.clear()
+            self.__simulation_thread.clearSnapshots()
+
+        scene = self.__ui.view.scene()
+        for ship_info in self.__ships:
+            for widget in ship_info.widgets:
+                widget.setParent(None)
 
-            scene = self.__ui.view.scene()
-            for ship_info in self.__ships:
-                for widget in ship_info.widgets:
-                    widget.setParent(None)
+        for item in scene.items():
+            scene.removeItem(item)
 
-            for item in scene.items():
-                scene.removeItem(item)
+        self.__ships.clear()
+        self.__objects.clear()
+        self.__condition_graphic_items.clear()
 
-            self.__ships.clear()
-            self.__objects.clear()
-            self.__condition_graphic_items.clear()
+        self.__replay = None
+        self.__replay_items.clear()
+        self.__replay_paused_at = None
 
         self.__current_scenario = None
         self.__current_ship_widgets_index = 0
@@ -239,6 +264,13 @@ class MainWindow(QMainWindow):
         if scenario is not None:
             self.loadScenario('/'.join(scenario))
 
+    def __loadReplayAction(self) -> None:
+
+        path = QFileDialog.getExistingDirectory(self, 'Choose recording')
+
+        if path:
+            self.loadReplay(path)
+
     def __chooseShipDialog(self, ship_options: 'Tuple[anytree.Node]') \
             -> 'Optional[Sequence[str]]':
         return self.__getOptionDialog('Choose ship model', ship_options)
@@ -254,10 +286,11 @@ class MainWindow(QMainWindow):
                        -> 'Optional[ShipInterfaceInfo]':
 
         loaded_ship_info = loadShip(
-            self.__space, ship_info, arg_scenario_info, self.__lock,
+            self.__simulation.space, ship_info, arg_scenario_info,
             ship_options_dialog=self.__chooseShipDialog,
             controller_options_dialog=self.__chooseControllerDialog,
-            communication_engine=self.__comm_engine)
+            communication_engine=self.__simulation.communication_engine,
+            seed=self.__simulation.spawnSeed())
 
         if loaded_ship_info is None:
             return None
@@ -267,9 +300,6 @@ class MainWindow(QMainWindow):
         for widget in self.__widgets:
             widget.setParent(self.__ui.deviceInterfaceComponents)
 
-        self.__debug_msg_queues[loaded_ship_info.device.name] = \
-            loaded_ship_info.msg_queue
-
         self.__condition_graphic_items.extend(
             loaded_ship_info.condition_graphic_items)
 
@@ -278,7 +308,12 @@ class MainWindow(QMainWindow):
         self.__ui.deviceInterfaceComboBox.addItem(
             f'{ship_info.name} ({ship_info.model})')
 
-        loaded_ship_info.thread.start()
+        self.__simulation.addShip(loaded_ship_info.device,
+                                  model=loaded_ship_info.model,
+                                  variables=ship_info.variables)
+        self.__simulation.setController(
+            loaded_ship_info.device, loaded_ship_info.controller,
+            loaded_ship_info.controller_arguments)
 
         return loaded_ship_info
 
@@ -300,7 +335,7 @@ class MainWindow(QMainWindow):
 
             obj_model = '/'.join(obj_model)
 
-        object_info = fileinfo.loadObject(obj_model, self.__space,
+        object_info = fileinfo.loadObject(obj_model, self.__simulation.space,
                                           variables=obj_info.variables)
 
         body = object_info.body
@@ -315,6 +350,9 @@ class MainWindow(QMainWindow):
 
         self.__ui.view.scene().addItem(object_gitem)
 
+        self.__simulation.addObject(body, model=obj_model,
+                                    variables=obj_info.variables)
+
         return body, object_gitem
 
     def __loadScenarioShips(self, ships_info: 'List[ShipInfo]',
@@ -394,21 +432,56 @@ class MainWindow(QMainWindow):
             self.__debug_messages_text_browsers[ship.name] = tbrowser
             self.__ui.debugMessagesTabWidget.addTab(tbrowser, ship.name)
 
-    def __loadSpaceProperties(self, scenario_info: 'ScenarioInfo') -> None:
-
-        space_info = scenario_info.physics_engine
-        self.__space.damping = space_info.damping
-        self.__space.gravity = space_info.gravity
-        self.__space.collision_slop = space_info.collision_slop
-        self.__space.collision_persistence = space_info.collision_persistence
-        self.__space.iterations = space_info.iterations
-
     def loadScenario(self, scenario: str) -> None:
 
         self.clear()
 
+        with self.__simulation_thread.paused():
+            self.__loadScenario(scenario)
+
+            if self.__current_scenario is not None and \
+                    self.__record_path is not None:
+                self.__simulation.startRecording(self.__record_path)
+
+            self.__simulation_thread.running = \
+                self.__current_scenario is not None
+
+        if self.__ui.actionFitAllOnStart.isChecked():
+            self.__updateGraphicsItems()
+            self.__ui.view.fitInView(
+                self.__ui.view.scene().itemsBoundingRect(), Qt.KeepAspectRatio)
+
+    def restartScenario(self) -> None:
+        """Restart the current scenario from the state it had when loaded.
+
+        The scenario is only loaded again from the files if the simulation
+        has no state saved.
+        """
+
+        if self.__current_scenario is None:
+            return
+
+        with self.__simulation_thread.paused():
+            restarted = self.__simulation.restart()
+
+            if restarted:
+                self.__simulation_thread.clearSnapshots()
+
+                if self.__record_path is not None:
+                    self.__simulation.startRecording(self.__record_path)
+
+        if not restarted:
+            self.loadScenario(self.__current_scenario)
+            return
+
+        for text_browser in self.__debug_messages_text_browsers.values():
+            text_browser.clear()
+
+        self.__updateGraphicsItems()
+
+    def __loadScenario(self, scenario: str) -> None:
+
         fileinfo = FileInfo()
-        self.__start_scenario_time = time.time()
 
         try:
             scenario_info = fileinfo.loadScenario(scenario)
@@ -418,31 +491,16 @@ class MainWindow(QMainWindow):
                 f'{type(err).__name__}: {err}'))
             return
 
-        self.__ui.view.scene().setBackgroundImage(
-            QImage(str(FileInfo().getPath(FileInfo.FileDataType.IMAGE,
-                                          scenario_info.background.image))))
-        self.__ui.view.scene().setForegroundImage(
-            QImage(str(FileInfo().getPath(FileInfo.FileDataType.IMAGE,
-                                          scenario_info.foreground.image))))
+        self.__simulation.setScenario(scenario, scenario_info)
 
-        self.__loadSpaceProperties(scenario_info)
+        self.__loadScenarioImages(scenario_info)
 
         self.__ui.deviceInterfaceWidgets.setVisible(
             scenario_info.visible_user_interface)
         self.__ui.debugMessagesTabWidget.setVisible(
             scenario_info.visible_debug_window)
 
-        self.__comm_engine = scenario_info.communication_engine
-
-        self.__scenario_objectives = scenario_info.objectives
-
-        arg_scenario_info = {
-
-            'objectives': [objective.toDict() for objective in
-                           self.__scenario_objectives]
-        }
-
-        self.__debug_msg_queues.clear()
+        arg_scenario_info = self.__simulation.controllerArguments()
 
         ships = self.__loadScenarioShips(scenario_info.ships, arg_scenario_info)
         if ships is None:
@@ -455,16 +513,16 @@ class MainWindow(QMainWindow):
         self.__ships = ships
         self.__objects = objects
 
-        self.__space.reindex_static()
+        self.__simulation.space.reindex_static()
 
         if self.__ships:
             for widget in self.__ships[0].widgets:
                 widget.show()
 
         self.__objectives_node_value = []
-        if self.__scenario_objectives:
+        if self.__simulation.objectives:
             objectives_root_node = anytree.Node('root')
-            for objective in self.__scenario_objectives:
+            for objective in self.__simulation.objectives:
                 createObjectiveTree(objective, parent=objectives_root_node)
 
             for node in objectives_root_node.descendants:
@@ -484,105 +542,213 @@ class MainWindow(QMainWindow):
 
         self.__loadDebugMessages(ships)
 
+        self.__simulation.saveInitialState()
+        self.__simulation.startControllers()
+
+    def __loadScenarioImages(self, scenario_info: 'ScenarioInfo') -> None:
+
+        self.__ui.view.scene().setBackgroundImage(
+            QImage(str(FileInfo().getPath(FileInfo.FileDataType.IMAGE,
+                                          scenario_info.background.image))))
+        self.__ui.view.scene().setForegroundImage(
+            QImage(str(FileInfo().getPath(FileInfo.FileDataType.IMAGE,
+                                          scenario_info.foreground.image))))
+
+    def loadReplay(self, path: str) -> None:
+        """Show a recording made with `Simulation.startRecording`.
+
+        The graphics items of the ships and objects are created from the
+        models written in the recording and moved to the recorded positions,
+        nothing is simulated.
+
+        Args:
+            path: Directory of the recording.
+        """
+
+        self.clear()
+
+        fileinfo = FileInfo()
+
+        try:
+            recording = TrajectoryRecording(path)
+            scenario_info = fileinfo.loadScenario(recording.scenario)
+
+            # The bodies are only used to create the graphics items, they are
+            # never added to the simulation
+            space = pymunk.Space()
+            for body_info in recording.bodies:
+                self.__replay_items.append(
+                    self.__loadReplayItem(body_info, space, fileinfo))
+        except Exception as err:
+            traceback.print_exc()
+            self.clear()
+            QMessageBox.warning(self, 'Error', (
+                'An error occurred loading the recording: \n'
+                f'{type(err).__name__}: {err}'))
+            return
+
+        self.__loadScenarioImages(scenario_info)
+        self.__loadStaticImages(scenario_info.static_images)
+
+        self.__ui.deviceInterfaceWidgets.setVisible(False)
+        self.__ui.debugMessagesTabWidget.setVisible(False)
+        self.__ui.treeView.hide()
+
+        self.__replay = recording
+        self.__replay_start = time.monotonic()
+        self.__current_scenario = recording.scenario
+
+        self.__updateReplayItems()
+
         if self.__ui.actionFitAllOnStart.isChecked():
-            self.__timerTimeout()
             self.__ui.view.fitInView(
                 self.__ui.view.scene().itemsBoundingRect(), Qt.KeepAspectRatio)
 
-    @staticmethod
-    def __updateGraphicsItem(body: 'pymunk.Body',
-                             gitem: 'QGraphicsItem') -> None:
+    def __loadReplayItem(self, body_info: 'RecordedBody',
+                         space: 'pymunk.Space',
+                         fileinfo: 'FileInfo') -> 'QGraphicsItem':
 
-        pos = body.position
-        gitem.setX(pos.x)
-        gitem.setY(pos.y)
-        gitem.prepareGeometryChange()
-        gitem.setRotation(180*body.angle/pi)
+        if body_info.model is None:
+            raise ValueError(f'The model of \'{body_info.name}\' was not '
+                             'recorded')
 
-    def __objectivesTimedOut(self) -> bool:
+        if body_info.kind == 'ship':
+            ship_info = fileinfo.loadShip(body_info.model, body_info.name,
+                                          space, variables=body_info.variables)
+            ship = ship_info.device
+            gitem, condition_graphic_items = loadGraphicItem(
+                ship.body.shapes, ship_info.images,
+                condition_variables={'ship': ship.mirror})
+        else:
+            object_info = fileinfo.loadObject(body_info.model, space,
+                                              variables=body_info.variables)
+            gitem, condition_graphic_items = loadGraphicItem(
+                object_info.body.shapes, object_info.images,
+                default_color=Qt.gray)
+
+        self.__condition_graphic_items.extend(condition_graphic_items)
+        self.__ui.view.scene().addItem(gitem)
 
-        if self.__time_limit is None or self.__start_scenario_time is None:
-            return False
+        return gitem
 
-        return time.time() - self.__start_scenario_time > self.__time_limit
+    def __replayTime(self) -> float:
 
-    def __createObjectivesRecord(self, node: 'anytree.Node',
-                                 current_time: float) -> 'Dict[str, Any]':
+        if self.__replay_paused_at is not None:
+            return self.__replay_paused_at
 
-        objective = node.name
+        return time.monotonic() - self.__replay_start
+
+    def seekReplay(self, timestamp: float) -> None:
+        """Move the replay to a simulated time.
+
+        Args:
+            timestamp: Time in seconds since the start of the recording.
+        """
+
+        if self.__replay is None:
+            return
 
-        finished_at = objective.finished_at
-        if finished_at is None:
-            time_to_result = None
+        timestamp = min(max(timestamp, 0), self.__replay.duration)
+
+        if self.__replay_paused_at is None:
+            self.__replay_start = time.monotonic() - timestamp
         else:
-            time_to_result = finished_at - objective.started_at
+            self.__replay_paused_at = timestamp
 
-        return {
-            'name': objective.name,
-            'desc': objective.description,
-            'accomplished': objective.accomplished(),
-            'failed': objective.failed(),
-            'time': time_to_result,
-            'children': [self.__createObjectivesRecord(child, current_time)
-                         for child in node.children]
-        }
+    def toggleReplayPause(self) -> None:
 
+        if self.__replay is None:
+            return
 
-    def __saveStatistics(self) -> None:
+        if self.__replay_paused_at is None:
+            self.__replay_paused_at = self.__replayTime()
+        else:
+            self.__replay_start = time.monotonic() - self.__replay_paused_at
+            self.__replay_paused_at = None
 
-        current_time = time.time()
-        scenario_time = current_time - self.__start_scenario_time
+    def __updateReplayItems(self) -> None:
 
-        if self.__time_limit is not None and scenario_time > self.__time_limit:
-            scenario_time = self.__time_limit
+        replay = typingcast('TrajectoryRecording', self.__replay)
 
-        objectives = createObjectiveTree(self.__scenario_objectives)
+        if replay.ticks == 0:
+            return
 
-        FileInfo().saveStatistics({
-            'success': self.__objectives_result,
-            'scenario': self.__current_scenario,
-            'time': scenario_time,
-            'objectives': [self.__createObjectivesRecord(child, current_time)
-                           for child in objectives.children]
-        })
+        tick = replay.tickAt(self.__replayTime())
+        for gitem, pose in zip(self.__replay_items, replay.poses(tick)):
+            self.__updateGraphicsItem(gitem, *pose)
 
-    def __handleDebugMessages(self) -> None:
+        if self.__condition_graphic_items:
+            timestamp = replay.time(tick)
+            for dyn_gitem in self.__condition_graphic_items:
+                dyn_gitem.evaluate(timestamp=timestamp)
 
-        for ship_name, queue in self.__debug_msg_queues.items():
-            tbrowser = self.__debug_messages_text_browsers.get(ship_name)
-            if tbrowser is None:
-                continue
+        self.setWindowTitle(
+            f'{self.__title_basename}({replay.scenario}) replay '
+            f'{replay.time(tick):.1f}/{replay.duration:.1f}s')
 
-            try:
-                while not queue.empty():
-                    tbrowser.append(queue.get_nowait())
-            except EmptyQueueException:
-                pass
+    @staticmethod
+    def __updateGraphicsItem(gitem: 'QGraphicsItem', x_pos: float,
+                             y_pos: float, angle: float) -> None:
 
-    def __checkObjectives(self, ships: 'Sequence[Structure]') -> None:
+        gitem.setX(x_pos)
+        gitem.setY(y_pos)
+        gitem.prepareGeometryChange()
+        gitem.setRotation(180*angle/pi)
 
-        objectives_complete = all(
-            tuple(objective.verify(self.__space, ships)
-                  for objective in self.__scenario_objectives))
+    @staticmethod
+    def __interpolationFactor(previous: 'Optional[SimulationSnapshot]',
+                              last: 'SimulationSnapshot') -> float:
 
-        if objectives_complete:
-            self.__objectives_result = True
-        else:
+        if previous is None:
+            return 1
 
-            if self.__objectivesTimedOut() or any(
-                    tuple(objective.failed()
-                          for objective in self.__scenario_objectives)):
+        interval = last.wall_time - previous.wall_time
+        if interval <= 0:
+            return 1
 
-                self.__objectives_result = False
-            else:
-                self.__objectives_result = None
+        return min((time.monotonic() - last.wall_time)/interval, 1)
+
+    def __updateGraphicsItems(self) -> None:
+
+        items = [(ship_info.device.body, ship_info.gitem)
+                 for ship_info in self.__ships]
+        items.extend(self.__objects)
+
+        previous, last = self.__simulation_thread.snapshots()
+
+        if last is None:
+            with self.__simulation.read_lock:
+                for body, gitem in items:
+                    pos = body.position
+                    self.__updateGraphicsItem(gitem, pos.x, pos.y, body.angle)
+            return
+
+        factor = self.__interpolationFactor(previous, last)
+        for body, gitem in items:
+            state = last.bodies.get(body)
+            if state is None:
+                continue
+
+            if previous is not None:
+                previous_state = previous.bodies.get(body)
+                if previous_state is not None:
+                    state = tuple(prev_val + factor*(val - prev_val)
+                                  for prev_val, val in zip(previous_state,
+                                                           state))
+
+            self.__updateGraphicsItem(gitem, *state)
+
+    def __handleDebugMessages(self) -> None:
+
+        for ship_name, message in self.__simulation.debugMessages():
+            tbrowser = self.__debug_messages_text_browsers.get(ship_name)
+            if tbrowser is not None:
+                tbrowser.append(message)
 
     def __dynamicGraphicItemsUpdate(self) -> None:
 
         if self.__condition_graphic_items:
-            timestamp = time.time()
-            if self.__start_scenario_time is not None:
-                timestamp -= self.__start_scenario_time
+            timestamp = self.__simulation.clock.time
             for dyn_gitem in self.__condition_graphic_items:
                 dyn_gitem.evaluate(timestamp=timestamp)
 
@@ -591,34 +757,29 @@ class MainWindow(QMainWindow):
         if self.__current_scenario is None:
             return
 
+        if self.__replay is not None:
+            self.__updateReplayItems()
+            return
+
         if self.__center_view_on is not None:
             self.__ui.view.centerOn(self.__center_view_on)
 
-        ships = tuple(ship.device for ship in self.__ships)
-        with self.__lock:
-            self.__space.step(0.02)
-            for ship_info in self.__ships:
-                ship = ship_info.device
-                ship.act()
-                self.__updateGraphicsItem(ship.body, ship_info.gitem)
-
-            for obj_body, gitem in self.__objects:
-                self.__updateGraphicsItem(obj_body, gitem)
-
-            if self.__comm_engine is not None:
-                self.__comm_engine.step()
+        self.__updateGraphicsItems()
 
-            self.__checkObjectives(ships)
-            self.__dynamicGraphicItemsUpdate()
+        # The conditions only read the state of the ships, without them the
+        # commands of the ships are not held up at every frame
+        if self.__condition_graphic_items:
+            with self.__simulation.read_lock:
+                self.__dynamicGraphicItemsUpdate()
 
-        if self.__objectives_result is not None:
+        if self.__simulation.objectives_result is not None:
             if self.__one_shot is True:
-                self.__saveStatistics()
+                self.__simulation.saveStatistics()
                 self.close()
                 return
             if self.__ui.actionSimulationAutoRestart.isChecked():
-                self.__saveStatistics()
-                self.loadScenario(self.__current_scenario)
+                self.__simulation.saveStatistics()
+                self.restartScenario()
                 return
 
         for node_value in self.__objectives_node_value:
@@ -760,6 +921,9 @@ class MainWindow(QMainWindow):
         self.__ui.actionLoadScenario.triggered.connect(
             self.__loadScenarioAction)
 
+        self.__ui.actionLoadReplay.triggered.connect(
+            self.__loadReplayAction)
+
         self.__ui.actionImportScenario.triggered.connect(
             self.__importScenarioAction)
 
@@ -829,6 +993,17 @@ class MainWindow(QMainWindow):
                     self.__ui.view.scene().itemsBoundingRect(),
                     Qt.KeepAspectRatio)
                 updated_view = True
+        elif self.__replay is not None and \
+                key in (Qt.Key_Space, Qt.Key_BracketLeft, Qt.Key_BracketRight,
+                        Qt.Key_Home):
+            if key == Qt.Key_Space:
+                self.toggleReplayPause()
+            elif key == Qt.Key_BracketLeft:
+                self.seekReplay(self.__replayTime() - 5)
+            elif key == Qt.Key_BracketRight:
+                self.seekReplay(self.__replayTime() + 5)
+            else:
+                self.seekReplay(0)
         else:
             if key in (Qt.Key_Left, Qt.Key_Right, Qt.Key_Up, Qt.Key_Down):
                 self.__ui.view.keyPressEvent(event)
@@ -1,16 +1,28 @@
 
+import os
 import sys
 import argparse
 from collections import namedtuple
+from typing import TYPE_CHECKING
 
-from PyQt5.QtWidgets import QApplication
+from .utils.startuptimer import StartupTimer
 
-from .interface.mainwindow import MainWindow
-from .storage.fileinfo import FileInfo
+# The heavy modules (Qt, the physics engine and the loaders) are imported only
+# by the mode that uses them, so the headless mode never imports the graphical
+# interface and invalid arguments are reported immediately. The headless mode
+# still imports Qt and creates an application object, the interface devices of
+# the ships create widgets even though they are never shown
+
+if TYPE_CHECKING:
+    # pylint: disable=ungrouped-imports
+    from typing import Optional
+    # pylint: enable=ungrouped-imports
 
 ProgramArgsInfo = namedtuple('ProgramArgsInfo', (
     'scenario', 'one_shot', 'time_limit', 'follow_ship', 'start_zoom',
-    'timer_interval'))
+    'timer_interval', 'headless', 'lockstep', 'tick_budget', 'seed',
+    'record_path', 'replay_path', 'statistics_path', 'startup_report',
+    'bundle_path', 'register_files', 'max_time'))
 
 def getProgramArguments() -> 'ProgramArgsInfo':
 
@@ -28,6 +40,36 @@ def getProgramArguments() -> 'ProgramArgsInfo':
     parser.add_argument('--zoom', type=float, help='Starting zoom')
     parser.add_argument('--timer-interval', type=int, default=100, help=(
         'Time in milliseconds between each simulation \'step\''))
+    parser.add_argument('--headless', action='store_true', help=(
+        'Run the scenario as fast as possible without showing any window, the '
+        'program is closed when the scenario finishs'))
+    parser.add_argument('--lockstep', action='store_true', help=(
+        'Each simulation step waits for the controllers to finish their '
+        'commands'))
+    parser.add_argument('--tick-budget', type=float, default=1, help=(
+        'Maximum time in seconds a simulation step waits for a controller when '
+        '\'--lockstep\' is used'))
+    parser.add_argument('--seed', type=int, help=(
+        'Seed of the random generators, runs with the same seed produce the '
+        'same noise'))
+    parser.add_argument('--record', help=(
+        'Directory where the trajectories of the ships and objects will be '
+        'recorded'))
+    parser.add_argument('--replay', help=(
+        'Directory of a recording that will be shown instead of running a '
+        'scenario'))
+    parser.add_argument('--bundle', help=(
+        'Path to a scenario bundle created with \'spaceshipcontrol-compile\' '
+        'that will be run instead of a scenario, only with \'--headless\''))
+    parser.add_argument('--register-files', action='store_true', help=(
+        'Share the sensors and actuators of each ship with its controller '
+        'through a file mapped to memory'))
+    parser.add_argument('--max-time', type=float, help=(
+        'Simulated seconds after which a scenario run with \'--headless\' is '
+        'stopped if its objectives have no result, 3600 by default'))
+    parser.add_argument('--startup-report', action='store_true', help=(
+        'Print how long each stage of the startup took and the packages '
+        'imported in each one'))
 
     args = parser.parse_args()
 
@@ -36,19 +78,121 @@ def getProgramArguments() -> 'ProgramArgsInfo':
               file=sys.stderr)
         sys.exit(-1)
 
-    if args.file_path is not None:
-        FileInfo().statistics_filepath = args.file_path
+    if args.bundle is not None and (not args.headless or
+                                    args.scenario is not None):
+        print('\'--bundle\' can only be used together with \'--headless\' '
+              'and without \'--scenario\'', file=sys.stderr)
+        sys.exit(-1)
+
+    if args.headless and args.scenario is None and args.bundle is None:
+        print('\'--headless\' can only be used together with \'--scenario\' '
+              'or \'--bundle\'', file=sys.stderr)
+        sys.exit(-1)
+
+    if args.replay is not None and (args.headless or
+                                    args.scenario is not None):
+        print('\'--replay\' can not be used together with \'--headless\' or '
+              '\'--scenario\'', file=sys.stderr)
+        sys.exit(-1)
 
     return ProgramArgsInfo(scenario=args.scenario,
                            one_shot=args.one_shot,
                            time_limit=args.time_limit,
                            follow_ship=args.follow,
                            start_zoom=args.zoom,
-                           timer_interval=args.timer_interval)
+                           timer_interval=args.timer_interval,
+                           headless=args.headless,
+                           lockstep=args.lockstep,
+                           tick_budget=args.tick_budget,
+                           seed=args.seed,
+                           record_path=args.record,
+                           replay_path=args.replay,
+                           statistics_path=args.file_path,
+                           startup_report=args.startup_report,
+                           bundle_path=args.bundle,
+                           register_files=args.register_files,
+                           max_time=args.max_time)
+
+def printStartupReport(program_args: 'ProgramArgsInfo',
+                       startup_timer: 'Optional[StartupTimer]') -> None:
+
+    if program_args.startup_report and startup_timer is not None:
+        print(startup_timer.report(), file=sys.stderr)
+
+def runHeadless(program_args: 'ProgramArgsInfo',
+                startup_timer: 'StartupTimer' = None) -> int:
+
+    # pylint: disable=import-outside-toplevel
+    from PyQt5.QtWidgets import QApplication
+    from .simulation.simulation import DEFAULT_MAX_TIME, Simulation
+    from .storage.fileinfo import FileInfo
+    # pylint: enable=import-outside-toplevel
+
+    if startup_timer is not None:
+        startup_timer.markStage('imports')
+
+    if program_args.statistics_path is not None:
+        FileInfo().statistics_filepath = program_args.statistics_path
+
+    # Interface devices create widgets, so an application object is still
+    # needed, but nothing is ever shown and the event loop is never started
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    _app = QApplication(sys.argv)
+
+    simulation = Simulation(time_limit=program_args.time_limit,
+                            lockstep=program_args.lockstep,
+                            tick_budget=program_args.tick_budget,
+                            seed=program_args.seed,
+                            register_files=program_args.register_files)
+
+    try:
+        if program_args.bundle_path is None:
+            scenario_info = simulation.loadScenario(program_args.scenario)
+        else:
+            scenario_info = simulation.loadBundle(program_args.bundle_path)
+    except Exception as err: # pylint: disable=broad-except
+        print('An error occurred loading the scenario: '
+              f'{type(err).__name__}: {err}', file=sys.stderr)
+        return -1
+
+    if startup_timer is not None:
+        startup_timer.markStage('scenario')
+    printStartupReport(program_args, startup_timer)
+
+    if program_args.record_path is not None:
+        simulation.startRecording(program_args.record_path)
+
+    try:
+        result = simulation.run(
+            print_debug_messages=scenario_info.visible_debug_window,
+            max_time=DEFAULT_MAX_TIME if program_args.max_time is None else
+            program_args.max_time)
+        simulation.saveStatistics()
+    finally:
+        simulation.clear()
+
+    return 0 if result is True else 1
 
 def main() -> None:
 
+    startup_timer = StartupTimer()
+
     program_args = getProgramArguments()
+    startup_timer.markStage('arguments')
+
+    if program_args.headless:
+        sys.exit(runHeadless(program_args, startup_timer=startup_timer))
+
+    # pylint: disable=import-outside-toplevel
+    from PyQt5.QtWidgets import QApplication
+    from .interface.mainwindow import MainWindow
+    from .storage.fileinfo import FileInfo
+    # pylint: enable=import-outside-toplevel
+
+    startup_timer.markStage('imports')
+
+    if program_args.statistics_path is not None:
+        FileInfo().statistics_filepath = program_args.statistics_path
 
     app = QApplication(sys.argv)
 
@@ -56,11 +200,23 @@ def main() -> None:
                         time_limit=program_args.time_limit,
                         follow_ship=program_args.follow_ship,
                         start_zoom=program_args.start_zoom,
-                        timer_interval=program_args.timer_interval)
+                        timer_interval=program_args.timer_interval,
+                        lockstep=program_args.lockstep,
+                        tick_budget=program_args.tick_budget,
+                        seed=program_args.seed,
+                        record_path=program_args.record_path,
+                        register_files=program_args.register_files)
     window.show()
+    startup_timer.markStage('window')
 
     if program_args.scenario is not None:
         window.loadScenario(program_args.scenario)
+        startup_timer.markStage('scenario')
+    elif program_args.replay_path is not None:
+        window.loadReplay(program_args.replay_path)
+        startup_timer.markStage('replay')
+
+    printStartupReport(program_args, startup_timer)
 
     sys.exit(app.exec_())
 
@@ -16,12 +16,14 @@ if TYPE_CHECKING:
     )
     import pymunk
     from ..devices.structure import Structure
+    from ..simulation.clock import SimulationClock
 
 class Objective(ABC):
     """Base class for all objectives.
 
     This abstract class is the base for all classes that represent a scenario
-    objective.
+    objective. The times are measured using the wall time unless a simulation
+    clock is set with `setClock`.
 
     """
 
@@ -35,7 +37,8 @@ class Objective(ABC):
         self.__acp = False
         self.__failed = False
         self.__neg = negation
-        self.__start = time.time()
+        self.__clock: 'Optional[SimulationClock]' = None
+        self.__start = self._currentTime()
         self.__finish: 'Optional[float]' = None
         if valid_ships is None:
             self.__valid_ships = None
@@ -64,6 +67,29 @@ class Objective(ABC):
     def finished_at(self) -> 'Optional[float]':
         return self.__finish
 
+    @property
+    def clock(self) -> 'Optional[SimulationClock]':
+        return self.__clock
+
+    def setClock(self, clock: 'Optional[SimulationClock]') -> None:
+        """Set the clock used to measure the time of this objective.
+
+        The objective start time is restarted using the new clock.
+
+        Args:
+            clock: Clock of the simulation, if None the wall time is used.
+        """
+
+        self.__clock = clock
+        self.__start = self._currentTime()
+
+    def _currentTime(self) -> float:
+
+        if self.__clock is None:
+            return time.time()
+
+        return self.__clock.time
+
     def accomplished(self) -> bool:
         """Consult if the objective was accomplished.
 
@@ -121,10 +147,10 @@ class Objective(ABC):
         if self.__acp is False and self.__failed is False:
             if self._verify(space, ships) is True:
                 self.__acp = True
-                self.__finish = time.time()
+                self.__finish = self._currentTime()
             elif self._hasFailed(space, ships):
                 self.__failed = True
-                self.__finish = time.time()
+                self.__finish = self._currentTime()
 
         return self.accomplished()
 
@@ -158,7 +184,7 @@ class Objective(ABC):
     def reset(self) -> None:
         self.__acp = False
         self.__failed = False
-        self.__start = time.time()
+        self.__start = self._currentTime()
         self.__finish = None
 
 class ObjectiveGroup(Objective):
@@ -192,6 +218,12 @@ class ObjectiveGroup(Objective):
     def subobjectives(self) -> 'Sequence[Objective]':
         return self.__subobjectives
 
+    def setClock(self, clock: 'Optional[SimulationClock]') -> None:
+        super().setClock(clock)
+
+        for objective in self.__subobjectives:
+            objective.setClock(clock)
+
     def objectivesStatus(self) -> 'Iterable[Tuple[Objective, bool]]':
 
         return ((objective, objective.accomplished())
@@ -260,6 +292,9 @@ class ObjectiveGroup(Objective):
     def reset(self) -> None:
         super().reset()
 
+        for objective in self.__subobjectives:
+            objective.reset()
+
         self.__times_left = self.__times
 
 def createObjectiveTree(objective: 'Union[Objective, Sequence[Objective]]',
@@ -1,5 +1,4 @@
 
-import time
 from typing import TYPE_CHECKING
 
 from .objective import ObjectiveGroup
@@ -31,7 +30,7 @@ class TimedObjectiveGroup(ObjectiveGroup):
     def _verify(self, space: 'pymunk.Space',
                 ships: 'Sequence[Structure]') -> bool:
 
-        if time.time() > self.started_at + self.__time_limit:
+        if self._currentTime() > self.started_at + self.__time_limit:
             return False
 
         return super()._verify(space, ships)
@@ -39,7 +38,7 @@ class TimedObjectiveGroup(ObjectiveGroup):
     def _hasFailed(self, space: 'pymunk.Space',
                    ships: 'Sequence[Structure]') -> bool:
 
-        if time.time() > self.started_at + self.__time_limit:
+        if self._currentTime() > self.started_at + self.__time_limit:
             return True
 
         return super()._hasFailed(space, ships)
@@ -0,0 +1,334 @@
+"""Functions used to run many scenarios in parallel.
+
+This module contains the code used to run a list of scenarios, each one in a
+headless simulation, distributing them across a pool of worker processes and
+aggregating their results.
+"""
+
+import os
+import sys
+import json
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import TYPE_CHECKING
+
+import numpy
+import yaml
+
+from PyQt5.QtWidgets import QApplication
+
+from .simulation import DEFAULT_MAX_TIME, Simulation
+
+from ..storage.fileinfo import FileInfo
+from ..storage.scenariobundle import BUNDLE_SUFFIX
+
+if TYPE_CHECKING:
+    # pylint: disable=ungrouped-imports
+    from typing import (
+        Any, Callable, Dict, Iterable, List, Optional, Sequence, TextIO, Tuple
+    )
+    # pylint: enable=ungrouped-imports
+
+BatchRun = namedtuple('BatchRun', (
+    'scenario', 'controller', 'repetition', 'variables'), defaults=(None,))
+
+BatchOptions = namedtuple('BatchOptions', (
+    'time_limit', 'lockstep', 'tick_budget', 'seed', 'max_time'),
+                          defaults=(None, DEFAULT_MAX_TIME))
+
+def createBatchRuns(scenarios: 'Sequence[str]',
+                    controllers: 'Sequence[Optional[str]]' = (None,),
+                    repetitions: int = 1) -> 'List[BatchRun]':
+    """Create the runs of every combination of scenario and controller.
+
+    Args:
+        scenarios: Names of the scenarios.
+        controllers: Controllers used for every ship of the scenario, None
+            means the controllers specified in the scenario file.
+        repetitions: Number of times each combination is run.
+
+    Returns:
+        The list of runs.
+    """
+
+    if not controllers:
+        controllers = (None,)
+
+    return [BatchRun(scenario, controller, repetition)
+            for scenario in scenarios
+            for controller in controllers
+            for repetition in range(repetitions)]
+
+_APPLICATION: 'Optional[QApplication]' = None
+
+def _initWorker() -> None:
+
+    # Interface devices create widgets, so each worker needs an application
+    # object, nothing is ever shown
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+    global _APPLICATION # pylint: disable=global-statement
+    _APPLICATION = QApplication([])
+
+def runBatchItem(run: 'BatchRun',
+                 options: 'BatchOptions') -> 'Dict[str, Any]':
+    """Run a scenario in a headless simulation.
+
+    Args:
+        run: Information about the run.
+        options: Options used to create the simulation.
+
+    Returns:
+        The statistics of the run, if the scenario could not be loaded the
+        dict contains an 'error' entry and 'success' is None, if the
+        simulation raised an exception it contains an 'error' entry and
+        'success' is False.
+    """
+
+    if options.seed is None:
+        seed = None
+    else:
+        # Runs with the same repetition number share the seed, so different
+        # scenarios, controllers and variables are compared with the same noise
+        seed = int(numpy.random.SeedSequence(
+            (options.seed, run.repetition)).generate_state(1)[0])
+
+    simulation = Simulation(time_limit=options.time_limit,
+                            lockstep=options.lockstep,
+                            tick_budget=options.tick_budget,
+                            seed=seed)
+
+    record: 'Dict[str, Any]' = {
+        'scenario': run.scenario,
+        'controller': run.controller,
+        'repetition': run.repetition
+    }
+
+    if run.variables is not None:
+        record['variables'] = run.variables
+
+    try:
+        if run.scenario.endswith(BUNDLE_SUFFIX):
+            # The variables of a bundle were substituted when it was created
+            simulation.loadBundle(run.scenario, controller=run.controller)
+        else:
+            simulation.loadScenario(run.scenario, controller=run.controller,
+                                    variables=run.variables)
+    except Exception as err: # pylint: disable=broad-except
+        record['success'] = None
+        record['error'] = f'{type(err).__name__}: {err}'
+        return record
+
+    try:
+        simulation.run(max_time=options.max_time)
+    except Exception as err: # pylint: disable=broad-except
+        # The run counts as failed, the rest of the batch goes on
+        record['error'] = f'{type(err).__name__}: {err}'
+    finally:
+        statistics = simulation.statistics()
+        simulation.clear()
+
+    del statistics['scenario']
+    record.update(statistics)
+
+    if 'error' in record:
+        record['success'] = False
+
+    return record
+
+def _failedRecord(run: 'BatchRun', err: Exception) -> 'Dict[str, Any]':
+
+    record: 'Dict[str, Any]' = {
+        'scenario': run.scenario,
+        'controller': run.controller,
+        'repetition': run.repetition,
+        'success': False,
+        'error': f'{type(err).__name__}: {err}'
+    }
+
+    if run.variables is not None:
+        record['variables'] = run.variables
+
+    return record
+
+def runBatch(runs: 'Iterable[BatchRun]', options: 'BatchOptions',
+             jobs: int = None,
+             callback: 'Callable[[Dict[str, Any]], None]' = None) \
+                 -> 'List[Dict[str, Any]]':
+    """Run scenarios in parallel using a pool of processes.
+
+    Args:
+        runs: Runs that will be performed.
+        options: Options used to create each simulation.
+        jobs: Number of worker processes, the number of processors is used if
+            not specified.
+        callback: Called with the result of each run as soon as it finishs.
+
+    Returns:
+        The results of all runs, in the order they finished.
+    """
+
+    # Make sure the storage directories exist before the workers start
+    FileInfo()
+
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs,
+                             initializer=_initWorker) as executor:
+
+        futures = {executor.submit(runBatchItem, run, options): run
+                   for run in runs}
+
+        for future in as_completed(futures):
+            # A worker that dies only loses its own run
+            try:
+                result = future.result()
+            except Exception as err: # pylint: disable=broad-except
+                result = _failedRecord(futures[future], err)
+            results.append(result)
+            if callback is not None:
+                callback(result)
+
+    return results
+
+def _percentiles(values: 'Sequence[float]') -> 'Optional[Dict[str, float]]':
+
+    if not values:
+        return None
+
+    min_val, p50, p90, p99, max_val = numpy.percentile(
+        values, (0, 50, 90, 99, 100))
+
+    return {
+        'min': float(min_val),
+        'p50': float(p50),
+        'p90': float(p90),
+        'p99': float(p99),
+        'max': float(max_val),
+        'mean': float(numpy.mean(values))
+    }
+
+def _objectiveRecords(objectives: 'Sequence[Dict[str, Any]]',
+                      prefix: str = '') \
+                           -> 'Iterable[Tuple[str, Dict[str, Any]]]':
+
+    for objective in objectives:
+        name = f'{prefix}{objective["name"]}'
+        yield name, objective
+        yield from _objectiveRecords(objective.get('children', ()),
+                                     prefix=f'{name}/')
+
+def _aggregateObjectives(results: 'Sequence[Dict[str, Any]]') \
+        -> 'Dict[str, Dict[str, Any]]':
+
+    objectives: 'Dict[str, Dict[str, Any]]' = {}
+    for result in results:
+        for name, objective in _objectiveRecords(
+                result.get('objectives', ())):
+
+            info = objectives.get(name)
+            if info is None:
+                info = objectives[name] = {
+                    'accomplished': 0, 'failed': 0, 'times': []}
+
+            # Objectives left unfinished when the run ended, by the time
+            # limit or by a failed objective, count as failed too
+            if objective['accomplished']:
+                info['accomplished'] += 1
+                if objective['time'] is not None:
+                    info['times'].append(objective['time'])
+            else:
+                info['failed'] += 1
+
+    return {
+        name: {
+            'accomplished-rate': info['accomplished']/len(results),
+            'failed-rate': info['failed']/len(results),
+            'time': _percentiles(info['times'])
+        } for name, info in objectives.items()
+    }
+
+def aggregateResults(results: 'Sequence[Dict[str, Any]]') \
+        -> 'List[Dict[str, Any]]':
+    """Summarize the results of the runs.
+
+    The results are grouped by scenario, controller and variables, for each
+    group the success rate, the percentiles of the time to complete the
+    scenario and the results of each objective are calculated.
+
+    Args:
+        results: Results returned by `runBatchItem`.
+
+    Returns:
+        A list with the summary of each group.
+    """
+
+    groups: 'Dict[Tuple[str, Optional[str], str], List[Dict[str, Any]]]' = {}
+    for result in results:
+        variables_key = json.dumps(result.get('variables'), sort_keys=True)
+        groups.setdefault((result['scenario'], result['controller'],
+                           variables_key), []).append(result)
+
+    summary = []
+    for (scenario, controller, _), group_results in groups.items():
+
+        # Runs that raised an exception after loading count as failed runs
+        loaded = [result for result in group_results
+                  if result['success'] is not None or 'error' not in result]
+        successes = [result for result in loaded if result['success']]
+
+        summary.append({
+            'scenario': scenario,
+            'controller': controller,
+            'runs': len(group_results),
+            'errors': sum(1 for result in group_results if 'error' in result),
+            'success-rate': len(successes)/len(loaded) if loaded else None,
+            'time-to-complete': _percentiles(
+                [result['time'] for result in successes]),
+            'objectives': _aggregateObjectives(loaded)
+        })
+
+        variables = group_results[0].get('variables')
+        if variables is not None:
+            summary[-1]['variables'] = variables
+
+    return summary
+
+class BatchResultsWriter:
+    """Write the results of the runs to a yaml file as they finish.
+
+    The file contains a 'runs' list, to which each result is appended as soon
+    as it is received, and a 'summary' that is written by `close`. The file is
+    valid yaml at any moment, so it can be read while the batch is running.
+
+    Args:
+        file: File where the results will be written.
+    """
+
+    def __init__(self, file: 'TextIO') -> None:
+
+        self.__file = file
+        self.__results: 'List[Dict[str, Any]]' = []
+
+        self.__file.write('runs:\n')
+        self.__file.flush()
+
+    @property
+    def results(self) -> 'Sequence[Dict[str, Any]]':
+        return self.__results
+
+    def __call__(self, result: 'Dict[str, Any]') -> None:
+
+        self.__results.append(result)
+
+        yaml.dump([result], self.__file)
+        self.__file.flush()
+
+        status = 'error' if 'error' in result else result['success']
+        print(f'[{len(self.__results)}] {result["scenario"]} '
+              f'({result["controller"]}) #{result["repetition"]}: {status}',
+              file=sys.stderr)
+
+    def close(self) -> None:
+
+        yaml.dump({'summary': aggregateResults(self.__results)}, self.__file)
+        self.__file.flush()
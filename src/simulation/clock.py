@@ -0,0 +1,71 @@
+"""Class used to keep track of the simulated time.
+
+This module contains the clock that is advanced by the simulation, devices,
+objectives and graphical items use it instead of the wall time, so a scenario
+produces the same results whether it runs in real time or faster.
+"""
+
+class SimulationClock:
+    """Clock that measures the time inside the simulation.
+
+    The clock only moves when `advance` is called, each call corresponds to
+    one step of the simulation. An instance can also be called, like
+    `time.time`, to get the current simulated time.
+
+    Args:
+        step_time: Amount of simulated seconds that passes in each tick.
+    """
+
+    def __init__(self, step_time: float = 0.02) -> None:
+
+        self.__step_time = step_time
+        self.__tick = 0
+
+        # The time is computed from the ticks since the step time last
+        # changed instead of being accumulated, so it has no rounding error
+        # that grows with each tick
+        self.__base_tick = 0
+        self.__base_time: float = 0
+
+    def __rebase(self) -> None:
+        self.__base_time = self.time
+        self.__base_tick = self.__tick
+
+    @property
+    def tick(self) -> int:
+        return self.__tick
+
+    @property
+    def step_time(self) -> float:
+        return self.__step_time
+
+    @step_time.setter
+    def step_time(self, step_time: float) -> None:
+        if step_time != self.__step_time:
+            self.__rebase()
+            self.__step_time = step_time
+
+    @property
+    def time(self) -> float:
+        return self.__base_time + \
+            (self.__tick - self.__base_tick)*self.__step_time
+
+    def advance(self, step_time: float = None) -> None:
+
+        if step_time is None or step_time == self.__step_time:
+            self.__tick += 1
+            return
+
+        # A tick of a different duration
+        self.__rebase()
+        self.__tick += 1
+        self.__base_tick = self.__tick
+        self.__base_time += step_time
+
+    def reset(self) -> None:
+        self.__tick = 0
+        self.__base_tick = 0
+        self.__base_time = 0
+
+    def __call__(self) -> float:
+        return self.time
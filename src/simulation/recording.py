@@ -0,0 +1,264 @@
+"""Classes used to record the trajectories of a simulation and replay them.
+
+A recording is a directory with a 'metadata.json' file, that describes the
+scenario and the recorded bodies, and one raw file of float64 values for each
+channel. The 'time' channel has one value per tick and every other channel has
+one row per tick with one column per body, so any tick can be read directly
+from a memory-mapped file without reading the ones before it.
+"""
+
+import json
+from pathlib import Path
+from collections import namedtuple
+from typing import TYPE_CHECKING
+
+import numpy
+
+if TYPE_CHECKING:
+    # pylint: disable=ungrouped-imports
+    from typing import Any, BinaryIO, Dict, List, Sequence, Tuple, Union
+    import pymunk
+    # pylint: enable=ungrouped-imports
+
+RECORDING_VERSION = 1
+
+RECORDING_CHANNELS = ('x', 'y', 'angle', 'velocity-x', 'velocity-y',
+                      'angular-velocity')
+
+RecordedBody = namedtuple('RecordedBody', (
+    'kind', 'name', 'model', 'variables'))
+
+def _channelPath(path: 'Path', channel: str) -> 'Path':
+    return path/f'{channel}.f64'
+
+class TrajectoryRecorder:
+    """Record the state of bodies once per tick.
+
+    The values are written to a preallocated buffer of `chunk_ticks` rows per
+    channel, when it is full the whole chunk is appended to the channel files,
+    so the cost of recording a tick is a few assignments.
+
+    Args:
+        path: Directory where the recording is written, it is created if it
+            does not exist.
+        scenario: Name of the scenario that is recorded.
+        step_time: Amount of simulated seconds of each tick.
+        bodies: Information about each body and the body itself.
+        chunk_ticks: Number of ticks buffered before writing them.
+    """
+
+    def __init__(self, path: 'Union[str, Path]', scenario: str,
+                 step_time: float,
+                 bodies: 'Sequence[Tuple[RecordedBody, pymunk.Body]]',
+                 chunk_ticks: int = 1024) -> None:
+
+        self.__path = Path(path)
+        self.__path.mkdir(parents=True, exist_ok=True)
+
+        self.__scenario = scenario
+        self.__step_time = step_time
+        self.__bodies_info = [info for info, _ in bodies]
+        self.__bodies = [body for _, body in bodies]
+
+        self.__time_buffer = numpy.empty(chunk_ticks)
+        # The rows of a tick are filled at once, the channels are separated
+        # when the chunk is written
+        self.__buffer = numpy.empty(
+            (chunk_ticks, len(self.__bodies), len(RECORDING_CHANNELS)))
+        self.__buffered = 0
+        self.__ticks = 0
+
+        self.__time_file = open(_channelPath(self.__path, 'time'), 'wb')
+        self.__files: 'List[BinaryIO]' = [
+            open(_channelPath(self.__path, channel), 'wb')
+            for channel in RECORDING_CHANNELS]
+
+        self.__writeMetadata()
+
+    @property
+    def path(self) -> 'Path':
+        return self.__path
+
+    @property
+    def ticks(self) -> int:
+        return self.__ticks + self.__buffered
+
+    def __writeMetadata(self) -> None:
+
+        metadata = {
+            'version': RECORDING_VERSION,
+            'scenario': self.__scenario,
+            'step-time': self.__step_time,
+            'ticks': self.__ticks,
+            'channels': list(RECORDING_CHANNELS),
+            'bodies': [info._asdict() for info in self.__bodies_info]
+        }
+
+        with open(self.__path/'metadata.json', 'w') as file:
+            json.dump(metadata, file, indent=1)
+
+    def record(self, timestamp: float) -> None:
+        """Record the current state of the bodies.
+
+        Args:
+            timestamp: Simulated time of the tick.
+        """
+
+        row = self.__buffered
+        self.__time_buffer[row] = timestamp
+
+        if self.__bodies:
+            self.__buffer[row] = [
+                (*body.position, body.angle, *body.velocity,
+                 body.angular_velocity) for body in self.__bodies]
+
+        self.__buffered += 1
+        if self.__buffered == len(self.__time_buffer):
+            self.flush()
+
+    def flush(self) -> None:
+
+        if self.__buffered == 0:
+            return
+
+        count = self.__buffered
+        self.__time_buffer[:count].tofile(self.__time_file)
+        self.__time_file.flush()
+
+        for channel, file in enumerate(self.__files):
+            numpy.ascontiguousarray(
+                self.__buffer[:count, :, channel]).tofile(file)
+            file.flush()
+
+        self.__ticks += count
+        self.__buffered = 0
+
+        self.__writeMetadata()
+
+    def close(self) -> None:
+
+        self.flush()
+
+        self.__time_file.close()
+        for file in self.__files:
+            file.close()
+
+class TrajectoryRecording:
+    """Recording opened for replay.
+
+    The channels are memory-mapped, so opening a recording and reading any
+    tick takes the same time regardless of its length.
+
+    Args:
+        path: Directory of the recording.
+    """
+
+    def __init__(self, path: 'Union[str, Path]') -> None:
+
+        self.__path = Path(path)
+
+        with open(self.__path/'metadata.json') as file:
+            metadata: 'Dict[str, Any]' = json.load(file)
+
+        version = metadata.get('version')
+        if version != RECORDING_VERSION:
+            raise ValueError(f'Unsupported recording version \'{version}\'')
+
+        self.__scenario: str = metadata['scenario']
+        self.__step_time: float = metadata['step-time']
+        self.__bodies = tuple(RecordedBody(**info)
+                              for info in metadata['bodies'])
+
+        # The files are trusted over the metadata, a recording that was not
+        # closed has more ticks than the ones written in the metadata, and a
+        # chunk may have been written to only some of the files
+        time_path = _channelPath(self.__path, 'time')
+        self.__ticks = time_path.stat().st_size//8
+        if self.__bodies:
+            row_size = 8*len(self.__bodies)
+            for channel in metadata['channels']:
+                channel_size = _channelPath(self.__path,
+                                            channel).stat().st_size
+                self.__ticks = min(self.__ticks, channel_size//row_size)
+
+        self.__time = self.__openChannel(time_path, (self.__ticks,))
+        self.__channels = {
+            channel: self.__openChannel(_channelPath(self.__path, channel),
+                                        (self.__ticks, len(self.__bodies)))
+            for channel in metadata['channels']
+        }
+
+    @staticmethod
+    def __openChannel(path: 'Path', shape: 'Tuple[int, ...]') \
+            -> 'numpy.ndarray':
+
+        if shape[0] == 0:
+            return numpy.empty(shape)
+
+        return numpy.memmap(path, dtype=numpy.float64, mode='r', shape=shape)
+
+    @property
+    def path(self) -> 'Path':
+        return self.__path
+
+    @property
+    def scenario(self) -> str:
+        return self.__scenario
+
+    @property
+    def step_time(self) -> float:
+        return self.__step_time
+
+    @property
+    def bodies(self) -> 'Tuple[RecordedBody, ...]':
+        return self.__bodies
+
+    @property
+    def ticks(self) -> int:
+        return self.__ticks
+
+    @property
+    def duration(self) -> float:
+        return float(self.__time[-1]) if self.__ticks else 0
+
+    def channel(self, name: str) -> 'numpy.ndarray':
+        """Get the values of a channel.
+
+        Args:
+            name: Name of the channel, see `RECORDING_CHANNELS`.
+
+        Returns:
+            An array with one row per tick and one column per body.
+        """
+        return self.__channels[name]
+
+    def time(self, tick: int) -> float:
+        return float(self.__time[tick])
+
+    def tickAt(self, timestamp: float) -> int:
+        """Find the last tick recorded before a time.
+
+        Args:
+            timestamp: Simulated time.
+
+        Returns:
+            The index of the tick, 0 if the time is before the first tick.
+        """
+
+        tick = int(numpy.searchsorted(self.__time, timestamp, side='right'))
+
+        return min(max(tick - 1, 0), max(self.__ticks - 1, 0))
+
+    def poses(self, tick: int) -> 'numpy.ndarray':
+        """Get the position and angle of every body in a tick.
+
+        Args:
+            tick: Index of the tick.
+
+        Returns:
+            An array with a row with the x, y and angle of each body.
+        """
+
+        return numpy.stack((self.__channels['x'][tick],
+                            self.__channels['y'][tick],
+                            self.__channels['angle'][tick]), axis=1)
@@ -0,0 +1,284 @@
+"""Class used to share the sensors and actuators of a ship through memory.
+
+A register file is a file mapped to memory by the simulation and by the
+controller of a ship, the simulation writes the reading of every sensor after
+each tick and reads the values of the actuators written by the controller
+before each tick, so a controller can read and control the ship without
+sending any message.
+
+The file starts with a header of `HEADER_SIZE` bytes:
+
+    offset  0   4 bytes     magic, b'SSCR'
+    offset  4   uint32      version
+    offset  8   int64       sequence of the sensors
+    offset 16   int64       tick of the readings
+    offset 24   float64     time of the readings
+    offset 32   int64       sequence of the actuators
+    offset 40   int64       mapped, set to 1 by the controller
+
+It is followed by a float64 for each sensor, a float64 for each property of
+an actuator that can be set and an int64 for each of those properties, which
+the controller increments each time it writes the property. The offsets of
+each one are given by the layout, which the controller gets with the command
+`get-info register-layout` of the ship, it is a json object with the path of
+the file, its size, the offsets of the header ('header'), of the sensors by
+the path of the sensor ('sensors'), of the properties by the path of the
+actuator followed by the name of the property ('actuators'), for example
+'1:0:intensity', and of their counters by the same key ('actuator-writes').
+
+Each side protects the block it writes with a sequence lock, the writer makes
+the sequence odd before writing and even again after, a reader retries if the
+sequence was odd or changed while it was reading.
+
+The sensors are only read, which draws their noise, while a controller has
+set 'mapped', so a simulation with register files that no controller uses
+gives the same results as one without them. Until then the readings are NaN.
+"""
+
+import os
+import json
+import mmap
+import struct
+import tempfile
+from typing import TYPE_CHECKING
+
+import numpy
+
+from ..devices.device import DeviceGroup
+from ..devices.structure import Actuator, Sensor
+
+if TYPE_CHECKING:
+    # pylint: disable=ungrouped-imports
+    from typing import Any, Dict, List, Optional, Tuple
+    from ..devices.device import Device
+    from ..devices.structure import Structure
+    # pylint: enable=ungrouped-imports
+
+REGISTER_FILE_MAGIC = b'SSCR'
+REGISTER_FILE_VERSION = 2
+
+HEADER_SIZE = 64
+
+SENSORS_SEQUENCE_OFFSET = 8
+TICK_OFFSET = 16
+TIME_OFFSET = 24
+ACTUATORS_SEQUENCE_OFFSET = 32
+MAPPED_OFFSET = 40
+
+# Attempts made to read the actuators while the controller is writing them,
+# if all of them fail the values are read in the next tick
+SETPOINTS_READ_ATTEMPTS = 4
+
+_INT64 = struct.Struct('<q')
+
+def _defaultDirectory() -> 'Optional[str]':
+    # Files in /dev/shm are never written to a disk
+    return '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+class ShipRegisterFile:
+    """Register file with the sensors and actuators of a ship.
+
+    The layout is set as the info 'register-layout' of the ship when the file
+    is created and removed when it is closed.
+
+    Args:
+        ship: The ship.
+        directory: Directory where the file is created, by default '/dev/shm'
+            if it exists or the temporary directory otherwise.
+    """
+
+    def __init__(self, ship: 'Structure', directory: str = None) -> None:
+
+        self.__ship = ship
+
+        self.__sensors: 'List[Tuple[str, Sensor]]' = []
+        self.__actuators: 'List[Tuple[str, Actuator, str]]' = []
+        self.__addDevice(ship, '')
+
+        sensors_offset = HEADER_SIZE
+        actuators_offset = sensors_offset + 8*len(self.__sensors)
+        writes_offset = actuators_offset + 8*len(self.__actuators)
+        self.__size = writes_offset + 8*len(self.__actuators)
+
+        fd, self.__path = tempfile.mkstemp(
+            prefix='spaceshipcontrol-', suffix='.registers',
+            dir=_defaultDirectory() if directory is None else directory)
+        try:
+            os.ftruncate(fd, self.__size)
+            self.__memory = mmap.mmap(fd, self.__size)
+        finally:
+            os.close(fd)
+
+        self.__memory[:4] = REGISTER_FILE_MAGIC
+        struct.pack_into('<I', self.__memory, 4, REGISTER_FILE_VERSION)
+
+        # The readings are written at once through an array that uses the
+        # memory of the file
+        self.__sensor_values = numpy.ndarray(
+            (len(self.__sensors),), dtype='<f8', buffer=self.__memory,
+            offset=sensors_offset)
+        self.__setpoints = numpy.ndarray(
+            (len(self.__actuators),), dtype='<f8', buffer=self.__memory,
+            offset=actuators_offset)
+        self.__writes = numpy.ndarray(
+            (len(self.__actuators),), dtype='<i8', buffer=self.__memory,
+            offset=writes_offset)
+
+        # Counters of the writes of the controller already applied, a
+        # property is set again when its counter changes even if the value
+        # is the same, since it could have been set with a message meanwhile
+        self.__last_writes: 'List[int]' = []
+
+        self.__layout = {
+            'path': self.__path,
+            'size': self.__size,
+            'version': REGISTER_FILE_VERSION,
+            'header': {
+                'sensors-sequence': SENSORS_SEQUENCE_OFFSET,
+                'tick': TICK_OFFSET,
+                'time': TIME_OFFSET,
+                'actuators-sequence': ACTUATORS_SEQUENCE_OFFSET,
+                'mapped': MAPPED_OFFSET
+            },
+            'sensors': {path: sensors_offset + 8*i
+                        for i, (path, _) in enumerate(self.__sensors)},
+            'actuators': {f'{path}{name}': actuators_offset + 8*i
+                          for i, (path, _, name) in
+                          enumerate(self.__actuators)},
+            'actuator-writes': {f'{path}{name}': writes_offset + 8*i
+                                for i, (path, _, name) in
+                                enumerate(self.__actuators)}
+        }
+
+        self.__setpoints[:] = [float(actuator.getProperty(name))
+                               for _, actuator, name in self.__actuators]
+        self.__last_writes = self.__writes.tolist()
+
+        self.__sensor_values[:] = float('NaN')
+
+        ship.setInfo('register-layout', json.dumps(self.__layout))
+
+    def __addDevice(self, device: 'Device', path: str) -> None:
+
+        if isinstance(device, Sensor):
+            self.__sensors.append((path, device))
+            return
+
+        if isinstance(device, Actuator):
+            for name, prop in device.properties:
+                if prop.fset is not None:
+                    self.__actuators.append((path, device, name))
+
+        if isinstance(device, DeviceGroup):
+            for i in range(device.deviceCount()):
+                subdevice = device.accessDevice(i)
+                if subdevice is not None:
+                    self.__addDevice(subdevice, f'{path}{i}:')
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    @property
+    def layout(self) -> 'Dict[str, Any]':
+        return self.__layout
+
+    def __sequence(self, offset: int) -> int:
+        return _INT64.unpack_from(self.__memory, offset)[0]
+
+    @property
+    def mapped(self) -> bool:
+        """If a controller is using the file."""
+        return _INT64.unpack_from(self.__memory, MAPPED_OFFSET)[0] != 0
+
+    def write(self, tick: int, timestamp: float) -> None:
+        """Write the reading of every sensor.
+
+        Nothing is written while no controller uses the file.
+
+        Args:
+            tick: Tick of the simulation.
+            timestamp: Simulated time of the tick.
+        """
+
+        if not self.mapped:
+            return
+
+        values = [sensor.reading() for _, sensor in self.__sensors]
+
+        sequence = self.__sequence(SENSORS_SEQUENCE_OFFSET) + 1
+        _INT64.pack_into(self.__memory, SENSORS_SEQUENCE_OFFSET, sequence)
+
+        self.__sensor_values[:] = values
+        struct.pack_into('<qd', self.__memory, TICK_OFFSET, tick, timestamp)
+
+        _INT64.pack_into(self.__memory, SENSORS_SEQUENCE_OFFSET, sequence + 1)
+
+    def __readSetpoints(self) -> 'Optional[Tuple[List[float], List[int]]]':
+
+        for _ in range(SETPOINTS_READ_ATTEMPTS):
+            sequence = self.__sequence(ACTUATORS_SEQUENCE_OFFSET)
+            if sequence & 1:
+                continue
+
+            setpoints = self.__setpoints.tolist()
+            writes = self.__writes.tolist()
+            if self.__sequence(ACTUATORS_SEQUENCE_OFFSET) == sequence:
+                return setpoints, writes
+
+        return None
+
+    def applySetpoints(self) -> None:
+        """Set the properties of the actuators written by the controller.
+
+        Only the properties written since the last time are set, so the
+        properties set with messages are not overwritten.
+        """
+
+        if not self.mapped:
+            return
+
+        read = self.__readSetpoints()
+        if read is None:
+            return
+
+        setpoints, writes = read
+        for (_, actuator, name), value, count, last_count in zip(
+                self.__actuators, setpoints, writes, self.__last_writes):
+            if count != last_count:
+                actuator.setProperty(name, value)
+
+        self.__last_writes = writes
+
+    def getState(self) -> bytes:
+        """Get a copy of the registers.
+
+        Returns:
+            A value that can be given to `setState` to bring the registers back
+            to this moment.
+        """
+        return bytes(self.__memory)
+
+    def setState(self, state: bytes) -> None:
+        """Restore a state returned by `getState`.
+
+        It must be called while the controller is not running.
+        """
+
+        self.__memory[:] = state
+        self.__last_writes = self.__writes.tolist()
+
+    def close(self) -> None:
+
+        self.__ship.setInfo('register-layout', None)
+
+        # The arrays use the memory of the file, they must be released first
+        del self.__sensor_values
+        del self.__setpoints
+        del self.__writes
+        self.__memory.close()
+
+        try:
+            os.unlink(self.__path)
+        except FileNotFoundError:
+            pass
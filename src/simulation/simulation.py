@@ -0,0 +1,857 @@
+"""Class used to run a scenario.
+
+This module contains the class that owns the physics space, the ships, the
+objects and the objectives of a scenario and advances all of them one step at
+a time, it does not depend on the main window so it can also be used to run a
+scenario without any graphical interface.
+"""
+
+import sys
+import json
+import math
+from collections import namedtuple
+from queue import Empty as EmptyQueueException
+from typing import TYPE_CHECKING
+
+try:
+    from queue import SimpleQueue
+except ImportError:
+    from queue import Queue as SimpleQueue # type: ignore
+
+import numpy
+import pymunk
+
+from .clock import SimulationClock
+from .tickbarrier import TickBarrier
+from .recording import RecordedBody, TrajectoryRecorder
+from .registerfile import ShipRegisterFile
+
+from ..storage.fileinfo import FileInfo
+from ..storage.scenariobundle import ScenarioBundle
+
+from ..objectives.objective import createObjectiveTree
+
+from ..utils.controllerprotocol import PROTOCOL_VERSION
+from ..utils.errorgenerator import createRandomGenerator
+from ..utils.rwlock import PartLock, ReadWriteLock
+
+if TYPE_CHECKING:
+    # pylint: disable=ungrouped-imports
+    from typing import (
+        Any, ContextManager, Dict, Iterator, List, Optional, Tuple, Union
+    )
+    from pathlib import Path
+    import anytree
+    from ..objectives.objective import Objective
+    from ..devices.structure import Structure
+    from ..devices.communicationdevices import CommunicationEngine
+    from ..storage.loaders.controllerloader import ControllerProcess
+    from ..storage.loaders.scenarioloader import (
+        ScenarioInfo, ShipInfo, ObjectInfo
+    )
+    # pylint: enable=ungrouped-imports
+
+# Simulated seconds after which `run` stops a scenario whose objectives never
+# have a result
+DEFAULT_MAX_TIME = 3600
+
+ControllerLaunch = namedtuple('ControllerLaunch', (
+    'ship', 'controller', 'arguments'))
+
+SimulationState = namedtuple('SimulationState', (
+    'bodies', 'devices', 'communication_engine', 'register_files'))
+
+class Simulation:
+    """Class that represents a running scenario.
+
+    A Simulation object keeps everything that is needed to advance a scenario,
+    each call to `step` advances the physics engine, makes the devices act,
+    propagates the communication signals and verifies the objectives. All the
+    times, including the time limit, are measured with a `SimulationClock`,
+    so they do not depend on how fast the steps are performed.
+
+    In lockstep mode each step waits for every controller to signal that it has
+    finished the commands of the previous tick, see `TickBarrier`.
+
+    Every source of noise of the scenario draws from its own random generator,
+    all of them are derived from a single seed, so a scenario loaded with the
+    same seed produces the same noise. When no seed is given a new one is
+    chosen for each scenario, it is included in the statistics.
+
+    The state of the scenario is saved after it is loaded, `restart` restores
+    it and restarts the controllers, which is much faster than loading the
+    scenario again, a restarted scenario uses the same noise as before.
+
+    With `register_files` each ship gets a `ShipRegisterFile`, the readings of
+    its sensors are written to it after each step once a controller maps it
+    and the values of its actuators written by the controller are applied
+    before each step.
+
+    Args:
+        time_limit: If specified, the objectives will fail after this amount of
+            seconds.
+        lockstep: If True, each step waits for the controllers.
+        tick_budget: Maximum amount of time in seconds a step waits for a
+            controller in lockstep mode.
+        seed: Seed of the random generators.
+        register_files: If True, the ships share their sensors and actuators
+            with the controllers through a register file.
+    """
+
+    def __init__(self, time_limit: float = None,
+                 lockstep: bool = False,
+                 tick_budget: float = 1,
+                 seed: int = None,
+                 register_files: bool = False) -> None:
+
+        # The step and every change of the whole simulation hold the write
+        # side, the commands of each ship hold the lock of the ship, which
+        # only holds the read side, see `PartLock`
+        self.__rwlock = ReadWriteLock()
+        self.__lock = self.__rwlock.writer
+        self.__ship_locks: 'Dict[Structure, PartLock]' = {}
+
+        self.__space = pymunk.Space()
+        self.__space.gravity = (0, 0)
+
+        self.__step_time = 0.02
+        self.__substeps = 1
+        self.__adaptive = False
+
+        self.__active_contacts = 0
+        collision_handler = self.__space.add_default_collision_handler()
+        collision_handler.begin = self.__contactBegin
+        collision_handler.separate = self.__contactSeparate
+        self.__time_limit = time_limit
+        self.__clock = SimulationClock(self.__step_time)
+
+        if lockstep:
+            self.__tick_barrier: 'Optional[TickBarrier]' = TickBarrier(
+                tick_budget=tick_budget)
+        else:
+            self.__tick_barrier = None
+
+        self.__ships: 'List[Structure]' = []
+        self.__objects: 'List[pymunk.Body]' = []
+        self.__objectives: 'List[Objective]' = []
+        self.__objectives_result: 'Optional[bool]' = None
+        self.__finished_at: 'Optional[float]' = None
+        self.__timed_out = False
+        self.__comm_engine: 'Optional[CommunicationEngine]' = None
+        self.__scenario: 'Optional[str]' = None
+
+        self.__seed = seed
+        self.__seed_sequence = numpy.random.SeedSequence(seed)
+
+        self.__models: 'Dict[pymunk.Body, Tuple[Optional[str], Any]]' = {}
+        self.__recorder: 'Optional[TrajectoryRecorder]' = None
+
+        self.__use_register_files = register_files
+        self.__register_files: 'Dict[Structure, ShipRegisterFile]' = {}
+
+        self.__controllers: 'List[ControllerLaunch]' = []
+        self.__running_controllers: 'List[ControllerProcess]' = []
+        self.__initial_state: 'Optional[SimulationState]' = None
+
+        self.__debug_msg_queues: 'Dict[str, SimpleQueue]' = {}
+
+    @property
+    def lock(self) -> 'ContextManager':
+        """Exclusive lock of the whole simulation."""
+        return self.__lock
+
+    @property
+    def read_lock(self) -> 'ContextManager':
+        """Lock held to read the simulation without changing it.
+
+        It can be held by many threads at the same time, it is enough to read
+        the state of the bodies, which only changes while `lock` is held.
+        """
+        return self.__rwlock.reader
+
+    def shipLock(self, ship: 'Structure') -> 'PartLock':
+        """Get the lock held to handle the commands of a ship.
+
+        The locks of different ships can be held at the same time, the step
+        waits for all of them to be released.
+
+        Args:
+            ship: A ship added with `addShip`.
+
+        Returns:
+            The lock of the ship.
+        """
+        return self.__ship_locks[ship]
+
+    @property
+    def space(self) -> 'pymunk.Space':
+        return self.__space
+
+    @property
+    def ships(self) -> 'Tuple[Structure, ...]':
+        return tuple(self.__ships)
+
+    @property
+    def objects(self) -> 'Tuple[pymunk.Body, ...]':
+        return tuple(self.__objects)
+
+    @property
+    def objectives(self) -> 'Tuple[Objective, ...]':
+        return tuple(self.__objectives)
+
+    @property
+    def objectives_result(self) -> 'Optional[bool]':
+        return self.__objectives_result
+
+    @property
+    def communication_engine(self) -> 'Optional[CommunicationEngine]':
+        return self.__comm_engine
+
+    @property
+    def scenario(self) -> 'Optional[str]':
+        return self.__scenario
+
+    @property
+    def time_limit(self) -> 'Optional[float]':
+        return self.__time_limit
+
+    @property
+    def clock(self) -> 'SimulationClock':
+        return self.__clock
+
+    @property
+    def tick_barrier(self) -> 'Optional[TickBarrier]':
+        return self.__tick_barrier
+
+    @property
+    def active_contacts(self) -> int:
+        return self.__active_contacts
+
+    @property
+    def seed(self) -> int:
+        return self.__seed_sequence.entropy
+
+    def spawnSeed(self) -> 'numpy.random.SeedSequence':
+        """Create the seed of a new random generator.
+
+        The seeds are derived from the seed of the simulation in the order they
+        are requested, so the elements of a scenario must always request them
+        in the same order.
+
+        Returns:
+            A seed sequence independent from the ones created before.
+        """
+        return self.__seed_sequence.spawn(1)[0]
+
+    def __contactBegin(self, _arbiter: 'pymunk.Arbiter',
+                       _space: 'pymunk.Space', _data: 'Any') -> bool:
+        self.__active_contacts += 1
+        return True
+
+    def __contactSeparate(self, _arbiter: 'pymunk.Arbiter',
+                          _space: 'pymunk.Space', _data: 'Any') -> None:
+        self.__active_contacts = max(self.__active_contacts - 1, 0)
+
+    def clear(self) -> None:
+
+        self.stopRecording()
+        self.__stopControllers()
+        self.__controllers.clear()
+        self.__initial_state = None
+
+        with self.__lock:
+            self.__space.remove(*self.__space.bodies, *self.__space.shapes)
+
+            self.__ships.clear()
+            self.__objects.clear()
+            self.__models.clear()
+            self.__ship_locks.clear()
+            self.__active_contacts = 0
+
+            for register_file in self.__register_files.values():
+                register_file.close()
+            self.__register_files.clear()
+
+        self.__objectives = []
+        self.__objectives_result = None
+        self.__finished_at = None
+        self.__timed_out = False
+        self.__comm_engine = None
+        self.__scenario = None
+        self.__clock.reset()
+        if self.__tick_barrier is not None:
+            self.__tick_barrier.clear()
+        self.__debug_msg_queues.clear()
+
+    def setScenario(self, scenario: str,
+                    scenario_info: 'ScenarioInfo') -> None:
+
+        self.__scenario = scenario
+        self.__clock.reset()
+        self.__seed_sequence = numpy.random.SeedSequence(self.__seed)
+
+        space_info = scenario_info.physics_engine
+        self.__space.damping = space_info.damping
+        self.__space.gravity = space_info.gravity
+        self.__space.collision_slop = space_info.collision_slop
+        self.__space.collision_persistence = space_info.collision_persistence
+        self.__space.iterations = space_info.iterations
+
+        self.__step_time = space_info.timestep
+        self.__substeps = space_info.substeps
+        self.__adaptive = space_info.adaptive
+        self.__clock.step_time = space_info.timestep
+
+        self.__comm_engine = scenario_info.communication_engine
+        if self.__comm_engine is not None:
+            self.__comm_engine.rng = createRandomGenerator(self.spawnSeed())
+        self.__objectives = list(scenario_info.objectives)
+        self.__objectives_result = None
+        self.__finished_at = None
+        self.__timed_out = False
+
+        for objective in self.__objectives:
+            objective.setClock(self.__clock)
+
+    def addShip(self, ship: 'Structure', model: str = None,
+                variables: 'Dict[str, Any]' = None) -> None:
+
+        ship.clock = self.__clock
+
+        with self.__lock:
+            self.__ships.append(ship)
+            self.__models[ship.body] = (model, variables)
+            self.__ship_locks[ship] = PartLock(self.__rwlock)
+
+            if self.__use_register_files:
+                self.__register_files[ship] = ShipRegisterFile(ship)
+
+        self.__debug_msg_queues[ship.name] = SimpleQueue()
+
+    def setController(self, ship: 'Structure', controller: str,
+                      arguments: 'Dict[str, Any]') -> None:
+        """Set the controller of a ship.
+
+        The controller is only started by `startControllers`.
+
+        Args:
+            ship: A ship added with `addShip`.
+            controller: Name of the controller.
+            arguments: Information about the scenario passed to the controller,
+                see `controllerArguments`.
+        """
+        self.__controllers.append(ControllerLaunch(ship, controller, arguments))
+
+    def startControllers(self) -> None:
+
+        fileinfo = FileInfo()
+
+        for launch in self.__controllers:
+            self.__running_controllers.append(fileinfo.loadController(
+                launch.controller, launch.ship, json.dumps(launch.arguments),
+                self.__debug_msg_queues[launch.ship.name],
+                self.__ship_locks[launch.ship],
+                tick_barrier=self.__tick_barrier))
+
+    def __stopControllers(self) -> None:
+
+        # Once stopped no old command reaches a restored device, the processes
+        # are not waited for
+        for controller in self.__running_controllers:
+            controller.stop()
+
+        self.__running_controllers.clear()
+
+        # The subscriptions belong to the controllers
+        with self.__lock:
+            for ship in self.__ships:
+                ship.unsubscribe()
+
+        # Controllers waiting for the next tick are released
+        if self.__tick_barrier is not None:
+            self.__tick_barrier.clear()
+
+    def saveInitialState(self) -> None:
+        """Save the current state of the scenario to be used by `restart`."""
+
+        with self.__lock:
+            bodies = {}
+            for body in (*(ship.body for ship in self.__ships),
+                         *self.__objects):
+                bodies[body] = (body.angle, body.position, body.velocity,
+                                body.angular_velocity, body.force,
+                                body.torque)
+
+            self.__initial_state = SimulationState(
+                bodies=bodies,
+                devices=[ship.getState() for ship in self.__ships],
+                communication_engine=None if self.__comm_engine is None else
+                self.__comm_engine.getState(),
+                register_files={
+                    ship: register_file.getState() for ship, register_file
+                    in self.__register_files.items()})
+
+    def restart(self) -> bool:
+        """Bring the scenario back to the state saved by `saveInitialState`.
+
+        The controllers are stopped, the bodies, devices, objectives and the
+        clock are restored and then the controllers are started again.
+
+        Returns:
+            False if there was no state saved, True otherwise.
+        """
+
+        state = self.__initial_state
+        if state is None:
+            return False
+
+        self.stopRecording()
+        self.__stopControllers()
+
+        with self.__lock:
+            # The angle is restored first, changing it moves the position of
+            # bodies whose center of gravity is not at their origin
+            for body, body_state in state.bodies.items():
+                (body.angle, body.position, body.velocity,
+                 body.angular_velocity, body.force, body.torque) = body_state
+
+            self.__space.reindex_static()
+            self.__active_contacts = 0
+
+            for ship, device_state in zip(self.__ships, state.devices):
+                ship.setState(device_state)
+
+            if self.__comm_engine is not None:
+                self.__comm_engine.setState(state.communication_engine)
+
+            for ship, register_state in state.register_files.items():
+                register_file = self.__register_files.get(ship)
+                if register_file is not None:
+                    register_file.setState(register_state)
+
+            self.__clock.reset()
+            self.__objectives_result = None
+            self.__finished_at = None
+            self.__timed_out = False
+            for objective in self.__objectives:
+                objective.reset()
+
+        self.startControllers()
+
+        return True
+
+    def addObject(self, body: 'pymunk.Body', model: str = None,
+                  variables: 'Dict[str, Any]' = None) -> None:
+
+        with self.__lock:
+            self.__objects.append(body)
+            self.__models[body] = (model, variables)
+
+    def startRecording(self, path: 'Union[str, Path]') -> None:
+        """Start recording the trajectories of the ships and objects.
+
+        The state of every body is recorded after each step, until the
+        recording is stopped or the simulation is cleared, see
+        `TrajectoryRecorder`.
+
+        Args:
+            path: Directory where the recording will be written.
+        """
+
+        self.stopRecording()
+
+        with self.__lock:
+            bodies = []
+            for ship in self.__ships:
+                model, variables = self.__models[ship.body]
+                bodies.append((RecordedBody('ship', ship.name, model,
+                                            variables), ship.body))
+
+            for i, body in enumerate(self.__objects):
+                model, variables = self.__models[body]
+                bodies.append((RecordedBody('object', f'object-{i}', model,
+                                            variables), body))
+
+            self.__recorder = TrajectoryRecorder(
+                path, self.__scenario, self.__step_time, bodies)
+
+    def stopRecording(self) -> None:
+
+        with self.__lock:
+            if self.__recorder is not None:
+                self.__recorder.close()
+                self.__recorder = None
+
+    def loadScenario(self, scenario: str, controller: str = None,
+                     variables: 'Dict[str, Dict[str, Any]]' = None,
+                     bundle: 'ScenarioBundle' = None) -> 'ScenarioInfo':
+        """Load a scenario without asking anything to the user.
+
+        Every ship of the scenario must have a model and a controller specified
+        and every object must have a model, otherwise an exception is raised.
+
+        Args:
+            scenario: Name of the scenario that will be loaded.
+            controller: If specified, this controller is used by every ship of
+                the scenario instead of the controllers of the scenario file.
+            variables: Values that override the variables of the files, the
+                keys are the targets, 'scenario' for the scenario file, 'ship'
+                and 'object' for the models of every ship and object and
+                'ship:<name>' for the model of a single ship. They take
+                precedence over the values declared in the files and every
+                variable must be declared in a file of its target with
+                'variables_enabled', otherwise a `ValueError` is raised.
+            bundle: If it is read only the content of the scenario and of its
+                models is taken from it instead of the files, otherwise the
+                content read is added to it.
+
+        Returns:
+            The information of the scenario that was loaded.
+        """
+
+        scenario_info = self.__loadScenario(scenario, controller, variables,
+                                            bundle)
+
+        self.saveInitialState()
+        self.startControllers()
+
+        return scenario_info
+
+    def loadBundle(self, bundle: 'Union[str, Path, ScenarioBundle]',
+                   controller: str = None) -> 'ScenarioInfo':
+        """Load a scenario from a bundle created with `compileScenario`.
+
+        Nothing is read from the model library, the only file read is the
+        bundle.
+
+        Args:
+            bundle: The bundle or the path to its file.
+            controller: If specified, this controller is used by every ship of
+                the scenario instead of the controllers of the scenario file.
+
+        Returns:
+            The information of the scenario that was loaded.
+        """
+
+        if not isinstance(bundle, ScenarioBundle):
+            bundle = ScenarioBundle.load(bundle)
+
+        return self.loadScenario(bundle.scenario, controller=controller,
+                                 variables=bundle.variables, bundle=bundle)
+
+    def compileScenario(self, scenario: str, controller: str = None,
+                        variables: 'Dict[str, Dict[str, Any]]' = None) \
+                            -> 'ScenarioBundle':
+        """Create a bundle with a scenario and every model it uses.
+
+        The scenario is loaded to find the content it uses and cleared
+        afterwards, the controllers are never started.
+
+        Args:
+            scenario: Name of the scenario.
+            controller: Same as in `loadScenario`, it is only used to check
+                that every ship has a controller, it is not stored.
+            variables: Same as in `loadScenario`, the content stored has these
+                variables substituted.
+
+        Returns:
+            The bundle, it can be saved with `ScenarioBundle.save`.
+        """
+
+        bundle = ScenarioBundle(scenario, variables)
+
+        try:
+            self.__loadScenario(scenario, controller, variables, bundle)
+        finally:
+            self.clear()
+
+        return bundle
+
+    def __loadScenario(self, scenario: str, controller: 'Optional[str]',
+                       variables: 'Optional[Dict[str, Dict[str, Any]]]',
+                       bundle: 'Optional[ScenarioBundle]') -> 'ScenarioInfo':
+
+        self.clear()
+
+        fileinfo = FileInfo()
+
+        if variables is None:
+            variables = {}
+
+        scenario_info = fileinfo.loadScenario(
+            scenario, bundle=bundle, overrides=variables.get('scenario'))
+
+        self.setScenario(scenario, scenario_info)
+
+        arg_scenario_info = self.controllerArguments()
+
+        try:
+            for ship_info in scenario_info.ships:
+                if controller is not None:
+                    ship_info = ship_info._replace(controller=controller)
+                self.__loadShip(ship_info, arg_scenario_info.copy(), fileinfo,
+                                bundle, self.__mergeVariables(
+                                    variables.get('ship'),
+                                    variables.get(f'ship:{ship_info.name}')))
+
+            for obj_info in scenario_info.objects:
+                self.__loadObject(obj_info, fileinfo, bundle,
+                                  variables.get('object'))
+        except Exception:
+            self.clear()
+            raise
+
+        self.__space.reindex_static()
+
+        return scenario_info
+
+    @staticmethod
+    def __mergeVariables(*variables_list: 'Optional[Dict[str, Any]]') \
+            -> 'Optional[Dict[str, Any]]':
+
+        merged = None
+        for variables in variables_list:
+            if variables:
+                if merged is None:
+                    merged = {}
+                merged.update(variables)
+
+        return merged
+
+    def controllerArguments(self) -> 'Dict[str, Any]':
+        """Information about the scenario that is sent to the controllers.
+
+        Returns:
+            A dict that is converted to json and passed as argument to each
+            controller program.
+        """
+
+        return {
+
+            'objectives': [objective.toDict() for objective in
+                           self.__objectives],
+            'lockstep': self.__tick_barrier is not None,
+            'step-time': self.__step_time,
+            'protocols': [1, PROTOCOL_VERSION]
+        }
+
+    def __loadShip(self, ship_info: 'ShipInfo',
+                   arg_scenario_info: 'Dict[str, Any]',
+                   fileinfo: 'FileInfo',
+                   bundle: 'Optional[ScenarioBundle]',
+                   overrides: 'Optional[Dict[str, Any]]') -> None:
+
+        if ship_info.model is None or isinstance(ship_info.model, tuple):
+            raise ValueError(f'Ship \'{ship_info.name}\' must have exactly one '
+                             'model to be loaded without user interaction')
+
+        if ship_info.controller is None:
+            raise ValueError(f'Ship \'{ship_info.name}\' must have a controller'
+                             ' to be loaded without user interaction')
+
+        arg_scenario_info['ship-name'] = ship_info.name
+        arg_scenario_info['starting-position'] = ship_info.position
+        arg_scenario_info['starting-angle'] = 180*ship_info.angle/math.pi
+
+        loaded_ship = fileinfo.loadShip(
+            ship_info.model, ship_info.name, self.__space,
+            communication_engine=self.__comm_engine,
+            variables=ship_info.variables, seed=self.spawnSeed(),
+            bundle=bundle, overrides=overrides)
+
+        ship = loaded_ship.device
+
+        ship.body.position = ship_info.position
+        ship.body.angle = ship_info.angle
+
+        self.addShip(ship, model=ship_info.model,
+                     variables=ship_info.variables)
+        self.setController(ship, ship_info.controller, arg_scenario_info)
+
+    def __loadObject(self, obj_info: 'ObjectInfo', fileinfo: 'FileInfo',
+                     bundle: 'Optional[ScenarioBundle]',
+                     overrides: 'Optional[Dict[str, Any]]') -> None:
+
+        if obj_info.model is None:
+            raise ValueError('Object must have a model to be loaded without '
+                             'user interaction')
+
+        object_info = fileinfo.loadObject(obj_info.model, self.__space,
+                                          variables=obj_info.variables,
+                                          bundle=bundle, overrides=overrides)
+
+        body = object_info.body
+
+        body.position = obj_info.position
+        body.angle = obj_info.angle
+
+        self.addObject(body, model=obj_info.model,
+                       variables=obj_info.variables)
+
+    def step(self) -> None:
+
+        if self.__tick_barrier is not None:
+            self.__tick_barrier.waitParticipants()
+
+        with self.__lock:
+            # In adaptive mode the substeps are only used while there are
+            # shapes touching each other, the tick duration is always the same
+            substeps = self.__substeps
+            if self.__adaptive and self.__active_contacts == 0:
+                substeps = 1
+
+            for register_file in self.__register_files.values():
+                register_file.applySetpoints()
+
+            substep_time = self.__step_time/substeps
+            for _ in range(substeps):
+                self.__space.step(substep_time)
+
+            self.__clock.advance()
+
+            for ship in self.__ships:
+                ship.act()
+
+            if self.__comm_engine is not None:
+                self.__comm_engine.step()
+
+            self.__checkObjectives()
+
+            for register_file in self.__register_files.values():
+                register_file.write(self.__clock.tick, self.__clock.time)
+
+            # The readings are sent by the host of the controllers, before the
+            # answer to 'end-tick' in lockstep mode
+            tick = self.__clock.tick
+            for controller in tuple(self.__running_controllers):
+                ship = controller.ship
+                if ship.hasSubscriptions():
+                    readings = ship.subscriptionReadings(tick)
+                    if readings:
+                        controller.push(tick, readings)
+
+            if self.__recorder is not None:
+                self.__recorder.record(self.__clock.time)
+
+        tick = self.__clock.tick
+        if self.__tick_barrier is not None:
+            self.__tick_barrier.startTick(tick)
+
+        for controller in tuple(self.__running_controllers):
+            controller.tickStarted(tick)
+
+    def run(self, print_debug_messages: bool = False,
+            max_time: 'Optional[float]' = DEFAULT_MAX_TIME) -> 'Optional[bool]':
+        """Advance the simulation until the objectives have a result.
+
+        The steps are performed one after the other, without waiting, so the
+        simulation runs as fast as possible.
+
+        Args:
+            print_debug_messages: If True, the debug messages sent by the
+                controllers will be written to stderr.
+            max_time: Simulated seconds after which the simulation is stopped
+                even if the objectives have no result, None for no limit.
+
+        Returns:
+            True if the objectives were accomplished, False if they were not
+            and None if the simulation was stopped after `max_time`.
+        """
+
+        while self.__objectives_result is None:
+            if max_time is not None and self.__clock.time >= max_time:
+                self.__timed_out = True
+                break
+
+            self.step()
+
+            for ship_name, message in self.debugMessages():
+                if print_debug_messages:
+                    print(f'[{ship_name}] {message}', file=sys.stderr)
+
+        return self.__objectives_result
+
+    def debugMessages(self) -> 'Iterator[Tuple[str, str]]':
+
+        for ship_name, queue in tuple(self.__debug_msg_queues.items()):
+            try:
+                while not queue.empty():
+                    yield ship_name, queue.get_nowait()
+            except EmptyQueueException:
+                pass
+
+    def objectivesTimedOut(self) -> bool:
+
+        if self.__time_limit is None or self.__scenario is None:
+            return False
+
+        return self.__clock.time > self.__time_limit
+
+    def __checkObjectives(self) -> None:
+
+        ships = self.__ships
+
+        objectives_complete = all(
+            tuple(objective.verify(self.__space, ships)
+                  for objective in self.__objectives))
+
+        if objectives_complete:
+            self.__objectives_result = True
+        else:
+
+            if self.objectivesTimedOut() or any(
+                    tuple(objective.failed()
+                          for objective in self.__objectives)):
+
+                self.__objectives_result = False
+            else:
+                self.__objectives_result = None
+
+        if self.__objectives_result is not None and self.__finished_at is None:
+            self.__finished_at = self.__clock.time
+
+    def __createObjectivesRecord(self,
+                                 node: 'anytree.Node') -> 'Dict[str, Any]':
+
+        objective = node.name
+
+        finished_at = objective.finished_at
+        if finished_at is None:
+            time_to_result = None
+        else:
+            time_to_result = finished_at - objective.started_at
+
+        return {
+            'name': objective.name,
+            'desc': objective.description,
+            'accomplished': objective.accomplished(),
+            'failed': objective.failed(),
+            'time': time_to_result,
+            'children': [self.__createObjectivesRecord(child)
+                         for child in node.children]
+        }
+
+    def statistics(self) -> 'Dict[str, Any]':
+
+        if self.__finished_at is None:
+            scenario_time = self.__clock.time
+        else:
+            scenario_time = self.__finished_at
+
+        if self.__time_limit is not None and scenario_time > self.__time_limit:
+            scenario_time = self.__time_limit
+
+        objectives = createObjectiveTree(self.__objectives)
+
+        return {
+            'success': self.__objectives_result,
+            'scenario': self.__scenario,
+            'time': scenario_time,
+            'seed': self.seed,
+            'timed-out': self.__timed_out,
+            'objectives': [self.__createObjectivesRecord(child)
+                           for child in objectives.children]
+        }
+
+    def saveStatistics(self) -> None:
+        FileInfo().saveStatistics(self.statistics())
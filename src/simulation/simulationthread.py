@@ -0,0 +1,138 @@
+"""Class used to run a simulation in a separate thread.
+
+This module contains the thread that advances a simulation at a fixed rate,
+after each step it publishes a snapshot of the bodies, so the graphical
+interface can draw the scene without waiting for the simulation and the
+simulation never waits for the graphical interface.
+"""
+
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from threading import Event, Lock, RLock, Thread
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # pylint: disable=ungrouped-imports
+    from typing import Dict, Iterator, Optional, Tuple
+    import pymunk
+    from .simulation import Simulation
+    # pylint: enable=ungrouped-imports
+
+    BodyStateType = Tuple[float, float, float]
+
+SimulationSnapshot = namedtuple('SimulationSnapshot', (
+    'tick', 'time', 'wall_time', 'bodies'))
+
+class SimulationThread:
+    """Thread that steps a simulation.
+
+    The steps are performed every `step_interval` seconds, if a step takes
+    longer than that the next one is performed immediately, without trying to
+    recover the steps that were lost. After each step a `SimulationSnapshot`
+    with the position and angle of every ship and object is published, the
+    last two snapshots can be retrieved with `snapshots`.
+
+    Args:
+        simulation: Simulation that will be advanced.
+        step_interval: Time in seconds between each step.
+    """
+
+    def __init__(self, simulation: 'Simulation',
+                 step_interval: float) -> None:
+
+        self.__simulation = simulation
+        self.__step_interval = step_interval
+
+        self.__running = False
+        self.__stop_event = Event()
+        self.__step_lock = RLock()
+        self.__snapshots_lock = Lock()
+
+        self.__snapshots: 'Tuple[Optional[SimulationSnapshot], ...]' = \
+            (None, None)
+
+        self.__thread = Thread(target=self.__run, daemon=True)
+
+    @property
+    def running(self) -> bool:
+        return self.__running
+
+    @running.setter
+    def running(self, running: bool) -> None:
+        self.__running = running
+
+    def start(self) -> None:
+        self.__thread.start()
+
+    def stop(self) -> None:
+        self.__stop_event.set()
+        if self.__thread.is_alive():
+            self.__thread.join()
+
+    @contextmanager
+    def paused(self) -> 'Iterator[None]':
+        """Context manager that prevents the simulation from being stepped.
+
+        It waits for the step that is being performed to finish, so the
+        simulation can be safely modified inside it. It can be nested, so
+        methods that pause the simulation can call each other.
+        """
+
+        with self.__step_lock:
+            yield
+
+    def snapshots(self) -> 'Tuple[Optional[SimulationSnapshot], ...]':
+        """Get the last two snapshots published.
+
+        Returns:
+            A tuple with the previous and the last snapshot, any of them may be
+            None if not enough steps were performed.
+        """
+
+        with self.__snapshots_lock:
+            return self.__snapshots
+
+    def clearSnapshots(self) -> None:
+
+        with self.__snapshots_lock:
+            self.__snapshots = (None, None)
+
+    def __takeSnapshot(self) -> 'SimulationSnapshot':
+
+        simulation = self.__simulation
+
+        with simulation.read_lock:
+            bodies: 'Dict[pymunk.Body, BodyStateType]' = {}
+            for ship in simulation.ships:
+                body = ship.body
+                bodies[body] = (body.position.x, body.position.y, body.angle)
+
+            for body in simulation.objects:
+                bodies[body] = (body.position.x, body.position.y, body.angle)
+
+            clock = simulation.clock
+
+            return SimulationSnapshot(tick=clock.tick, time=clock.time,
+                                      wall_time=time.monotonic(),
+                                      bodies=bodies)
+
+    def __run(self) -> None:
+
+        next_step_time = time.monotonic()
+        while not self.__stop_event.is_set():
+
+            with self.__step_lock:
+                if self.__running:
+                    self.__simulation.step()
+                    snapshot = self.__takeSnapshot()
+
+                    with self.__snapshots_lock:
+                        self.__snapshots = (self.__snapshots[1], snapshot)
+
+            next_step_time += self.__step_interval
+            delay = next_step_time - time.monotonic()
+            if delay > 0:
+                self.__stop_event.wait(delay)
+            else:
+                next_step_time = time.monotonic()
@@ -0,0 +1,209 @@
+"""Functions used to run a scenario with many values of its variables.
+
+This module contains the code used to expand a sweep specification, which
+lists variables of the scenario, ship and object files and the values they can
+assume, into the runs of a batch, see `batch.runBatch`. The values take
+precedence over the ones declared in the files, a variable that is not
+declared in a file of its target with 'variables_enabled' makes its runs fail,
+see `Simulation.loadScenario`.
+"""
+
+import json
+import itertools
+from pathlib import Path
+from collections import namedtuple
+from typing import TYPE_CHECKING
+
+import toml
+import yaml
+import numpy
+
+from .batch import BatchRun
+
+if TYPE_CHECKING:
+    # pylint: disable=ungrouped-imports
+    from typing import Any, Dict, List, MutableMapping, Sequence, Union
+    # pylint: enable=ungrouped-imports
+
+    SweepPointType = Dict[str, Dict[str, Any]]
+
+SweepVariable = namedtuple('SweepVariable', (
+    'id', 'target', 'values', 'minimum', 'maximum', 'steps', 'integer'))
+
+SweepSpec = namedtuple('SweepSpec', (
+    'scenarios', 'controllers', 'repetitions', 'mode', 'samples', 'seed',
+    'variables'))
+
+SWEEP_MODES = ('grid', 'random', 'latin-hypercube')
+
+def _readSweepVariable(content: 'MutableMapping[str, Any]') -> 'SweepVariable':
+
+    variable_id = content.get('id')
+    if variable_id is None:
+        raise ValueError('Sweep variable must have an \'id\'')
+
+    values = content.get('values')
+    minimum = content.get('min')
+    maximum = content.get('max')
+
+    if values is None:
+        if minimum is None or maximum is None:
+            raise ValueError(f'Sweep variable \'{variable_id}\' must have '
+                             '\'values\' or \'min\' and \'max\'')
+        if minimum > maximum:
+            raise ValueError(f'Sweep variable \'{variable_id}\' has \'min\' '
+                             'greater than \'max\'')
+    elif not values:
+        raise ValueError(f'Sweep variable \'{variable_id}\' has no values')
+
+    return SweepVariable(id=variable_id,
+                         target=content.get('target', 'scenario'),
+                         values=None if values is None else tuple(values),
+                         minimum=minimum, maximum=maximum,
+                         steps=content.get('steps'),
+                         integer=content.get('integer', False))
+
+def readSweepSpec(content: 'MutableMapping[str, Any]') -> 'SweepSpec':
+
+    scenarios = content.get('scenarios')
+    if scenarios is None:
+        scenario = content.get('scenario')
+        if scenario is None:
+            raise ValueError('Sweep must have a \'scenario\' or \'scenarios\'')
+        scenarios = (scenario,)
+
+    mode = content.get('mode', 'grid')
+    if mode not in SWEEP_MODES:
+        raise ValueError(f'Invalid sweep mode \'{mode}\'')
+
+    samples = content.get('samples')
+    if mode != 'grid' and samples is None:
+        raise ValueError(f'Sweep mode \'{mode}\' requires \'samples\'')
+
+    return SweepSpec(scenarios=tuple(scenarios),
+                     controllers=tuple(content.get('controllers', (None,))),
+                     repetitions=content.get('repetitions', 1),
+                     mode=mode, samples=samples, seed=content.get('seed'),
+                     variables=tuple(
+                         _readSweepVariable(variable)
+                         for variable in content.get('Variable',
+                                                     content.get('variables',
+                                                                 ()))))
+
+def loadSweepSpec(path: 'Union[str, Path]') -> 'SweepSpec':
+    """Read a sweep specification from a toml, json or yaml file.
+
+    Args:
+        path: Path to the file.
+
+    Returns:
+        The specification read from the file.
+    """
+
+    path = Path(path)
+
+    if path.suffix == '.toml':
+        content = toml.load(path)
+    else:
+        with open(path) as file:
+            if path.suffix == '.json':
+                content = json.load(file)
+            else:
+                content = yaml.safe_load(file)
+
+    return readSweepSpec(content)
+
+def _toPython(value: 'Any') -> 'Any':
+    return value.item() if isinstance(value, numpy.generic) else value
+
+def _gridValues(variable: 'SweepVariable') -> 'Sequence[Any]':
+
+    if variable.values is not None:
+        return variable.values
+
+    steps = 2 if variable.steps is None else variable.steps
+
+    values = numpy.linspace(variable.minimum, variable.maximum, steps)
+    if variable.integer:
+        return tuple(sorted(set(int(round(value)) for value in values)))
+
+    return tuple(float(value) for value in values)
+
+def _sampleValue(variable: 'SweepVariable', unit_value: float) -> 'Any':
+
+    if variable.values is not None:
+        index = min(int(unit_value*len(variable.values)),
+                    len(variable.values) - 1)
+        return variable.values[index]
+
+    if variable.integer:
+        value = variable.minimum + \
+            unit_value*(variable.maximum - variable.minimum + 1)
+        return min(int(value), variable.maximum)
+
+    return float(variable.minimum +
+                 unit_value*(variable.maximum - variable.minimum))
+
+def _unitSamples(spec: 'SweepSpec') -> 'numpy.ndarray':
+
+    rng = numpy.random.default_rng(spec.seed)
+    shape = (spec.samples, len(spec.variables))
+
+    if spec.mode == 'random':
+        return rng.random(shape)
+
+    # Latin hypercube, each variable range is divided in 'samples' strata and
+    # each stratum is sampled exactly once
+    strata = numpy.stack([rng.permutation(spec.samples)
+                          for _ in spec.variables], axis=1)
+
+    return (strata + rng.random(shape))/spec.samples
+
+def sweepPoints(spec: 'SweepSpec') -> 'List[SweepPointType]':
+    """Calculate the values of the variables in each point of the sweep.
+
+    Args:
+        spec: The sweep specification.
+
+    Returns:
+        A list with the variables of each point, grouped by target, in the
+        format expected by `Simulation.loadScenario`.
+    """
+
+    if spec.mode == 'grid':
+        combinations = itertools.product(
+            *(_gridValues(variable) for variable in spec.variables))
+    else:
+        combinations = (
+            tuple(_sampleValue(variable, unit_value)
+                  for variable, unit_value in zip(spec.variables, sample))
+            for sample in _unitSamples(spec))
+
+    points = []
+    for combination in combinations:
+        point: 'SweepPointType' = {}
+        for variable, value in zip(spec.variables, combination):
+            point.setdefault(variable.target, {})[variable.id] = \
+                _toPython(value)
+        points.append(point)
+
+    return points
+
+def createSweepRuns(spec: 'SweepSpec') -> 'List[BatchRun]':
+    """Expand a sweep specification in the runs of a batch.
+
+    Args:
+        spec: The sweep specification.
+
+    Returns:
+        A run for each combination of scenario, controller, point of the sweep
+        and repetition.
+    """
+
+    points = sweepPoints(spec)
+
+    return [BatchRun(scenario, controller, repetition, variables=point)
+            for scenario in spec.scenarios
+            for controller in spec.controllers
+            for point in points
+            for repetition in range(spec.repetitions)]
@@ -0,0 +1,210 @@
+"""Class used to synchronize the controllers with the simulation.
+
+This module contains the barrier used in lockstep mode, the simulation waits
+in it, before each step, until every controller has finished the commands of
+the current tick.
+"""
+
+import time
+from threading import Condition
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+class TickBarrier:
+    """Barrier between the simulation steps and the controllers.
+
+    Each controller is a participant of the barrier, after the simulation
+    starts a tick the participant issues its commands and then signals that it
+    has finished by calling `endTick`, which blocks until the next tick starts,
+    or `endTickLater`, which calls a function when it starts instead.
+    A participant that takes more than `tick_budget` seconds in a tick is not
+    waited for anymore in that tick, and a participant that does not finish
+    its first tick before `startup_timeout` seconds is removed from the
+    barrier, so controllers that do not support lockstep run freely.
+
+    Args:
+        tick_budget: Maximum amount of time in seconds the simulation waits
+            for a participant in each tick.
+        startup_timeout: Maximum amount of time in seconds the simulation waits
+            for a participant to finish its first tick.
+    """
+
+    def __init__(self, tick_budget: float = 1,
+                 startup_timeout: float = 10) -> None:
+
+        self.__condition = Condition()
+        self.__tick_budget = tick_budget
+        self.__startup_timeout = startup_timeout
+        self.__tick = 0
+
+        # Last tick each participant has finished, participants that have not
+        # finished any tick yet are marked with None
+        self.__finished: 'Dict[Hashable, Optional[int]]' = {}
+        self.__started_at: 'Dict[Hashable, float]' = {}
+
+        # Participants that called `endTickLater`, with the tick they finished
+        # and the function called when a later tick starts
+        self.__waiting: 'List[Tuple[Hashable, int, Callable[[int], None]]]' \
+            = []
+
+    @property
+    def tick(self) -> int:
+        return self.__tick
+
+    @property
+    def tick_budget(self) -> float:
+        return self.__tick_budget
+
+    def register(self, participant: 'Hashable') -> None:
+
+        with self.__condition:
+            self.__finished[participant] = None
+            self.__started_at[participant] = time.monotonic()
+
+    def isRegistered(self, participant: 'Hashable') -> bool:
+
+        with self.__condition:
+            return participant in self.__finished
+
+    def unregister(self, participant: 'Hashable') -> None:
+
+        with self.__condition:
+            self.__finished.pop(participant, None)
+            self.__started_at.pop(participant, None)
+            self.__condition.notify_all()
+            released = self.__takeReleased()
+            tick = self.__tick
+
+        for callback in released:
+            callback(tick)
+
+    def clear(self) -> None:
+
+        with self.__condition:
+            self.__finished.clear()
+            self.__started_at.clear()
+            self.__tick = 0
+            self.__condition.notify_all()
+            released = self.__takeReleased()
+
+        for callback in released:
+            callback(0)
+
+    def __takeReleased(self) -> 'List[Callable[[int], None]]':
+        """Remove the participants waiting in `endTickLater` that can go on.
+
+        It must be called with the condition held, the functions returned must
+        be called after releasing it.
+        """
+
+        released = []
+        waiting = []
+        for participant, finished, callback in self.__waiting:
+            if self.__tick > finished or participant not in self.__finished:
+                released.append(callback)
+            else:
+                waiting.append((participant, finished, callback))
+
+        self.__waiting = waiting
+
+        return released
+
+    def endTick(self, participant: 'Hashable') -> int:
+        """Signal that a participant has finished the current tick.
+
+        This method blocks until the simulation starts a tick after the one
+        the participant was working on, if the participant is late it returns
+        immediately.
+
+        Args:
+            participant: Participant that has finished the tick.
+
+        Returns:
+            The tick that has started.
+        """
+
+        with self.__condition:
+
+            if participant not in self.__finished:
+                return self.__tick
+
+            finished = self.__tick
+            self.__finished[participant] = finished
+            self.__condition.notify_all()
+
+            self.__condition.wait_for(
+                lambda: self.__tick > finished or
+                participant not in self.__finished)
+
+            return self.__tick
+
+    def endTickLater(self, participant: 'Hashable',
+                     callback: 'Callable[[int], None]') -> None:
+        """Signal that a participant has finished the current tick without
+        blocking.
+
+        The same as `endTick`, but the tick that has started is given to a
+        function instead of being returned. The function is called from the
+        thread that starts the tick, or from this one if the participant is
+        late, so it must be short.
+
+        Args:
+            participant: Participant that has finished the tick.
+            callback: Function called with the tick that has started.
+        """
+
+        with self.__condition:
+
+            tick = self.__tick
+            if participant in self.__finished:
+                self.__finished[participant] = tick
+                self.__condition.notify_all()
+                self.__waiting.append((participant, tick, callback))
+                return
+
+        callback(tick)
+
+    def waitParticipants(self) -> None:
+        """Wait until every participant finishes the current tick.
+
+        Participants that do not finish in time are not waited for, and the
+        ones that never finished their first tick before the startup timeout
+        are removed.
+        """
+
+        with self.__condition:
+
+            deadline = time.monotonic() + self.__tick_budget
+            while True:
+                now = time.monotonic()
+
+                late = False
+                for participant, finished in tuple(self.__finished.items()):
+                    if finished is None:
+                        started_at = self.__started_at[participant]
+                        if now - started_at > self.__startup_timeout:
+                            del self.__finished[participant]
+                            del self.__started_at[participant]
+                        else:
+                            late = True
+                            deadline = max(deadline, started_at +
+                                           self.__startup_timeout)
+                    elif finished < self.__tick:
+                        late = True
+
+                if not late or now >= deadline:
+                    return
+
+                self.__condition.wait(deadline - now)
+
+    def startTick(self, tick: int) -> None:
+
+        with self.__condition:
+            self.__tick = tick
+            self.__condition.notify_all()
+            released = self.__takeReleased()
+
+        for callback in released:
+            callback(tick)
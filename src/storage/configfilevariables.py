@@ -4,13 +4,14 @@ from typing import TYPE_CHECKING, MutableMapping
 from simpleeval import simple_eval
 
 if TYPE_CHECKING:
-    from typing import Any, Optional, Tuple
+    from typing import Any, Mapping, Optional, Set, Tuple
 
     DictSubVariablesReturnType = Tuple[bool, Optional[MutableMapping[str, Any]]]
 
 def __dictSubVariables(content: 'MutableMapping[str, Any]',
                        enabled: 'Optional[bool]',
-                       variables: 'Optional[MutableMapping[str, Any]]') \
+                       variables: 'Optional[MutableMapping[str, Any]]',
+                       overrides: 'Optional[Mapping[str, Any]]') \
                            -> 'DictSubVariablesReturnType':
 
     if enabled is None:
@@ -40,9 +41,15 @@ def __dictSubVariables(content: 'MutableMapping[str, Any]',
         variables = dict(**variables)
         variables.update(new_variables)
 
+    if overrides:
+        variables = dict(**variables)
+        variables.update(overrides)
+
     for key, value in content.items():
-        new_key = subVariables(key, enabled=True, variables=variables)
-        new_val = subVariables(value, enabled=True, variables=variables)
+        new_key = subVariables(key, enabled=True, variables=variables,
+                               overrides=overrides)
+        new_val = subVariables(value, enabled=True, variables=variables,
+                               overrides=overrides)
 
         content[new_key] = new_val
 
@@ -74,22 +81,94 @@ def __strSubVariables(content: str,
     return content
 
 def subVariables(content: 'Any', enabled: bool = None,
-                 variables: 'Optional[MutableMapping[str, Any]]' = None) \
-                     -> 'Any':
+                 variables: 'Optional[MutableMapping[str, Any]]' = None,
+                 overrides: 'Optional[Mapping[str, Any]]' = None) -> 'Any':
+    """Substitute the variables in the content of a file.
+
+    Args:
+        content: The content, it is modified.
+        enabled: If None the variables are only substituted in the tables
+            with 'variables_enabled' in their 'Config' table.
+        variables: Values of the variables, the ones declared in the content
+            take precedence unless they are declared with 'override = false'.
+        overrides: Values of variables that take precedence over the ones
+            declared in the content, see `checkOverrides`.
+
+    Returns:
+        The content with the variables substituted.
+    """
 
     if enabled is False:
         return content
 
     if isinstance(content, MutableMapping): # pylint: disable=isinstance-second-argument-not-valid-type
-        must_return, ret_val = __dictSubVariables(content, enabled, variables)
+        must_return, ret_val = __dictSubVariables(content, enabled, variables,
+                                                  overrides)
         if must_return:
             return ret_val
 
     elif isinstance(content, list):
         for i, element in enumerate(content):
             content[i] = subVariables(element, enabled=enabled,
-                                      variables=variables)
+                                      variables=variables,
+                                      overrides=overrides)
     elif isinstance(content, str):
         return __strSubVariables(content, variables)
 
     return content
+
+def declaredVariables(content: 'Any', enabled: bool = None) -> 'Set[str]':
+    """Get the ids of the variables declared where they are substituted.
+
+    Args:
+        content: Content of a file.
+        enabled: Same as in `subVariables`.
+
+    Returns:
+        The ids of the variables.
+    """
+
+    declared: 'Set[str]' = set()
+
+    if enabled is False:
+        return declared
+
+    if isinstance(content, MutableMapping): # pylint: disable=isinstance-second-argument-not-valid-type
+        if enabled is None:
+            config = content.get('Config')
+            if config is None or \
+                config.get('variables_enabled', False) is False:
+                return declared
+
+        declared.update(variable['id']
+                        for variable in content.get('Variable', ()))
+
+        for value in content.values():
+            declared |= declaredVariables(value, enabled=True)
+
+    elif isinstance(content, list):
+        for element in content:
+            declared |= declaredVariables(element, enabled=enabled)
+
+    return declared
+
+def checkOverrides(content: 'Any', overrides: 'Mapping[str, Any]',
+                   name: str) -> None:
+    """Check that every variable overridden is declared in the content.
+
+    Args:
+        content: Content of a file.
+        overrides: The variables given to `subVariables` as `overrides`.
+        name: Name of the file used in the error.
+
+    Raises:
+        ValueError: If a variable is not declared or the file does not have
+            'variables_enabled', since its value would not be used.
+    """
+
+    undeclared = set(overrides) - declaredVariables(content)
+    if undeclared:
+        raise ValueError(
+            f'Variables {", ".join(sorted(undeclared))} can not be overridden '
+            f'in \'{name}\', they are not declared in a file with '
+            '\'variables_enabled\'')
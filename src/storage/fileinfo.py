@@ -1,18 +1,21 @@
 
+import io
 import os
 import sys
 import shutil
+import pickle
+import hashlib
+import tempfile
 from pathlib import Path
+from collections import OrderedDict
 import subprocess
 from enum import Enum, Flag, auto as flagAuto
 from fnmatch import fnmatch
+from collections import namedtuple
 from typing import NamedTuple, TYPE_CHECKING, cast as typingcast
 
 import json
 import toml
-import yaml
-
-from PyQt5 import uic
 
 from anytree import Node
 
@@ -25,19 +28,14 @@ from .loaders import (
 
 from ..utils import dictutils
 
-# sys.path manipulation so it is not imported in a different path
-sys.path.insert(0, str(Path(__file__).parent.parent.joinpath('interface')))
-from nodetreeview import NodeValue # pylint: disable=wrong-import-order, wrong-import-position, import-error
-sys.path.pop(0)
-
 if TYPE_CHECKING:
     # pylint: disable=ungrouped-imports
     from queue import SimpleQueue
-    from threading import Thread, Lock
     from typing import (
         Sequence, Optional, Union, List, Any, Callable, Dict, MutableMapping,
-        Type, Tuple, Iterable
+        Set, Type, Tuple, Iterable
     )
+    from numpy.random import SeedSequence
     from pymunk import Space
     from PyQt5.QtWidgets import QWidget
     from .loaders.scenarioloader import ScenarioInfo
@@ -45,8 +43,16 @@ if TYPE_CHECKING:
     from .loaders.objectloader import ObjectInfo
     from ..devices.structure import Structure
     from ..devices.communicationdevices import CommunicationEngine
+    from ..simulation.tickbarrier import TickBarrier
+    from ..utils.rwlock import PartLock
+    from .loaders.controllerloader import ControllerProcess
+    from .loaders.customloader import CustomLoader
+    from .scenariobundle import ScenarioBundle
+    from nodetreeview import NodeValue # pylint: disable=import-error
     # pylint: enable=ungrouped-imports
 
+    ContentCacheEntryType = Tuple[Dict[str, int], Optional[bytes]]
+
 class _FileInfo_FileMetadataType(Flag):
     ABSENT = 0
     FILE_INTERNAL = flagAuto()
@@ -55,6 +61,34 @@ class _FileInfo_FileMetadataType(Flag):
     CONF_FILE_DEFAULT = FILE_INTERNAL | DIRECTORY
     GENERIC_FILE_DEFAULT = FILE_EXTERNAL | DIRECTORY
 
+# Version of the format of the files of the persistent content cache, entries
+# with a different version are ignored
+CONTENT_CACHE_VERSION = 2
+
+# Maximum amount of entries kept in memory by the content cache
+CONTENT_CACHE_SIZE = 512
+
+# Entry of a directory in the file index, 'dependencies' has the modification
+# times of the files the metadata was read from, and of the entry itself if it
+# is a directory, since adding its metadata file changes it
+IndexedFile = namedtuple('IndexedFile', (
+    'name', 'is_directory', 'metadata', 'dependencies'))
+
+IndexedDirectory = namedtuple('IndexedDirectory', ('mtime', 'entries'))
+
+def _nodeValueClass() -> 'Type[NodeValue]':
+
+    # Imported only when a listed file has metadata, it belongs to the
+    # graphical interface and imports Qt widgets. The sys.path manipulation is
+    # so it is not imported in a different path
+    sys.path.insert(0, str(Path(__file__).parent.parent.joinpath('interface')))
+    try:
+        from nodetreeview import NodeValue # pylint: disable=import-outside-toplevel, import-error, redefined-outer-name
+    finally:
+        sys.path.pop(0)
+
+    return NodeValue
+
 class FileInfo:
 
     __instance: 'Optional[FileInfo]' = None
@@ -136,6 +170,25 @@ class FileInfo:
 
         self.__statistics_file: 'Optional[Union[str, Path]]' = None
 
+        # Parsed files and models merged with their parents, stored pickled
+        # so each use gets its own copy that can be modified by the loaders,
+        # each entry has the modification time of the files it was read from
+        self.__content_cache: 'OrderedDict[Tuple[str, ...], ContentCacheEntryType]' = OrderedDict() # pylint: disable=line-too-long
+        self.__content_dependencies: 'Optional[Dict[str, int]]' = None
+
+        # Custom shape, device and objective models, with the modification
+        # times of the files and directories they were read from
+        self.__custom_models: 'Dict[Any, Tuple[Dict[str, int], Dict[Any, Callable], List[bytes]]]' = {} # pylint: disable=line-too-long
+
+        # Types of custom models already checked in the scenario being loaded,
+        # its ships and objects use them without reading the files again
+        self.__custom_models_checked: 'Set[Any]' = set()
+
+        # Entries and metadata of the directories listed by `listFilesTree`,
+        # the key is the path and the type of metadata read
+        self.__file_index: 'Optional[Dict[Tuple[str, int], IndexedDirectory]]' = None # pylint: disable=line-too-long
+        self.__file_index_changed = False
+
         self.__path = \
             Path.home().joinpath('.local/share/spaceshipcontrol').resolve()
         self.__dist_data_path = Path(__file__).parent.parent.resolve()
@@ -153,6 +206,13 @@ class FileInfo:
         except FileNotFoundError:
             self.__config_content = {}
 
+        # The content cache is only kept on disk, between runs, if it is
+        # enabled in the configuration
+        self.__cache_path: 'Optional[Path]' = None
+        if self.readConfig('Cache', 'persistent', default=False):
+            self.__cache_path = self.__path.joinpath('cache')
+            self.__cache_path.mkdir(exist_ok=True)
+
         create_n_link_example_dirs = ['controllers', 'ships', 'scenarios',
                                       'objects', 'objectives', 'images',
                                       'shapes', 'devices']
@@ -164,12 +224,21 @@ class FileInfo:
             path.mkdir(exist_ok=True)
 
             example_dir_path = path.joinpath('examples')
+            example_target_path = dist_data_examples_path.joinpath(dirname)
+
+            # The link is only replaced when it is wrong, so starting the
+            # program does not modify the filesystem
+            try:
+                if os.readlink(example_dir_path) == str(example_target_path):
+                    continue
+            except OSError:
+                pass
+
             try:
                 os.unlink(example_dir_path)
             except FileNotFoundError:
                 pass
-            os.symlink(dist_data_examples_path.joinpath(dirname),
-                       example_dir_path)
+            os.symlink(example_target_path, example_dir_path)
 
     def __new__(cls) -> 'FileInfo':
 
@@ -254,7 +323,7 @@ class FileInfo:
         if path is None:
             return None
 
-        return self.__listTree(
+        tree = self.__listTree(
             path,
             Node(filedatatype_info.path),
             remove_suffix=filedatatype_info.list_remove_suffix,
@@ -262,6 +331,13 @@ class FileInfo:
             metadata_type=metadata_type,
             can_hide_files=not show_hidden_files)
 
+        if self.__file_index_changed and self.__cache_path is not None:
+            self.__writeCacheFile(self.__cache_path.joinpath('file-index.pickle'),
+                                  'file-index', self.__file_index)
+        self.__file_index_changed = False
+
+        return tree
+
     @property
     def statistics_filepath(self) -> 'Optional[Union[str, Path]]':
         return self.__statistics_file
@@ -278,6 +354,7 @@ class FileInfo:
             return
 
         with open(self.__statistics_file, 'w') as file:
+            import yaml # pylint: disable=import-outside-toplevel
             yaml.dump(statistics, file)
 
     def getHandbookText(self, section: str) -> str:
@@ -335,40 +412,108 @@ class FileInfo:
 
         return self.__readFileMetadata(path, metadata_type)
 
+    def __indexDirectory(self, path: 'Path',
+                         metadata_type: '_FileInfo_FileMetadataType') \
+                             -> 'Tuple[IndexedFile, ...]':
+        """Get the entries of a directory from the file index.
+
+        A directory is read again only when its modification time changes,
+        which happens when a file is added, removed or renamed, and the
+        metadata of an entry is read again only when the files it was read
+        from change.
+
+        Args:
+            path: Path of the directory.
+            metadata_type: Metadata read for each entry.
+
+        Returns:
+            The entries sorted by name.
+        """
+
+        if self.__file_index is None:
+            index = None
+            if self.__cache_path is not None:
+                index = self.__readCacheFile(
+                    self.__cache_path.joinpath('file-index.pickle'),
+                    'file-index')
+            self.__file_index = {} if index is None else index
+
+        key = (str(path), metadata_type.value)
+        mtime = path.stat().st_mtime_ns
+
+        indexed = self.__file_index.get(key)
+        if indexed is None or indexed.mtime != mtime:
+            entries = tuple(self.__indexFile(path, entry.name, entry.is_dir(),
+                                             metadata_type)
+                            for entry in sorted(os.scandir(path),
+                                                key=lambda entry: entry.name))
+        elif all(self.__isContentFresh(entry.dependencies)
+                 for entry in indexed.entries):
+            return typingcast('Tuple[IndexedFile, ...]', indexed.entries)
+        else:
+            entries = tuple(
+                entry if self.__isContentFresh(entry.dependencies) else
+                self.__indexFile(path, entry.name, entry.is_directory,
+                                 metadata_type)
+                for entry in indexed.entries)
+
+        self.__file_index[key] = IndexedDirectory(mtime, entries)
+        self.__file_index_changed = True
+
+        return entries
+
+    def __indexFile(self, dir_path: 'Path', name: str, is_directory: bool,
+                    metadata_type: '_FileInfo_FileMetadataType') \
+                        -> 'IndexedFile':
+
+        path = dir_path.joinpath(name)
+
+        outer_dependencies = self.__content_dependencies
+        self.__content_dependencies = {}
+        try:
+            if is_directory and \
+                metadata_type & self.FileMetadataType.DIRECTORY:
+                self.__addContentDependency(path)
+
+            metadata = self.__readMetadata(path, metadata_type, is_directory)
+            dependencies = self.__content_dependencies
+        finally:
+            self.__content_dependencies = outer_dependencies
+
+        return IndexedFile(name, is_directory, metadata, dependencies)
+
     def __listTree(self, base_path: 'Path', current_node: 'Node',
                    blacklist: 'Sequence[str]' = (), remove_suffix: bool = True,
                    metadata_type: '_FileInfo_FileMetadataType' = None,
                    can_hide_files: bool = True) -> 'Node':
 
-        for path in sorted(base_path.iterdir()):
-            is_directory = path.is_dir()
+        if metadata_type is None:
+            metadata_type = self.FileMetadataType.ABSENT
 
-            if any(fnmatch(path.name, match_str) for match_str in blacklist):
-                continue
+        for entry in self.__indexDirectory(base_path, metadata_type):
 
-            original_path = path
+            if any(fnmatch(entry.name, match_str) for match_str in blacklist):
+                continue
 
+            path_name = entry.name
             if remove_suffix is True:
-                path = path.with_suffix('')
+                path_name = Path(path_name).stem
 
-            path_name = path.name
             name: 'Union[str, NodeValue]' = path_name
 
-            if metadata_type is not None:
-                metadata = self.__readMetadata(
-                    original_path, metadata_type, is_directory)
+            metadata = entry.metadata
+            if metadata:
+                if can_hide_files and metadata.get('hide', False):
+                    continue
 
-                if metadata:
-                    if can_hide_files and metadata.get('hide', False):
-                        continue
-
-                    name = NodeValue(
-                        path_name, str(metadata.get('description', '')),
-                        label=str(metadata.get('name', path_name)))
+                name = _nodeValueClass()(
+                    path_name, str(metadata.get('description', '')),
+                    label=str(metadata.get('name', path_name)))
 
             new_node = Node(name, parent=current_node)
-            if is_directory:
-                self.__listTree(path, new_node, blacklist=blacklist,
+            if entry.is_directory:
+                self.__listTree(base_path.joinpath(entry.name), new_node,
+                                blacklist=blacklist,
                                 remove_suffix=remove_suffix,
                                 metadata_type=metadata_type,
                                 can_hide_files=can_hide_files)
@@ -450,10 +595,220 @@ class FileInfo:
                 basename, filedatatype, ('.toml', '.json', '.yaml', '.yml'))
 
         if filepath is None:
+            # The content that found nothing is created again when a file
+            # is added to the directory
+            if not suffix_specified and \
+                self.__content_dependencies is not None:
+                directory = typingcast('Path', self.getPath(filedatatype)) \
+                    .joinpath(basename).parent
+                if directory.is_dir():
+                    self.__addContentDependency(directory)
+
             if inexistent_message is None:
                 return None
             raise Exception(inexistent_message.format(name=basename))
 
+        filepath = Path(filepath)
+
+        # A file added with a suffix of higher priority changes the directory,
+        # so the content that uses the name is created again
+        if not suffix_specified and self.__content_dependencies is not None:
+            self.__addContentDependency(filepath.parent)
+
+        def parse() -> 'Optional[MutableMapping[str, Any]]':
+            self.__addContentDependency(filepath)
+            return self.__parseFile(filepath, suffix)
+
+        return self.__cachedContent(('parsed', str(filepath)), parse)
+
+    def __cachedContent(
+            self, key: 'Tuple[str, ...]',
+            create: 'Callable[[], Optional[MutableMapping[str, Any]]]',
+            persistent: bool = True) -> 'Optional[MutableMapping[str, Any]]':
+        """Get content from the cache, creating it if needed.
+
+        The entry is valid while none of the files and directories read by
+        `create` changes, they are registered with `__addContentDependency`.
+
+        Args:
+            key: Key of the entry in the cache.
+            create: Function that creates the content if the entry is missing
+                or outdated.
+            persistent: If False the entry is only kept in memory, even if
+                the cache is kept on disk.
+
+        Returns:
+            A copy of the content.
+        """
+
+        persistent = persistent and self.__cache_path is not None
+
+        entry = self.__content_cache.get(key)
+        if entry is None and persistent:
+            entry = self.__readCacheEntry(key)
+
+        if entry is None or not self.__isContentFresh(entry[0]):
+
+            outer_dependencies = self.__content_dependencies
+            self.__content_dependencies = {}
+            try:
+                content = create()
+                entry = (self.__content_dependencies,
+                         None if content is None else pickle.dumps(
+                             content, protocol=pickle.HIGHEST_PROTOCOL))
+            except Exception:
+                # Whoever handles the error, like the file index with a
+                # malformed metadata file, tries again when the files change
+                if outer_dependencies is not None:
+                    outer_dependencies.update(self.__content_dependencies)
+                raise
+            finally:
+                self.__content_dependencies = outer_dependencies
+
+            if persistent:
+                self.__writeCacheEntry(key, entry)
+
+        self.__content_cache[key] = entry
+        self.__content_cache.move_to_end(key)
+        if len(self.__content_cache) > CONTENT_CACHE_SIZE:
+            self.__content_cache.popitem(last=False)
+
+        # Content that uses this entry also depends on its files
+        if self.__content_dependencies is not None:
+            self.__content_dependencies.update(entry[0])
+
+        if entry[1] is None:
+            return None
+
+        return typingcast('MutableMapping[str, Any]', pickle.loads(entry[1]))
+
+    def __addContentDependency(self, filepath: 'Path') -> None:
+
+        if self.__content_dependencies is not None:
+            self.__content_dependencies[str(filepath)] = \
+                filepath.stat().st_mtime_ns
+
+    @staticmethod
+    def __isContentFresh(dependencies: 'Dict[str, int]') -> bool:
+
+        try:
+            return all(os.stat(path).st_mtime_ns == mtime
+                       for path, mtime in dependencies.items())
+        except OSError:
+            return False
+
+    def __cacheEntryPath(self, key: 'Tuple[str, ...]') -> 'Path':
+
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+
+        return typingcast('Path', self.__cache_path).joinpath(
+            f'{digest}.pickle')
+
+    @staticmethod
+    def __readCacheFile(path: 'Path', key: 'Any') -> 'Optional[Any]':
+
+        try:
+            with open(path, 'rb') as file:
+                version, file_key, value = pickle.load(file)
+        except Exception: # pylint: disable=broad-except
+            return None
+
+        if version != CONTENT_CACHE_VERSION or file_key != key:
+            return None
+
+        return value
+
+    @staticmethod
+    def __writeCacheFile(path: 'Path', key: 'Any', value: 'Any') -> None:
+
+        # The value is written to a temporary file and then renamed, so other
+        # processes never read an incomplete file
+        try:
+            file_descriptor, temp_path = tempfile.mkstemp(
+                dir=path.parent, suffix='.tmp')
+            with os.fdopen(file_descriptor, 'wb') as file:
+                pickle.dump((CONTENT_CACHE_VERSION, key, value), file,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except OSError as err:
+            print(f'Could not write to the content cache: {err}',
+                  file=sys.stderr)
+
+    def __readCacheEntry(self, key: 'Tuple[str, ...]') \
+            -> 'Optional[ContentCacheEntryType]':
+        return typingcast('Optional[ContentCacheEntryType]',
+                          self.__readCacheFile(self.__cacheEntryPath(key), key))
+
+    def __writeCacheEntry(self, key: 'Tuple[str, ...]',
+                          entry: 'ContentCacheEntryType') -> None:
+        self.__writeCacheFile(self.__cacheEntryPath(key), key, entry)
+
+    def clearContentCache(self) -> None:
+        """Remove every entry of the content cache, also from the disk."""
+
+        self.__content_cache.clear()
+        self.__file_index = None
+
+        if self.__cache_path is not None:
+            for path in self.__cache_path.glob('*.pickle'):
+                path.unlink()
+
+    def __getMergedContent(
+            self, name: str,
+            get_content: 'Callable[..., Optional[MutableMapping[str, Any]]]',
+            filedatatype: 'FileDataType',
+            variables: 'Optional[Dict[str, Any]]',
+            bundle: 'Optional[ScenarioBundle]' = None,
+            overrides: 'Optional[Dict[str, Any]]' = None) \
+                -> 'Optional[MutableMapping[str, Any]]':
+
+        # Variables only come from the files and the user, so their
+        # representation identifies them
+        variables_key = repr(sorted(variables.items())) \
+            if variables is not None else ''
+        key: 'Tuple[str, ...]' = ('merged', filedatatype.name, name,
+                                  variables_key)
+        if overrides:
+            key += (repr(sorted(overrides.items())),)
+
+        if bundle is not None and bundle.read_only:
+            return bundle.getContent(key)
+
+        prefixes = name.split('/')[:-1]
+
+        def getParentContent(parent: str) \
+                -> 'Optional[MutableMapping[str, Any]]':
+            return get_content(parent, overrides=overrides)
+
+        def merge() -> 'Optional[MutableMapping[str, Any]]':
+
+            content = get_content(name, variables=variables,
+                                  overrides=overrides)
+            if content is None:
+                return None
+
+            content = configfileinheritance.mergeInheritedFiles(
+                content, getParentContent, prefixes=prefixes)
+
+            if overrides:
+                configfilevariables.checkOverrides(content, overrides, name)
+
+            return content
+
+        # Each set of variables, like the points of a sweep, would leave its
+        # own file on the disk
+        content = self.__cachedContent(
+            key, merge, persistent=variables is None and not overrides)
+
+        if bundle is not None:
+            bundle.addContent(key, content)
+
+        return content
+
+    @staticmethod
+    def __parseFile(filepath: 'Path', suffix: 'Optional[str]') \
+            -> 'Optional[MutableMapping[str, Any]]':
+
         if suffix == '.json':
             with open(filepath) as file:
                 content = json.load(file)
@@ -462,6 +817,9 @@ class FileInfo:
                 return None
 
         if suffix in ('.yaml', '.yml'):
+            # Imported here, yaml is slow to import and files read from the
+            # content cache do not need it
+            import yaml # pylint: disable=import-outside-toplevel
             with open(filepath) as file:
                 content = yaml.safe_load(file)
                 if isinstance(content, dict):
@@ -470,7 +828,9 @@ class FileInfo:
 
         return toml.load(filepath)
 
-    def __getScenarioContent(self, scenario_name: str) \
+    def __getScenarioContent(self, scenario_name: str,
+                             variables: 'Dict[str, Any]' = None,
+                             overrides: 'Dict[str, Any]' = None) \
         -> 'Optional[MutableMapping[str, Any]]':
 
         content = self.__getContent(scenario_name, self.FileDataType.SCENARIO,
@@ -484,12 +844,14 @@ class FileInfo:
         dictutils.mergeMatch(content, (), ('Objective', 'objectives'),
                              'Objective', absolute=True)
 
-        configfilevariables.subVariables(content)
+        configfilevariables.subVariables(content, variables=variables,
+                                         overrides=overrides)
 
         return content
 
     def __getShipContent(self, ship_model: str,
-                         variables: 'Dict[str, Any]' = None) \
+                         variables: 'Dict[str, Any]' = None,
+                         overrides: 'Dict[str, Any]' = None) \
                              -> 'Optional[MutableMapping[str, Any]]':
 
         content = self.__getContent(ship_model, self.FileDataType.SHIPMODEL,
@@ -511,12 +873,14 @@ class FileInfo:
         dictutils.mergeMatch(content, ('Shape',), ('Point', 'points'), 'Point',
                              absolute=True)
 
-        configfilevariables.subVariables(content, variables=variables)
+        configfilevariables.subVariables(content, variables=variables,
+                                         overrides=overrides)
 
         return content
 
     def __getObjectContent(self, object_model: str,
-                           variables: 'Dict[str, Any]' = None) \
+                           variables: 'Dict[str, Any]' = None,
+                           overrides: 'Dict[str, Any]' = None) \
                                -> 'Optional[MutableMapping[str, Any]]':
 
         content = self.__getContent(object_model, self.FileDataType.OBJECTMODEL,
@@ -530,11 +894,90 @@ class FileInfo:
         dictutils.mergeMatch(content, ('Shape',), ('Point', 'points'), 'Point',
                              absolute=True)
 
-        configfilevariables.subVariables(content, variables=variables)
+        configfilevariables.subVariables(content, variables=variables,
+                                         overrides=overrides)
 
         return content
 
-    def __loadCustom(self, filedatatype, loader, files_tree=None, prefix=None):
+    def __loadCustom(self, filedatatype: 'FileDataType',
+                     loader: 'CustomLoader',
+                     bundle: 'ScenarioBundle' = None) -> None:
+        """Add the custom models of a type to a loader.
+
+        The models are read once and shared by every loader, they are only
+        read again when a file or a directory of the models changes, which is
+        checked once for each type of model while a scenario is loaded, see
+        `loadScenario`.
+
+        Args:
+            filedatatype: Type of the custom models.
+            loader: Loader the models are added to.
+            bundle: If it is read only the models are taken from it, otherwise
+                the models are added to it.
+        """
+
+        if bundle is not None and bundle.read_only:
+
+            customs = bundle.getCustomFunctions(filedatatype.name)
+            if customs is None:
+                loader.clearCustoms()
+                for model in bundle.getCustomModels(filedatatype.name):
+                    loader.addCustom(model)
+
+                customs = loader.getCustoms()
+                bundle.setCustomFunctions(filedatatype.name, customs)
+
+            loader.addCustoms(customs)
+            return
+
+        path = self.getPath(filedatatype)
+
+        entry = self.__custom_models.get(filedatatype)
+        if entry is None or (
+                filedatatype not in self.__custom_models_checked and
+                not self.__isContentFresh(entry[0])):
+
+            # The modification times are read before the models, so a change
+            # made while they are read is seen in the next load
+            dependencies = self.__treeModificationTimes(path)
+
+            models: 'List[bytes]' = []
+            loader.clearCustoms()
+            self.__addCustomFiles(filedatatype, loader, models)
+
+            entry = (dependencies, loader.getCustoms(), models)
+            self.__custom_models[filedatatype] = entry
+
+        self.__custom_models_checked.add(filedatatype)
+
+        loader.addCustoms(entry[1])
+
+        if bundle is not None:
+            bundle.setCustomModels(filedatatype.name, entry[2])
+
+    @staticmethod
+    def __treeModificationTimes(path: 'Optional[Path]') -> 'Dict[str, int]':
+
+        if path is None:
+            return {}
+
+        # Adding, removing or renaming a file changes the modification time of
+        # its directory
+        modification_times = {}
+        for dirpath, _dirnames, filenames in os.walk(path, followlinks=True):
+            modification_times[dirpath] = os.stat(dirpath).st_mtime_ns
+            for filename in filenames:
+                filepath = os.path.join(dirpath, filename)
+                try:
+                    modification_times[filepath] = \
+                        os.stat(filepath).st_mtime_ns
+                except OSError:
+                    pass
+
+        return modification_times
+
+    def __addCustomFiles(self, filedatatype, loader, models, files_tree=None,
+                         prefix=None):
 
         if files_tree is None:
             files_tree = self.listFilesTree(filedatatype).children
@@ -548,10 +991,17 @@ class FileInfo:
                 path = element.name
 
             if children:
-                self.__loadCustom(filedatatype, loader, children, prefix=path)
+                self.__addCustomFiles(filedatatype, loader, models, children,
+                                      prefix=path)
             else:
                 try:
-                    loader.addCustom(self.__getContent(path, filedatatype))
+                    content = self.__getContent(path, filedatatype)
+                    loader.addCustom(content)
+
+                    # The content is pickled after it is added, so a model
+                    # that is not valid is not kept
+                    models.append(pickle.dumps(
+                        content, protocol=pickle.HIGHEST_PROTOCOL))
                 except Exception as err:
 
                     filedatatype_info = self.__getFileDataTypeInfo(filedatatype)
@@ -560,44 +1010,94 @@ class FileInfo:
                           f'\': {err}', file=sys.stderr)
 
     def loadUi(self, filename: str) -> 'Tuple[Type, Type]':
-        return typingcast(
-            'Tuple[Type, Type]',
-            uic.loadUiType(self.getPath(self.FileDataType.UIDESIGN, filename)))
+        """Create the classes of a Qt Designer file, like `uic.loadUiType`.
+
+        The code generated from the file is kept in the content cache, so the
+        file is only compiled, and `PyQt5.uic` only imported, when it changes.
+
+        Args:
+            filename: Name of the file.
 
-    def loadScenario(self, scenario_name: str) -> 'ScenarioInfo':
+        Returns:
+            The form class and the Qt base class.
+        """
+
+        path = typingcast('Path', self.getPath(self.FileDataType.UIDESIGN,
+                                               filename))
+
+        def compileUi() -> 'Dict[str, str]':
+
+            from PyQt5.uic import compiler # pylint: disable=import-outside-toplevel
+
+            self.__addContentDependency(path)
+
+            code = io.StringIO()
+            window_info = compiler.UICompiler().compileUi(
+                str(path), code, False, '_rc', '.')
+
+            return {'code': code.getvalue(),
+                    'uiclass': window_info['uiclass'],
+                    'baseclass': window_info['baseclass']}
+
+        compiled = typingcast('Dict[str, str]',
+                              self.__cachedContent(('ui', str(path)), compileUi))
+
+        ui_globals: 'Dict[str, Any]' = {}
+        exec(compile(compiled['code'], str(path), 'exec'), ui_globals) # pylint: disable=exec-used
+
+        ui_base = ui_globals.get(compiled['baseclass'])
+        if ui_base is None:
+            from PyQt5 import QtWidgets # pylint: disable=import-outside-toplevel
+            ui_base = getattr(QtWidgets, compiled['baseclass'])
+
+        return ui_globals[compiled['uiclass']], ui_base
+
+    def loadScenario(self, scenario_name: str,
+                     variables: 'Dict[str, Any]' = None,
+                     bundle: 'ScenarioBundle' = None,
+                     overrides: 'Dict[str, Any]' = None) -> 'ScenarioInfo':
+
+        # The ships and objects of the scenario are loaded after it, the
+        # custom models they use are checked only once
+        self.__custom_models_checked.clear()
 
         objective_loader = objectiveloader.ObjectiveLoader()
-        self.__loadCustom(self.FileDataType.OBJECTIVEMODEL, objective_loader)
+        self.__loadCustom(self.FileDataType.OBJECTIVEMODEL, objective_loader,
+                          bundle=bundle)
 
         prefixes = scenario_name.split('/')[:-1]
 
-        scenario_content = self.__getScenarioContent(scenario_name)
+        scenario_content = self.__getMergedContent(
+            scenario_name, self.__getScenarioContent,
+            self.FileDataType.SCENARIO, variables, bundle=bundle,
+            overrides=overrides)
 
         if scenario_content is None:
             raise Exception('Scenario was not found')
 
-        scenario_content = configfileinheritance.mergeInheritedFiles(
-            scenario_content, self.__getScenarioContent, prefixes=prefixes)
-
         return scenarioloader.loadScenario(scenario_content, prefixes=prefixes,
                                            objective_loader=objective_loader)
 
     def loadShip(self, model: str, name: str, space: 'Space',
                  communication_engine: 'CommunicationEngine' = None,
-                 variables: 'Dict[str, Any]' = None) -> 'ShipInfo':
+                 variables: 'Dict[str, Any]' = None,
+                 seed: 'SeedSequence' = None,
+                 bundle: 'ScenarioBundle' = None,
+                 overrides: 'Dict[str, Any]' = None) -> 'ShipInfo':
 
         shape_loader = shapeloader.ShapeLoader()
-        self.__loadCustom(self.FileDataType.SHAPEMODEL, shape_loader)
+        self.__loadCustom(self.FileDataType.SHAPEMODEL, shape_loader,
+                          bundle=bundle)
 
-        device_loader = deviceloader.DeviceLoader()
-        self.__loadCustom(self.FileDataType.DEVICEMODEL, device_loader)
+        device_loader = deviceloader.DeviceLoader(seed=seed)
+        self.__loadCustom(self.FileDataType.DEVICEMODEL, device_loader,
+                          bundle=bundle)
 
         prefixes = model.split('/')[:-1]
 
-        ship_content = self.__getShipContent(model, variables=variables)
-
-        ship_content = configfileinheritance.mergeInheritedFiles(
-            ship_content, self.__getShipContent, prefixes=prefixes)
+        ship_content = self.__getMergedContent(
+            model, self.__getShipContent, self.FileDataType.SHIPMODEL,
+            variables, bundle=bundle, overrides=overrides)
 
         return shiploader.loadShip(ship_content, name, space, prefixes=prefixes,
                                    communication_engine=communication_engine,
@@ -605,31 +1105,34 @@ class FileInfo:
                                    device_loader=device_loader)
 
     def loadObject(self, model: str, space: 'Space',
-                   variables: 'Dict[str, Any]' = None) \
-                       -> 'ObjectInfo':
+                   variables: 'Dict[str, Any]' = None,
+                   bundle: 'ScenarioBundle' = None,
+                   overrides: 'Dict[str, Any]' = None) -> 'ObjectInfo':
 
         shape_loader = shapeloader.ShapeLoader()
-        self.__loadCustom(self.FileDataType.SHAPEMODEL, shape_loader)
+        self.__loadCustom(self.FileDataType.SHAPEMODEL, shape_loader,
+                          bundle=bundle)
 
         prefixes = model.split('/')[:-1]
 
-        obj_content = self.__getObjectContent(model, variables=variables)
+        obj_content = self.__getMergedContent(
+            model, self.__getObjectContent, self.FileDataType.OBJECTMODEL,
+            variables, bundle=bundle, overrides=overrides)
 
         if obj_content is None:
             raise Exception("Object model \'{model}\' not found")
 
-        obj_content = configfileinheritance.mergeInheritedFiles(
-            obj_content, self.__getObjectContent, prefixes=prefixes)
-
         return objectloader.loadObject(obj_content, space, prefixes=prefixes,
                                        shape_loader=shape_loader)
 
     def loadController(self, controller_name: str, ship: 'Structure',
                        json_info: str, debug_queue: 'SimpleQueue',
-                       lock: 'Lock') -> 'Thread':
+                       lock: 'PartLock',
+                       tick_barrier: 'TickBarrier' = None) \
+            -> 'ControllerProcess':
         return controllerloader.loadController(
             str(self.getPath(self.FileDataType.CONTROLLER, controller_name)),
-            ship, json_info, debug_queue, lock)
+            ship, json_info, debug_queue, lock, tick_barrier=tick_barrier)
 
     def openFile(self, filedatatype: 'FileDataType', filename: str) -> None:
 
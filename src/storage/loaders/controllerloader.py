@@ -1,85 +1,540 @@
+"""Host of the controller programs.
 
-import time
-from typing import TYPE_CHECKING
+Each controller is a process that receives the commands of its ship through
+its standard output and answers them through its standard input, its standard
+error is used for debug messages. The pipes of every controller are handled by
+a single thread running an asyncio event loop, the `ControllerHost`, and the
+exit of the processes is detected with a process file descriptor watched by
+the same loop where the system supports it, or by polling the processes from
+the loop otherwise.
+
+The loop only does the input and output, the commands are answered by a few
+threads shared by every controller while holding the lock of the ship, so
+different ships are answered at the same time and a step of the simulation,
+which holds the lock of every ship, never blocks the loop. The commands of a
+controller are still answered one at a time, the next one is not read until
+the previous one is answered. The commands that wait for the simulation,
+'end-tick' and 'wait-next-tick [n]', are answered by the loop without holding
+any lock.
+"""
 
+import os
 import signal
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from subprocess import Popen, PIPE
-from threading import Thread
+from threading import Lock, Thread
+from typing import TYPE_CHECKING
+
+from ...utils import controllerprotocol
+from ...utils.controllerprotocol import (
+    OPCODE_BATCH, OPCODE_END_TICK, OPCODE_HANDLE, OPCODE_RESOLVE, OPCODE_TEXT,
+    OPCODE_WAIT_TICKS, PROTOCOL_REQUEST, PROTOCOL_VERSION, WAIT_TICKS_COMMAND
+)
 
 if TYPE_CHECKING:
     # pylint: disable=ungrouped-imports
-    from typing import BinaryIO
+    from typing import Any, Callable, List, Optional, Tuple
+    from concurrent.futures import Future
     from queue import SimpleQueue
-    from threading import Lock
     from ...devices.structure import Structure
+    from ...simulation.tickbarrier import TickBarrier
+    from ...utils.rwlock import PartLock
     # pylint: enable=ungrouped-imports
 
+# Maximum length of a line sent by a controller
+LINE_LIMIT = 2**24
+
+# Readings of subscriptions are not sent while this amount of bytes sent to
+# the controller has not been read yet, so a controller that does not read
+# them does not fill the memory
+PUSH_BUFFER_LIMIT = 2**20
+
+# Threads that answer the commands of every controller
+COMMAND_THREADS = min(32, (os.cpu_count() or 1) + 4)
+
+# Seconds between the checks of the processes that exited, when they can not
+# be watched with a process file descriptor
+EXIT_POLL_INTERVAL = 0.05
+
 def loadController(program_path: str, ship: 'Structure', json_info: str,
-                   debug_queue: 'SimpleQueue', lock: 'Lock') -> 'Thread':
+                   debug_queue: 'SimpleQueue', lock: 'PartLock',
+                   tick_barrier: 'TickBarrier' = None) -> 'ControllerProcess':
 
-    return ControllerLoader().load(program_path, ship, json_info,
-                                   debug_queue, lock)
+    return ControllerHost().start(program_path, ship, json_info, debug_queue,
+                                  lock, tick_barrier=tick_barrier)
 
-class ControllerLoader:
+def _setFutureResult(future: 'asyncio.Future', result: 'Any') -> None:
+    if not future.done():
+        future.set_result(result)
 
-    def load(self, program_path: str, ship: 'Structure', json_info: str,
-             debug_queue: 'SimpleQueue', lock: 'Lock') -> 'Thread':
+class ControllerProcess:
+    """Controller started by the `ControllerHost`.
 
-        process = Popen([program_path, json_info], stdin=PIPE, stdout=PIPE,
-                        stderr=PIPE)
+    The commands of the controller are answered until it exits or `stop` is
+    called.
+    """
 
-        Thread(target=self.__controllerThreadWatcher,
-               args=(process, ship, lock)).start()
+    def __init__(self, loop: 'asyncio.AbstractEventLoop',
+                 executor: 'ThreadPoolExecutor', process: 'Popen',
+                 ship: 'Structure', debug_queue: 'SimpleQueue',
+                 lock: 'PartLock', tick_barrier: 'Optional[TickBarrier]'):
 
-        Thread(target=self.__controllerThreadDebugMessages, daemon=True,
-               args=(process.stderr, debug_queue)).start()
+        self.__loop = loop
+        self.__executor = executor
+        self.__process = process
+        self.__ship = ship
+        self.__debug_queue = debug_queue
+        self.__lock = lock
+        self.__tick_barrier = tick_barrier
 
-        return Thread(target=self.__controllerThread, daemon=True,
-                      args=(process.stdout, process.stdin, ship, lock))
+        self.__tasks: 'List[asyncio.Task]' = []
+        self.__transports: 'List[asyncio.BaseTransport]' = []
+        self.__writer: 'Optional[asyncio.StreamWriter]' = None
+        self.__binary = False
+        self.__stopped = False
 
-    @staticmethod
-    def __controllerThreadWatcher(process: 'Popen', device: 'Structure',
-                                  lock: 'Lock') -> None:
+        # Command being answered by the executor
+        self.__answering: 'Optional[Future]' = None
 
-        while True:
-            with lock:
-                if device.isDestroyed():
-                    break
-            time.sleep(1)
+        # Tick waited for and future of each 'wait-next-tick' being answered,
+        # the lock is shared with the thread of the simulation
+        self.__tick_lock = Lock()
+        self.__tick_waiters: 'List[Tuple[int, asyncio.Future]]' = []
 
-        process.send_signal(signal.SIGHUP)
+    @property
+    def process(self) -> 'Popen':
+        return self.__process
 
-    @staticmethod
-    def __controllerThreadDebugMessages(pstderr: 'BinaryIO',
-                                        debug_queue: 'SimpleQueue') -> None:
+    @property
+    def ship(self) -> 'Structure':
+        return self.__ship
+
+    async def connect(self) -> None:
+        """Start handling the pipes of the process.
+
+        It must run in the loop of the host.
+        """
+
+        loop = self.__loop
+        process = self.__process
+
+        reader = asyncio.StreamReader(limit=LINE_LIMIT, loop=loop)
+        transport, _ = await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader, loop=loop),
+            process.stdout)
+        self.__transports.append(transport)
+
+        debug_reader = asyncio.StreamReader(limit=LINE_LIMIT, loop=loop)
+        transport, _ = await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(debug_reader, loop=loop),
+            process.stderr)
+        self.__transports.append(transport)
+
+        transport, protocol = await loop.connect_write_pipe(
+            lambda: asyncio.StreamReaderProtocol(asyncio.StreamReader(),
+                                                 loop=loop),
+            process.stdin)
+        self.__transports.append(transport)
+        writer = asyncio.StreamWriter(transport, protocol, None, loop)
+        self.__writer = writer
+
+        self.__tasks.append(loop.create_task(
+            self.__handleRequests(reader, writer)))
+        self.__tasks.append(loop.create_task(
+            self.__forwardDebugMessages(debug_reader)))
+
+    def exited(self) -> None:
+        """Called by the host in its loop when the process exits."""
+
+        # A controller that has exited is not waited for in the next ticks,
+        # the rest of its output is still read
+        if self.__tick_barrier is not None:
+            self.__tick_barrier.unregister(self.__process)
+
+    async def __forwardDebugMessages(self,
+                                     reader: 'asyncio.StreamReader') -> None:
 
         try:
             while True:
-                text = pstderr.readline().decode()
+                text = (await reader.readline()).decode()
                 if not text:
                     return
-                debug_queue.put(text[:-1])
+                self.__debug_queue.put(text[:-1] if text[-1] == '\n' else text)
 
-        except BrokenPipeError:
+        except (ConnectionError, ValueError):
             pass
 
+    async def __endTick(self) -> int:
+
+        if self.__tick_barrier is None:
+            clock = self.__ship.clock
+            return 0 if clock is None else clock.tick
+
+        # The loop is not blocked while the controller waits for the next
+        # tick, the future is completed from the thread that starts it
+        future = self.__loop.create_future()
+        self.__tick_barrier.endTickLater(
+            self.__process, lambda tick: self.__loop.call_soon_threadsafe(
+                _setFutureResult, future, tick))
+
+        return await future
+
+    async def __waitTicks(self, ticks: int) -> int:
+
+        # In lockstep mode waiting for the next tick is finishing this one
+        if self.__tick_barrier is not None and \
+            self.__tick_barrier.isRegistered(self.__process):
+            tick = 0
+            for _ in range(ticks):
+                tick = await self.__endTick()
+            return tick
+
+        clock = self.__ship.clock
+        if clock is None:
+            return 0
+
+        target = clock.tick + ticks
+        future = self.__loop.create_future()
+        with self.__tick_lock:
+            if clock.tick >= target:
+                return clock.tick
+            self.__tick_waiters.append((target, future))
+
+        return await future
+
+    def tickStarted(self, tick: int) -> None:
+        """Answer the 'wait-next-tick' commands waiting for a tick.
+
+        It is called by the simulation after each step, from any thread.
+        """
+
+        with self.__tick_lock:
+            if not self.__tick_waiters:
+                return
+
+            released = [future for target, future in self.__tick_waiters
+                        if target <= tick]
+            self.__tick_waiters = [(target, future) for target, future
+                                   in self.__tick_waiters if target > tick]
+
+        for future in released:
+            self.__loop.call_soon_threadsafe(_setFutureResult, future, tick)
+
+    def __locked(self, function: 'Callable[..., Any]', *args: 'Any') -> 'Any':
+
+        with self.__lock:
+            # Nothing is answered once the controller is stopped
+            if self.__stopped:
+                return None
+            return function(*args)
+
+    async def __answer(self, function: 'Callable[..., Any]',
+                       *args: 'Any') -> 'Any':
+        """Call a function holding the lock of the ship.
+
+        The loop is not blocked, the function is called by a thread of the
+        executor of the host.
+        """
+
+        future = self.__executor.submit(self.__locked, function, *args)
+        self.__answering = future
+
+        return await asyncio.wrap_future(future)
+
     @staticmethod
-    def __controllerThread(pstdout: 'BinaryIO', pstdin: 'BinaryIO',
-                           device: 'Structure', lock: 'Lock') -> None:
+    def __answerFrame(opcode: int, payload: bytes,
+                      device: 'Structure') -> 'Any':
+
+        # The handles are the ones of the index of the ship, the same that
+        # the command 'open' gives
+        if opcode == OPCODE_HANDLE:
+            handle, command = controllerprotocol.decodeHandleCommand(payload)
+            target = device.deviceFromHandle(handle)
+            return 'Invalid device' if target is None else \
+                target.query(command)
+
+        if opcode == OPCODE_BATCH:
+            answers = []
+            for handle, command in controllerprotocol.decodeBatch(payload):
+                target = device.deviceFromHandle(handle)
+                answers.append('Invalid device' if target is None else
+                               target.query(command))
+            return answers
+
+        if opcode == OPCODE_TEXT:
+            return device.query(payload.decode())
+
+        if opcode == OPCODE_RESOLVE:
+            return device.openDevice(payload.decode())
+
+        return 'Invalid command'
+
+    @classmethod
+    def __answerFrameSafely(cls, opcode: int, payload: bytes,
+                            device: 'Structure') -> 'Any':
+        try:
+            return cls.__answerFrame(opcode, payload, device)
+        except Exception: # pylint: disable=broad-except
+            # A malformed frame only invalidates itself
+            return 'Invalid command'
+
+    async def __binaryProtocolLoop(self, reader: 'asyncio.StreamReader',
+                                   writer: 'asyncio.StreamWriter') -> None:
+
+        while True:
+            request = await controllerprotocol.readRequest(reader)
+
+            if request is None:
+                break
+
+            request_id, opcode, payload = request
+
+            ticks = None
+            if opcode == OPCODE_WAIT_TICKS:
+                ticks = controllerprotocol.decodeWaitTicks(payload)
+            elif opcode == OPCODE_TEXT and \
+                payload.startswith(WAIT_TICKS_COMMAND.encode()):
+                ticks = controllerprotocol.parseWaitTicks(payload.decode())
+
+            if opcode == OPCODE_END_TICK:
+                answer = await self.__endTick()
+            elif ticks is not None:
+                answer = await self.__waitTicks(ticks)
+            else:
+                answer = await self.__answer(self.__answerFrameSafely, opcode,
+                                             payload, self.__ship)
+
+            writer.write(controllerprotocol.encodeResponse(request_id, answer))
+            await writer.drain()
+
+    async def __handleRequests(self, reader: 'asyncio.StreamReader',
+                               writer: 'asyncio.StreamWriter') -> None:
 
         try:
             while True:
-                question = pstdout.readline().decode()
+                question = (await reader.readline()).decode()
+
+                if not question:
+                    break
 
-                if question and question[-1] == '\n':
+                if question[-1] == '\n':
                     question = question[:-1]
 
-                with lock:
-                    answer = device.communicate(question)
+                # 'end-tick' and 'wait-next-tick' are answered without holding
+                # the lock, since they wait for the next simulation steps
+                ticks = None
+                if question.startswith(WAIT_TICKS_COMMAND):
+                    ticks = controllerprotocol.parseWaitTicks(question)
+
+                if question == 'end-tick':
+                    answer = str(await self.__endTick())
+                elif ticks is not None:
+                    answer = str(await self.__waitTicks(ticks))
+                elif question == PROTOCOL_REQUEST:
+                    # The answer is the last line, after it every message is a
+                    # frame of the binary protocol
+                    writer.write(f'{PROTOCOL_VERSION}\n'.encode())
+                    self.__binary = True
+                    await self.__binaryProtocolLoop(reader, writer)
+                    break
+                else:
+                    answer = await self.__answer(self.__ship.communicate,
+                                                 question)
+
+                writer.write(answer.encode())
+                writer.write(b'\n')
+                await writer.drain()
+
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            if self.__tick_barrier is not None:
+                self.__tick_barrier.unregister(self.__process)
+
+    def __push(self, tick: int,
+               readings: 'List[Tuple[int, float]]') -> None:
+
+        writer = self.__writer
+        if self.__stopped or writer is None or writer.is_closing() or \
+            writer.transport.get_write_buffer_size() > PUSH_BUFFER_LIMIT:
+            return
 
-                pstdin.write(answer.encode())
-                pstdin.write(b'\n')
-                pstdin.flush()
+        # It runs between two steps of the coroutines, so it never splits an
+        # answer
+        if self.__binary:
+            writer.write(controllerprotocol.encodePush(tick, readings))
+        else:
+            writer.write(controllerprotocol.formatPushLine(
+                tick, readings).encode())
+            writer.write(b'\n')
 
-        except BrokenPipeError:
+    def push(self, tick: int, readings: 'List[Tuple[int, float]]') -> None:
+        """Send the readings of the subscribed sensors to the controller.
+
+        It can be called from any thread, the readings are sent by the loop of
+        the host and discarded if the controller is not reading what it is
+        sent.
+
+        Args:
+            tick: Tick of the readings.
+            readings: Handle and reading of each sensor.
+        """
+        self.__loop.call_soon_threadsafe(self.__push, tick, readings)
+
+    async def close(self) -> None:
+        """Stop handling the pipes and send SIGHUP to the process.
+
+        It must run in the loop of the host.
+        """
+
+        if self.__stopped:
+            return
+        self.__stopped = True
+
+        try:
+            self.__process.send_signal(signal.SIGHUP)
+        except ProcessLookupError:
             pass
+
+        for task in self.__tasks:
+            task.cancel()
+
+        for transport in self.__transports:
+            transport.close()
+
+        with self.__tick_lock:
+            self.__tick_waiters.clear()
+
+        if self.__tick_barrier is not None:
+            self.__tick_barrier.unregister(self.__process)
+
+        # The command being answered, if any, is waited for without blocking
+        # the loop, the ones after it are not answered
+        answering = self.__answering
+        if answering is not None and not answering.done():
+            await asyncio.wait([asyncio.wrap_future(answering)])
+
+    def stop(self) -> None:
+        """Stop the controller.
+
+        When it returns no other command of the controller is answered. It
+        must not be called from the loop of the host.
+        """
+        asyncio.run_coroutine_threadsafe(self.close(), self.__loop).result()
+
+class ControllerHost:
+    """Event loop that handles the pipes of every controller.
+
+    There is only one host, which is created the first time it is used, its
+    loop runs in a daemon thread. The loop only reads and writes the pipes,
+    the commands are answered by a pool of `COMMAND_THREADS` threads while
+    holding the lock of the ship, and the controllers waiting for the next
+    tick in lockstep mode do not block it.
+    """
+
+    __instance: 'Optional[ControllerHost]' = None
+    __instance_lock = Lock()
+
+    __loop: 'asyncio.AbstractEventLoop'
+    __executor: 'ThreadPoolExecutor'
+    __polled_controllers: 'List[ControllerProcess]'
+
+    def __new__(cls) -> 'ControllerHost':
+
+        with cls.__instance_lock:
+            if cls.__instance is None:
+                host = super().__new__(cls)
+                host.__loop = asyncio.new_event_loop()
+                host.__executor = ThreadPoolExecutor(
+                    max_workers=COMMAND_THREADS,
+                    thread_name_prefix='controller-commands')
+                host.__polled_controllers = []
+                Thread(target=host.__run, daemon=True,
+                       name='controller-host').start()
+                cls.__instance = host
+
+        return cls.__instance
+
+    def __run(self) -> None:
+        asyncio.set_event_loop(self.__loop)
+        self.__loop.run_forever()
+
+    async def __connect(self, controller: 'ControllerProcess') -> None:
+        await controller.connect()
+        self.__watchExit(controller)
+
+    def __watchExit(self, controller: 'ControllerProcess') -> None:
+
+        process = controller.process
+
+        # Process file descriptors need Python 3.9 and Linux 5.3
+        pidfd_open = getattr(os, 'pidfd_open', None)
+        pidfd = None
+        if pidfd_open is not None:
+            try:
+                pidfd = pidfd_open(process.pid)
+            except OSError:
+                pass
+
+        if pidfd is None:
+            # No thread waits for the processes, the loop checks them
+            self.__polled_controllers.append(controller)
+            if len(self.__polled_controllers) == 1:
+                self.__loop.call_later(EXIT_POLL_INTERVAL, self.__pollExits)
+            return
+
+        def onExit() -> None:
+            self.__loop.remove_reader(pidfd)
+            os.close(pidfd)
+            process.wait()
+            controller.exited()
+
+        # The descriptor becomes readable when the process exits
+        self.__loop.add_reader(pidfd, onExit)
+
+    def __pollExits(self) -> None:
+
+        running = []
+        for controller in self.__polled_controllers:
+            if controller.process.poll() is None:
+                running.append(controller)
+            else:
+                controller.exited()
+
+        self.__polled_controllers = running
+        if running:
+            self.__loop.call_later(EXIT_POLL_INTERVAL, self.__pollExits)
+
+    def start(self, program_path: str, ship: 'Structure', json_info: str,
+              debug_queue: 'SimpleQueue', lock: 'PartLock',
+              tick_barrier: 'TickBarrier' = None) -> 'ControllerProcess':
+        """Start a controller.
+
+        Args:
+            program_path: Path of the program of the controller.
+            ship: Ship controlled.
+            json_info: Information sent to the controller as its argument.
+            debug_queue: Queue where the debug messages are put.
+            lock: Lock held while the commands are answered.
+            tick_barrier: Barrier of the simulation in lockstep mode, the
+                controller is registered as a participant.
+
+        Returns:
+            The controller, which is already running.
+        """
+
+        process = Popen([program_path, json_info], stdin=PIPE, stdout=PIPE,
+                        stderr=PIPE)
+
+        # The process is the participant, not the ship, so a controller that is
+        # being stopped does not unregister the one that replaces it
+        if tick_barrier is not None:
+            tick_barrier.register(process)
+
+        controller = ControllerProcess(self.__loop, self.__executor, process,
+                                       ship, debug_queue, lock, tick_barrier)
+        asyncio.run_coroutine_threadsafe(self.__connect(controller),
+                                         self.__loop).result()
+
+        return controller
@@ -1,9 +1,14 @@
 
+import copy
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING
 
+from .. import configfilevariables
+
 if TYPE_CHECKING:
-    from typing import Any, MutableMapping, Iterable
+    from typing import (
+        Any, Callable, Dict, Mapping, MutableMapping, Iterable, Optional
+    )
 
 class CustomLoader(ABC):
 
@@ -15,6 +20,48 @@ class CustomLoader(ABC):
     def clearCustoms(self) -> None:
         self._load_functions = self.__create_functions_base.copy()
 
+    def getCustoms(self) -> 'Dict[Any, Callable]':
+        """Get the functions of the models added with `addCustom`.
+
+        The functions do not depend on the loader, so they can be given to
+        other loaders with `addCustoms` instead of adding every model again.
+
+        Returns:
+            A dictionary with the model types and their functions.
+        """
+
+        return {model_type: function
+                for model_type, function in self._load_functions.items()
+                if model_type not in self.__create_functions_base}
+
+    def addCustoms(self, customs: 'Dict[Any, Callable]') -> None:
+        self._load_functions.update(customs)
+
+    @staticmethod
+    def copyModel(model: 'MutableMapping[str, Any]',
+                  variables: 'Optional[Mapping[str, Any]]' = None) \
+            -> 'MutableMapping[str, Any]':
+        """Get a copy of a custom model that can be modified.
+
+        The functions of the models are shared by every loader, see
+        `getCustoms`, so they never modify the model itself.
+
+        Args:
+            model: The content of the model.
+            variables: If given, they are substituted in the copy.
+
+        Returns:
+            The copy.
+        """
+
+        model = copy.deepcopy(model)
+
+        if variables is not None:
+            configfilevariables.subVariables(model, variables=dict(variables),
+                                             enabled=True)
+
+        return model
+
     def _getTypes(self, config: 'MutableMapping[str, Any]') -> 'Iterable[Any]': # pylint: disable=no-self-use
         return (config.get('type'),)
 
@@ -2,10 +2,12 @@
 import functools
 from typing import TYPE_CHECKING
 
+import numpy
+
 from .customloader import CustomLoader
 from .errorloader import loadError
 
-from .. import configfilevariables
+from ...utils.errorgenerator import createRandomGenerator
 
 from ...devices.device import DeviceGroup
 from ...devices.structure import StructuralPart
@@ -33,10 +35,24 @@ if TYPE_CHECKING:
     # pylint: enable=ungrouped-imports
 
 class DeviceLoader(CustomLoader):
+    """Loader of the devices of a ship.
+
+    Each error generator created by the loader receives its own random
+    generator, derived from `seed` in the order the errors are loaded.
+
+    Args:
+        seed: Seed of the random generators of the errors, if it is None a
+            fresh entropy source is used.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, seed: 'numpy.random.SeedSequence' = None) -> None:
         super().__init__(self.__DEVICE_CREATE_FUNCTIONS, label='Device')
 
+        if seed is None:
+            seed = numpy.random.SeedSequence()
+
+        self.__seed = seed
+
     def _getTypes(self, config: 'MutableMapping[str, Any]') -> 'Iterable[Any]': # pylint: disable=no-self-use
 
         function_type = config.get('function_type')
@@ -73,6 +89,8 @@ class DeviceLoader(CustomLoader):
             **kwargs: 'Any') \
                 -> 'Tuple[Device, Sequence[QWidget]]':
 
+        custom_device_info = CustomLoader.copyModel(custom_device_info)
+
         return loader.load(custom_device_info.get('function_type'),
                            custom_device_info, part, **kwargs)
 
@@ -87,9 +105,8 @@ class DeviceLoader(CustomLoader):
         variables = {variable['id']: variable['value'] for variable in
                      info.get('Variable', ())}
 
-        configfilevariables.subVariables(custom_device_info,
-                                         variables=variables,
-                                         enabled=True)
+        custom_device_info = CustomLoader.copyModel(custom_device_info,
+                                                    variables)
 
         return loader.load(custom_device_info.get('function_type'),
                            custom_device_info, part, **kwargs)
@@ -115,12 +132,13 @@ class DeviceLoader(CustomLoader):
 
         return device, widgets
 
-    def __loadErrorMutableMapping( # pylint: disable=no-self-use
+    def __loadErrorMutableMapping(
             self, errors: 'MutableMapping[str, MutableMapping[str, Any]]') \
                 -> 'MutableMapping[str, ErrorGenerator]':
 
-        return {name: loadError(info) for name, info in errors.items()
-                if not name.startswith('__')}
+        return {name: loadError(
+                    info, rng=createRandomGenerator(self.__seed.spawn(1)[0]))
+                for name, info in errors.items() if not name.startswith('__')}
 
     def __getErrorKwargs(
             self, content: 'MutableMapping[str, MutableMapping[str, Any]]',
@@ -5,18 +5,21 @@ from typing import TYPE_CHECKING
 from ...utils.errorgenerator import (
     ErrorGenerator, NormalDistributionErrorGenerator,
     TriangularDistributionErrorGenerator,
-    UniformDistributionErrorGenerator
+    UniformDistributionErrorGenerator, createRandomGenerator
 )
 
 from .customloader import CustomLoader
 
 if TYPE_CHECKING:
-    from typing import Any, MutableMapping, Sequence
+    # pylint: disable=ungrouped-imports
+    from typing import Any, MutableMapping
+    from numpy.random import Generator
+    # pylint: enable=ungrouped-imports
 
-def loadError(info: 'Sequence[MutableMapping[str, Any]]') \
-        -> 'Sequence[Objective]':
+def loadError(info: 'MutableMapping[str, Any]',
+              rng: 'Generator' = None) -> 'ErrorGenerator':
 
-    return ErrorLoader().load(info)
+    return ErrorLoader().load(info, rng=rng)
 
 class ErrorLoader(CustomLoader):
 
@@ -49,11 +52,15 @@ class ErrorLoader(CustomLoader):
 
         raise NotImplementedError()
 
-    def load(self, info: 'MutableMapping[str, Any]') -> ErrorGenerator:
+    def load(self, info: 'MutableMapping[str, Any]',
+             rng: 'Generator' = None) -> ErrorGenerator:
 
         create_functions = self._load_functions
 
-        return create_functions[info.get('type')](self, info)
+        if rng is None:
+            rng = createRandomGenerator()
+
+        return create_functions[info.get('type')](self, info, rng)
 
     @staticmethod
     def __loadNumber(info: 'MutableMapping[str, Any]', field: str,
@@ -79,8 +86,8 @@ class ErrorLoader(CustomLoader):
 
         return value
 
-    def __loadLinearError(self,
-                          info: 'MutableMapping[str, Any]') -> ErrorGenerator:
+    def __loadLinearError(self, info: 'MutableMapping[str, Any]',
+                          rng: 'Generator') -> ErrorGenerator:
 
         error_max = self.__loadNumber(info, 'error_max')
         offset_max = self.__loadNumber(info, 'offset_max')
@@ -89,10 +96,11 @@ class ErrorLoader(CustomLoader):
 
         return UniformDistributionErrorGenerator(
             error_max=error_max, offset_max=offset_max,
-            error_max_minfac=error_max_minfac)
+            error_max_minfac=error_max_minfac, rng=rng)
 
     def __loadTriangularError(
-            self, info: 'MutableMapping[str, Any]') -> ErrorGenerator:
+            self, info: 'MutableMapping[str, Any]',
+            rng: 'Generator') -> ErrorGenerator:
 
         error_max = self.__loadNumber(info, 'error_max')
         left_error_max = self.__loadNumber(info, 'left_error_max',
@@ -105,10 +113,11 @@ class ErrorLoader(CustomLoader):
 
         return TriangularDistributionErrorGenerator(
             left_error_max=left_error_max, right_error_max=right_error_max,
-            offset_max=offset_max, error_max_minfac=error_max_minfac)
+            offset_max=offset_max, error_max_minfac=error_max_minfac, rng=rng)
 
     def __loadNormalError(
-            self, info: 'MutableMapping[str, Any]') -> ErrorGenerator:
+            self, info: 'MutableMapping[str, Any]',
+            rng: 'Generator') -> ErrorGenerator:
 
         sigma = self.__loadNumber(info, 'sigma')
         offset_sigma = self.__loadNumber(info, 'offset_sigma')
@@ -117,7 +126,7 @@ class ErrorLoader(CustomLoader):
 
         return NormalDistributionErrorGenerator(
             error_sigma=sigma, offset_sigma=offset_sigma,
-            sigma_minfac=error_max_minfac)
+            sigma_minfac=error_max_minfac, rng=rng)
 
     __CREATE_FUNCTIONS = {
 
@@ -4,8 +4,6 @@ from typing import TYPE_CHECKING
 
 from .customloader import CustomLoader
 
-from .. import configfilevariables
-
 from ...objectives.objective import ObjectiveGroup
 from ...objectives.gotoobjective import GoToObjective
 from ...objectives.timedobjective import TimedObjectiveGroup
@@ -43,20 +41,20 @@ class ObjectiveLoader(CustomLoader):
             loader: 'ObjectiveLoader',
             _custom_objective_info: 'MutableMapping[str, Any]') -> 'Objective':
 
-        return loader.__createObjectiveGroup(objective_content) # pylint: disable=protected-access
+        return loader.__createObjectiveGroup( # pylint: disable=protected-access
+            CustomLoader.copyModel(objective_content))
 
     @staticmethod
     def __createCustomDynamicObjectiveFunction(
             objective_content: 'MutableMapping[str, Any]',
             loader: 'ObjectiveLoader',
-            _custom_objective_info: 'MutableMapping[str, Any]') -> 'Objective':
+            custom_objective_info: 'MutableMapping[str, Any]') -> 'Objective':
 
         variables = {variable['id']: variable['value'] for variable in
                      custom_objective_info.get('Variable', ())}
 
-        configfilevariables.subVariables(objective_content,
-                                         variables=variables,
-                                         enabled=True)
+        objective_content = CustomLoader.copyModel(objective_content,
+                                                   variables)
 
         return loader.__createObjectiveGroup(objective_content) # pylint: disable=protected-access
 
@@ -23,7 +23,8 @@ ShipInfo = namedtuple('ShipInfo', (
 
 PhysicsEngineInfo = namedtuple('PhysicsEngineInfo',
                                ('damping', 'gravity', 'collision_slop',
-                                'collision_persistence', 'iterations'))
+                                'collision_persistence', 'iterations',
+                                'timestep', 'substeps', 'adaptive'))
 
 BackgroundInfo = namedtuple('BackgroundInfo', ('image'))
 ForegroundInfo = namedtuple('ForegroundInfo', ('image'))
@@ -110,11 +111,21 @@ class ScenarioLoader:
         else:
             gravity = (0, 0)
 
+        timestep = engine_info.get('timestep', 0.02)
+        if timestep <= 0:
+            raise ValueError('PhysicsEngine timestep must be positive')
+
+        substeps = engine_info.get('substeps', 1)
+        if not isinstance(substeps, int) or substeps < 1:
+            raise ValueError('PhysicsEngine substeps must be a positive integer')
+
         return PhysicsEngineInfo(engine_info.get('damping', 1),
                                  gravity,
                                  engine_info.get('collision_slop', 0.1),
                                  engine_info.get('collision_persistence', 3),
-                                 engine_info.get('iterations', 10))
+                                 engine_info.get('iterations', 10),
+                                 timestep, substeps,
+                                 engine_info.get('adaptive', False))
 
     @staticmethod
     def __loadBackground(background_info: 'MutableMapping[str, Any]') \
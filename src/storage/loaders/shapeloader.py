@@ -7,8 +7,6 @@ from pymunk import Shape, Circle, Poly, Segment
 
 from .customloader import CustomLoader
 
-from .. import configfilevariables
-
 if TYPE_CHECKING:
     from typing import Any, Dict, Sequence, Tuple
     import pymunk
@@ -42,7 +40,7 @@ class ShapeLoader(CustomLoader):
             default_elasticity: float = None,
             default_friction: float = None):
 
-        return loader.load((shape_content,),
+        return loader.load((CustomLoader.copyModel(shape_content),),
                            default_elasticity=default_elasticity,
                            default_friction=default_friction)
 
@@ -56,11 +54,7 @@ class ShapeLoader(CustomLoader):
         variables = {variable['id']: variable['value'] for variable in
                      shape_content.get('Variable', ())}
 
-        configfilevariables.subVariables(shape_content,
-                                         variables=variables,
-                                         enabled=True)
-
-        return loader.load((shape_content,),
+        return loader.load((CustomLoader.copyModel(shape_content, variables),),
                            default_elasticity=default_elasticity,
                            default_friction=default_friction)
 
@@ -89,6 +89,8 @@ class ShipLoader:
             widgets.extend(
                 self.__addDevice(info, parts, 'InterfaceDevice'))
 
+        ship.buildDeviceIndex()
+
         return ShipInfo(device=ship, images=loadImages(
             ship_info.get('Image', ()), prefixes=prefixes), widgets=widgets)
 
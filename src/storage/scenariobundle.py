@@ -0,0 +1,161 @@
+"""Class used to store a scenario with everything needed to load it.
+
+A bundle has the content of the scenario and of every ship and object model it
+uses, already merged with their parents and with the variables substituted,
+and the custom shape, device and objective models, so a scenario can be
+loaded from a single file, without reading the model library. Controllers and
+images are still referenced by name.
+"""
+
+import pickle
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # pylint: disable=ungrouped-imports
+    from typing import (
+        Any, Callable, Dict, List, MutableMapping, Optional, Tuple, Union
+    )
+    from pathlib import Path
+    # pylint: enable=ungrouped-imports
+
+BUNDLE_FORMAT = 'spaceshipcontrol-bundle'
+BUNDLE_VERSION = 1
+BUNDLE_SUFFIX = '.sscbundle'
+
+class ScenarioBundle:
+    """Content of a scenario and of the models it uses.
+
+    A new bundle collects the content that `FileInfo` reads while the scenario
+    is loaded and can then be saved, a bundle read with `load` is read only and
+    `FileInfo` takes the content from it instead of the files.
+
+    The content is stored pickled, so each use gets its own copy that can be
+    modified by the loaders.
+
+    Args:
+        scenario: Name of the scenario.
+        variables: Values that override the variables of the files, in the
+            format expected by `Simulation.loadScenario`.
+    """
+
+    def __init__(self, scenario: str,
+                 variables: 'Dict[str, Dict[str, Any]]' = None) -> None:
+
+        self.__scenario = scenario
+        self.__variables = variables
+        self.__read_only = False
+
+        self.__content: 'Dict[Tuple[str, ...], Optional[bytes]]' = {}
+        self.__custom_models: 'Dict[str, List[bytes]]' = {}
+
+        # Functions of the custom models created by the loaders, they are not
+        # saved
+        self.__custom_functions: 'Dict[str, Dict[Any, Callable]]' = {}
+
+    @property
+    def scenario(self) -> str:
+        return self.__scenario
+
+    @property
+    def variables(self) -> 'Optional[Dict[str, Dict[str, Any]]]':
+        return self.__variables
+
+    @property
+    def read_only(self) -> bool:
+        return self.__read_only
+
+    def addContent(self, key: 'Tuple[str, ...]',
+                   content: 'Optional[MutableMapping[str, Any]]') -> None:
+
+        self.__content[key] = None if content is None else pickle.dumps(
+            content, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def getContent(self, key: 'Tuple[str, ...]') \
+            -> 'Optional[MutableMapping[str, Any]]':
+        """Get a copy of content added with `addContent`.
+
+        Args:
+            key: Key of the content.
+
+        Returns:
+            The content.
+
+        Raises:
+            KeyError: If the bundle does not have the content.
+        """
+
+        try:
+            content = self.__content[key]
+        except KeyError:
+            raise KeyError(f'Bundle of the scenario \'{self.__scenario}\' does '
+                           f'not have \'{"/".join(key[1:])}\'') from None
+
+        return None if content is None else pickle.loads(content)
+
+    def setCustomModels(self, model_type: str,
+                        models: 'List[bytes]') -> None:
+        """Set the custom models of a type.
+
+        Args:
+            model_type: Type of the models, the name of the file data type.
+            models: Content of each model, pickled.
+        """
+        self.__custom_models[model_type] = models
+
+    def getCustomModels(self, model_type: str) \
+            -> 'List[MutableMapping[str, Any]]':
+        return [pickle.loads(model)
+                for model in self.__custom_models.get(model_type, ())]
+
+    def getCustomFunctions(self, model_type: str) \
+            -> 'Optional[Dict[Any, Callable]]':
+        return self.__custom_functions.get(model_type)
+
+    def setCustomFunctions(self, model_type: str,
+                           functions: 'Dict[Any, Callable]') -> None:
+        self.__custom_functions[model_type] = functions
+
+    def save(self, path: 'Union[str, Path]') -> None:
+
+        data = {
+            'scenario': self.__scenario,
+            'variables': self.__variables,
+            'content': self.__content,
+            'custom-models': self.__custom_models
+        }
+
+        with open(path, 'wb') as file:
+            pickle.dump((BUNDLE_FORMAT, BUNDLE_VERSION, data), file,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(path: 'Union[str, Path]') -> 'ScenarioBundle':
+        """Read a bundle saved with `save`.
+
+        Args:
+            path: Path to the file.
+
+        Returns:
+            A read only bundle.
+        """
+
+        with open(path, 'rb') as file:
+            try:
+                bundle_format, version, data = pickle.load(file)
+            except Exception as err:
+                raise ValueError(f'\'{path}\' is not a scenario bundle') \
+                    from err
+
+        if bundle_format != BUNDLE_FORMAT:
+            raise ValueError(f'\'{path}\' is not a scenario bundle')
+
+        if version != BUNDLE_VERSION:
+            raise ValueError(f'Unsupported scenario bundle version '
+                             f'\'{version}\'')
+
+        bundle = ScenarioBundle(data['scenario'], data['variables'])
+        bundle.__content = data['content'] # pylint: disable=protected-access
+        bundle.__custom_models = data['custom-models'] # pylint: disable=protected-access
+        bundle.__read_only = True # pylint: disable=protected-access
+
+        return bundle
@@ -3,7 +3,7 @@ from threading import Lock
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from typing import List, Callable, Any
+    from typing import List, Callable, Any, Sequence
 
 class Action:
 
@@ -22,7 +22,19 @@ class ActionQueue:
         with self.__lock:
             self.__list.append(action)
 
-    def processItems(self) -> None:
+    def takeItems(self) -> 'Sequence[Action]':
+        """Remove every action from the queue.
+
+        Returns:
+            The actions that were in the queue, in the order they were added.
+        """
+
         with self.__lock:
-            for action in self.__list:
-                action.function(*action.args)
+            actions = self.__list
+            self.__list = []
+
+        return actions
+
+    def processItems(self) -> None:
+        for action in self.takeItems():
+            action.function(*action.args)
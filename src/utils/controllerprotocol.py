@@ -0,0 +1,261 @@
+"""Binary protocol used to communicate with the controllers.
+
+Controllers start with the line protocol, one command per line and one answer
+per line, and can switch to the binary protocol by sending the line
+'protocol 2', which is answered with '2' by hosts that support it. After that
+every message is a frame:
+
+    request:  <uint32 size> <uint32 request id> <uint8 opcode> <payload>
+    response: <uint32 size> <uint32 request id> <value>
+
+Where the size is the amount of bytes after the header and every number is
+little-endian. A value is a tag byte followed by its data:
+
+    VALUE_NONE                      no data
+    VALUE_BOOL                      uint8
+    VALUE_INT                       int64
+    VALUE_FLOAT                     float64
+    VALUE_TEXT                      uint32 size, utf-8 text
+    VALUE_LIST                      uint32 count, values
+
+The opcodes are:
+
+    OPCODE_TEXT         payload is a command of the line protocol, including
+                        the ':' separated path of the device
+    OPCODE_RESOLVE      payload is a device path, as the prefix of the line
+                        protocol ('' for the ship, '0:', 'sensors:x:'), the
+                        answer is the handle of the device, the same given by
+                        the command 'open', or None
+    OPCODE_HANDLE       payload is a uint32 handle followed by a command for
+                        that device
+    OPCODE_BATCH        payload is a uint32 count followed by that amount of
+                        uint32 handle, uint32 size, command, the answer is a
+                        list with the answer of each command
+    OPCODE_END_TICK     same as the 'end-tick' command, the answer is the tick
+    OPCODE_WAIT_TICKS   same as the 'wait-next-tick' command, payload is an
+                        optional uint32 amount of ticks, the answer is the tick
+
+The answers of the commands are the values returned by the devices, so numbers
+are not converted to text.
+
+The simulation also sends messages that are not answers, the readings of the
+sensors a controller subscribed to with the command 'subscribe' of the ship,
+once per tick after the step. In the binary protocol they are response frames
+with `PUSH_REQUEST_ID` as request id whose value is a list with the tick
+followed by the handle and the reading of each sensor. In the line protocol
+they are lines that start with `PUSH_LINE_PREFIX`, a control character that no
+answer has, followed by the tick and a '<handle>=<reading>' for each sensor,
+separated by spaces.
+"""
+
+import struct
+from asyncio import IncompleteReadError
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # pylint: disable=ungrouped-imports
+    from typing import Any, List, Optional, Tuple
+    from asyncio import StreamReader
+    # pylint: enable=ungrouped-imports
+
+PROTOCOL_VERSION = 2
+PROTOCOL_REQUEST = f'protocol {PROTOCOL_VERSION}'
+
+WAIT_TICKS_COMMAND = 'wait-next-tick'
+
+OPCODE_TEXT = 0
+OPCODE_RESOLVE = 1
+OPCODE_HANDLE = 2
+OPCODE_BATCH = 3
+OPCODE_END_TICK = 4
+OPCODE_WAIT_TICKS = 5
+
+VALUE_NONE = 0
+VALUE_BOOL = 1
+VALUE_INT = 2
+VALUE_FLOAT = 3
+VALUE_TEXT = 4
+VALUE_LIST = 5
+
+# Controllers never use this id for their requests
+PUSH_REQUEST_ID = 0
+PUSH_LINE_PREFIX = '\x1e'
+
+# Maximum size of the payload of a request, the same as the maximum length of
+# a line of the line protocol
+MAX_REQUEST_SIZE = 2**24
+
+REQUEST_HEADER = struct.Struct('<IIB')
+RESPONSE_HEADER = struct.Struct('<II')
+
+_UINT32 = struct.Struct('<I')
+_HANDLE_COMMAND = struct.Struct('<II')
+_TAGGED_BOOL = struct.Struct('<BB')
+_TAGGED_INT = struct.Struct('<Bq')
+_TAGGED_FLOAT = struct.Struct('<Bd')
+_TAGGED_SIZE = struct.Struct('<BI')
+
+_INT_MIN = -2**63
+_INT_MAX = 2**63 - 1
+
+async def readRequest(reader: 'StreamReader') \
+        -> 'Optional[Tuple[int, int, bytes]]':
+    """Read a request frame.
+
+    Args:
+        reader: Stream written by the controller.
+
+    Returns:
+        The request id, the opcode and the payload or None if the stream was
+        closed.
+
+    Raises:
+        ValueError: If the payload is larger than `MAX_REQUEST_SIZE`, the
+            stream can not be read anymore.
+    """
+
+    try:
+        header = await reader.readexactly(REQUEST_HEADER.size)
+        size, request_id, opcode = REQUEST_HEADER.unpack(header)
+
+        if size > MAX_REQUEST_SIZE:
+            raise ValueError(f'Request of {size} bytes, the maximum is '
+                             f'{MAX_REQUEST_SIZE}')
+
+        payload = await reader.readexactly(size) if size else b''
+    except IncompleteReadError:
+        return None
+
+    return request_id, opcode, payload
+
+def encodeValue(value: 'Any', buffer: bytearray) -> None:
+    """Append a value to a buffer.
+
+    Values that are not None, a bool, an int, a float or a list or tuple are
+    sent as the text returned by `str`, the same as in the line protocol.
+
+    Args:
+        value: The value.
+        buffer: Buffer where the value is appended.
+    """
+
+    if value is None:
+        buffer.append(VALUE_NONE)
+    elif isinstance(value, bool):
+        buffer += _TAGGED_BOOL.pack(VALUE_BOOL, value)
+    elif isinstance(value, int) and _INT_MIN <= value <= _INT_MAX:
+        buffer += _TAGGED_INT.pack(VALUE_INT, value)
+    elif isinstance(value, float):
+        buffer += _TAGGED_FLOAT.pack(VALUE_FLOAT, value)
+    elif isinstance(value, (list, tuple)):
+        buffer += _TAGGED_SIZE.pack(VALUE_LIST, len(value))
+        for item in value:
+            encodeValue(item, buffer)
+    else:
+        text = str(value).encode()
+        buffer += _TAGGED_SIZE.pack(VALUE_TEXT, len(text))
+        buffer += text
+
+def encodeResponse(request_id: int, value: 'Any') -> bytearray:
+    """Create a response frame.
+
+    Args:
+        request_id: Id of the request that is answered.
+        value: Value of the answer.
+
+    Returns:
+        The frame.
+    """
+
+    buffer = bytearray(RESPONSE_HEADER.size)
+    encodeValue(value, buffer)
+    RESPONSE_HEADER.pack_into(buffer, 0, len(buffer) - RESPONSE_HEADER.size,
+                              request_id)
+
+    return buffer
+
+def encodePush(tick: int, readings: 'List[Tuple[int, float]]') -> bytearray:
+    """Create the frame with the readings of the subscribed sensors.
+
+    Args:
+        tick: Tick of the readings.
+        readings: Handle and reading of each sensor.
+
+    Returns:
+        The frame.
+    """
+
+    value: 'List[Any]' = [tick]
+    for handle, reading in readings:
+        value.append(handle)
+        value.append(reading)
+
+    return encodeResponse(PUSH_REQUEST_ID, value)
+
+def formatPushLine(tick: int, readings: 'List[Tuple[int, float]]') -> str:
+    """Create the line with the readings of the subscribed sensors, without
+    the line break."""
+
+    return f'{PUSH_LINE_PREFIX}{tick} ' + ' '.join(
+        f'{handle}={reading}' for handle, reading in readings)
+
+def decodeHandleCommand(payload: bytes) -> 'Tuple[int, str]':
+    handle, = _UINT32.unpack_from(payload)
+    return handle, payload[_UINT32.size:].decode()
+
+def decodeBatch(payload: bytes) -> 'List[Tuple[int, str]]':
+    """Decode the payload of a `OPCODE_BATCH` request.
+
+    Returns:
+        The handle and the command of each request of the batch.
+    """
+
+    count, = _UINT32.unpack_from(payload)
+    offset = _UINT32.size
+
+    requests = []
+    for _ in range(count):
+        handle, size = _HANDLE_COMMAND.unpack_from(payload, offset)
+        offset += _HANDLE_COMMAND.size
+        requests.append((handle, payload[offset:offset + size].decode()))
+        offset += size
+
+    return requests
+
+def decodeWaitTicks(payload: bytes) -> 'Optional[int]':
+    """Decode the payload of a `OPCODE_WAIT_TICKS` request.
+
+    Returns:
+        The amount of ticks, None if it is not valid.
+    """
+
+    if not payload:
+        return 1
+
+    if len(payload) != _UINT32.size:
+        return None
+
+    ticks, = _UINT32.unpack(payload)
+    return ticks if ticks >= 1 else None
+
+def parseWaitTicks(command: str) -> 'Optional[int]':
+    """Get the amount of ticks of a command 'wait-next-tick [n]'.
+
+    Returns:
+        The amount of ticks, None if it is not a valid 'wait-next-tick'
+        command.
+    """
+
+    words = command.split()
+    if not words or words[0] != WAIT_TICKS_COMMAND or len(words) > 2:
+        return None
+
+    if len(words) == 1:
+        return 1
+
+    try:
+        ticks = int(words[1])
+    except ValueError:
+        return None
+
+    return ticks if ticks >= 1 else None
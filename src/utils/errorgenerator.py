@@ -1,18 +1,103 @@
-
 from abc import ABC, abstractmethod
-import random
+from typing import TYPE_CHECKING
 
 import numpy
 
+if TYPE_CHECKING:
+    # pylint: disable=ungrouped-imports
+    from typing import Any, Callable, List, Optional, Tuple
+    from numpy.random import Generator, SeedSequence
+    # pylint: enable=ungrouped-imports
+
+NOISE_BLOCK_SIZE = 4096
+
+def createRandomGenerator(seed: 'SeedSequence' = None) -> 'Generator':
+    """Create an independent random number generator.
+
+    Args:
+        seed: Seed sequence used to initialize the generator, if it is None a
+            fresh entropy source is used.
+
+    Returns:
+        The generator.
+    """
+    return numpy.random.default_rng(seed)
+
+class NoiseBuffer:
+    """Source of random samples that draws them in blocks.
+
+    Drawing one sample at a time from numpy is dominated by the overhead of
+    each call, so the samples are drawn `block_size` at a time and consumed
+    one by one until the block is exhausted.
+
+    Args:
+        draw: Function that receives the amount of samples and returns an
+            array with them.
+        block_size: Amount of samples drawn at once.
+    """
+
+    def __init__(self, draw: 'Callable[[int], numpy.ndarray]',
+                 block_size: int = NOISE_BLOCK_SIZE) -> None:
+
+        self.__draw = draw
+        self.__block_size = block_size
+        self.__samples: 'List[float]' = []
+        self.__index = 0
+
+    def __call__(self) -> float:
+
+        if self.__index >= len(self.__samples):
+            # tolist converts the block to python floats, indexing a list is
+            # much faster than indexing an array
+            self.__samples = self.__draw(self.__block_size).tolist()
+            self.__index = 0
+
+        value = self.__samples[self.__index]
+        self.__index += 1
+
+        return value
+
+    def getState(self) -> 'Tuple[List[float], int]':
+        # The list of samples is replaced, never modified, so it can be shared
+        return self.__samples, self.__index
+
+    def setState(self, state: 'Tuple[List[float], int]') -> None:
+        self.__samples, self.__index = state
+
 class ErrorGenerator(ABC):
 
-    def __init__(self, offset: float) -> None:
+    def __init__(self, offset: float, rng: 'Generator' = None) -> None:
         self.__offset = offset
+        self.__rng = createRandomGenerator() if rng is None else rng
+        self._noise: 'Optional[NoiseBuffer]' = None
 
     @property
     def offset(self):
         return self.__offset
 
+    @property
+    def rng(self) -> 'Generator':
+        return self.__rng
+
+    def getState(self) -> 'Tuple[Any, ...]':
+        """Get the state of the random generator and of the drawn noise.
+
+        Returns:
+            A value that can be given to `setState` to draw the same noise
+            again from this moment.
+        """
+
+        return (self.__rng.bit_generator.state,
+                None if self._noise is None else self._noise.getState())
+
+    def setState(self, state: 'Tuple[Any, ...]') -> None:
+
+        rng_state, noise_state = state
+
+        self.__rng.bit_generator.state = rng_state
+        if self._noise is not None:
+            self._noise.setState(noise_state)
+
     @abstractmethod
     def _applyValError(self, val: float) -> float:
         pass
@@ -37,17 +122,22 @@ class UniformDistributionErrorGenerator(ErrorGenerator):
                  error_max: float,
                  offset_max: float,
                  error_max_minfac: float = 1,
-                 offset=None) -> None:
-        super().__init__(self._getRandom(offset_max))
+                 offset=None,
+                 rng: 'Generator' = None) -> None:
+
+        rng = createRandomGenerator() if rng is None else rng
+        super().__init__((2*rng.random() - 1)*offset_max, rng=rng)
 
         self.__offset_max = offset_max
 
         self.__error_max_before = error_max
 
         error_max *= self._calculateDecreaseFactor(
-            error_max_minfac, random.random)
+            error_max_minfac, rng.random)
 
         self.__error_max = error_max
+        self._noise = NoiseBuffer(
+            lambda size: rng.uniform(-error_max, error_max, size))
 
     @property
     def max_offset(self) -> float:
@@ -57,15 +147,12 @@ class UniformDistributionErrorGenerator(ErrorGenerator):
     def max_error(self) -> float:
         return self.__error_max_before
 
-    def _getRandom(self, value: float) -> float:
-        return (2*random.random() - 1)*value
-
     def _applyValError(self, val: float) -> float:
 
         if self.__error_max == 0:
             return 0
 
-        return self._getRandom(self.__error_max)
+        return self._noise()
 
     def toDict(self):
         return {
@@ -79,26 +166,28 @@ class NormalDistributionErrorGenerator(ErrorGenerator):
     def __init__(self,
                  error_sigma: float,
                  offset_sigma: float,
-                 sigma_minfac: float = 1) -> None:
-        super().__init__(self._getRandom(offset_sigma))
+                 sigma_minfac: float = 1,
+                 rng: 'Generator' = None) -> None:
+
+        rng = createRandomGenerator() if rng is None else rng
+        super().__init__(rng.normal(0, offset_sigma), rng=rng)
 
         self.__base_error_sigma = error_sigma
 
         error_sigma *= self._calculateDecreaseFactor(
-            sigma_minfac, random.random)
+            sigma_minfac, rng.random)
 
         self.__error_sigma = error_sigma
         self.__offset_sigma = offset_sigma
-
-    def _getRandom(self, sigma: float) -> float:
-        return numpy.random.normal(0, sigma)
+        self._noise = NoiseBuffer(
+            lambda size: rng.normal(0, error_sigma, size))
 
     def _applyValError(self, val: float) -> float:
 
         if self.__error_sigma == 0:
             return 0
 
-        return self._getRandom(self.__error_sigma)
+        return self._noise()
 
     def toDict(self):
         return {
@@ -113,8 +202,12 @@ class TriangularDistributionErrorGenerator(ErrorGenerator):
                  left_error_max: float,
                  right_error_max: float,
                  offset_max: float,
-                 error_max_minfac: float = 1) -> None:
-        super().__init__(self._getRandom(offset_max, offset_max))
+                 error_max_minfac: float = 1,
+                 rng: 'Generator' = None) -> None:
+
+        rng = createRandomGenerator() if rng is None else rng
+        super().__init__(self.__triangular(rng, offset_max, offset_max),
+                         rng=rng)
 
         self.__offset_max = offset_max
 
@@ -122,23 +215,32 @@ class TriangularDistributionErrorGenerator(ErrorGenerator):
         self.__right_error_max_before = right_error_max
 
         left_error_max *= self._calculateDecreaseFactor(
-            error_max_minfac, random.random)
+            error_max_minfac, rng.random)
 
         right_error_max *= self._calculateDecreaseFactor(
-            error_max_minfac, random.random)
+            error_max_minfac, rng.random)
 
         self.__left_error_max = left_error_max
         self.__right_error_max = right_error_max
+        self._noise = NoiseBuffer(
+            lambda size: self.__triangular(rng, left_error_max,
+                                           right_error_max, size))
+
+    @staticmethod
+    def __triangular(rng: 'Generator', left: float, right: float,
+                     size: 'Optional[int]' = None) -> 'numpy.ndarray':
+
+        if left == 0 and right == 0:
+            return numpy.zeros(size) if size is not None else 0
 
-    def _getRandom(self, left: float, right: float) -> float:
-        return numpy.random.triangular(0, -left, 0, +right)
+        return rng.triangular(-left, 0, right, size)
 
     def _applyValError(self, val: float) -> float:
 
         if self.__left_error_max == 0 and self.__right_error_max == 0:
             return 0
 
-        return self._getRandom(self.__left_error_max, self.__right_error_max)
+        return self._noise()
 
     def toDict(self):
         return {
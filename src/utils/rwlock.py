@@ -0,0 +1,110 @@
+"""Locks used to let many threads use different parts of the simulation.
+
+The simulation is protected by a `ReadWriteLock`, the step and anything else
+that changes the whole simulation hold its write side, and each ship has a
+`PartLock`, which holds the read side and a lock of its own, so the commands
+of different ships are handled at the same time but never during a step.
+"""
+
+from threading import Condition, Lock
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # pylint: disable=ungrouped-imports
+    from typing import Any, Callable
+    # pylint: enable=ungrouped-imports
+
+class _LockSide:
+
+    def __init__(self, acquire: 'Callable[[], None]',
+                 release: 'Callable[[], None]') -> None:
+        self.acquire = acquire
+        self.release = release
+
+    def __enter__(self) -> None:
+        self.acquire()
+
+    def __exit__(self, *_args: 'Any') -> None:
+        self.release()
+
+class ReadWriteLock:
+    """Lock that can be held by many readers or by a single writer.
+
+    The writers waiting have preference over the new readers, so a thread
+    that writes, like the one that steps the simulation, is never starved by
+    readers that keep arriving. It is not reentrant.
+
+    The `reader` and `writer` sides can be used as context managers.
+    """
+
+    def __init__(self) -> None:
+
+        self.__condition = Condition(Lock())
+        self.__readers = 0
+        self.__writing = False
+        self.__waiting_writers = 0
+
+        self.reader = _LockSide(self.acquireRead, self.releaseRead)
+        self.writer = _LockSide(self.acquireWrite, self.releaseWrite)
+
+    def acquireRead(self) -> None:
+
+        with self.__condition:
+            while self.__writing or self.__waiting_writers:
+                self.__condition.wait()
+
+            self.__readers += 1
+
+    def releaseRead(self) -> None:
+
+        with self.__condition:
+            self.__readers -= 1
+            if self.__readers == 0:
+                self.__condition.notify_all()
+
+    def acquireWrite(self) -> None:
+
+        with self.__condition:
+            self.__waiting_writers += 1
+            try:
+                while self.__writing or self.__readers:
+                    self.__condition.wait()
+            finally:
+                self.__waiting_writers -= 1
+
+            self.__writing = True
+
+    def releaseWrite(self) -> None:
+
+        with self.__condition:
+            self.__writing = False
+            self.__condition.notify_all()
+
+class PartLock:
+    """Exclusive lock of a part of something protected by a `ReadWriteLock`.
+
+    Holding it means holding the read side of the `ReadWriteLock`, so the
+    different parts can be used at the same time by different threads, but
+    not while the write side is held. It can be used as a context manager.
+
+    Args:
+        rwlock: Lock of the whole.
+    """
+
+    def __init__(self, rwlock: 'ReadWriteLock') -> None:
+        self.__rwlock = rwlock
+        self.__lock = Lock()
+
+    def acquire(self) -> None:
+        self.__rwlock.acquireRead()
+        self.__lock.acquire()
+
+    def release(self) -> None:
+        self.__lock.release()
+        self.__rwlock.releaseRead()
+
+    def __enter__(self) -> None:
+        self.acquire()
+
+    def __exit__(self, *_args: 'Any') -> None:
+        self.release()
@@ -0,0 +1,89 @@
+"""Class used to measure how long the program takes to start.
+
+The program marks the end of each stage of its startup, the report shows the
+time spent in each stage and the packages that were imported during it, so it
+is possible to see which imports make the startup slow.
+"""
+
+import sys
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # pylint: disable=ungrouped-imports
+    from typing import List, Set, Tuple
+    # pylint: enable=ungrouped-imports
+
+class StartupTimer:
+    """Measure the duration of the stages of the startup.
+
+    The first stage starts when the timer is created.
+
+    Args:
+        max_packages: Maximum amount of packages shown for each stage.
+    """
+
+    def __init__(self, max_packages: int = 12) -> None:
+
+        self.__max_packages = max_packages
+
+        self.__start_time = time.perf_counter()
+        self.__last_time = self.__start_time
+        self.__last_packages = self.__importedPackages()
+
+        self.__stages: 'List[Tuple[str, float, List[str]]]' = []
+
+    @staticmethod
+    def __importedPackages() -> 'Set[str]':
+
+        # Modules of the standard library are left out, they are many and
+        # usually fast to import
+        stdlib_names = getattr(sys, 'stdlib_module_names', ())
+
+        return {package for package in (name.partition('.')[0]
+                                        for name in tuple(sys.modules))
+                if package not in stdlib_names}
+
+    def markStage(self, name: str) -> None:
+        """Finish the current stage and start the next one.
+
+        Args:
+            name: Name of the stage that finished.
+        """
+
+        now = time.perf_counter()
+        packages = self.__importedPackages()
+
+        new_packages = sorted(package for package in
+                              packages - self.__last_packages
+                              if not package.startswith('_'))
+
+        self.__stages.append((name, now - self.__last_time, new_packages))
+
+        self.__last_time = now
+        self.__last_packages = packages
+
+    def report(self) -> str:
+        """Create a report of the stages finished until now.
+
+        Returns:
+            A line for each stage with its duration in milliseconds and the
+            packages imported during it, and a line with the total.
+        """
+
+        lines = []
+        for name, duration, packages in self.__stages:
+            line = f'{name:<12} {1000*duration:8.1f} ms'
+
+            if packages:
+                shown = packages[:self.__max_packages]
+                line += '  imported: ' + ', '.join(shown)
+                if len(packages) > len(shown):
+                    line += f' and {len(packages) - len(shown)} more'
+
+            lines.append(line)
+
+        total = self.__last_time - self.__start_time
+        lines.append(f'{"total":<12} {1000*total:8.1f} ms')
+
+        return '\n'.join(lines)
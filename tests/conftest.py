@@ -0,0 +1,56 @@
+"""Fixtures shared by the tests."""
+
+import os
+import sys
+
+import pymunk
+import pytest
+
+from src.devices.engine import LinearEngine
+from src.devices.sensors import AngleSensor, XPositionSensor
+from src.devices.structure import StructuralPart, Structure
+from src.storage.fileinfo import FileInfo
+
+@pytest.fixture(scope='session')
+def qt_application():
+    """Application needed by the widgets of the interface devices."""
+
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+    from PyQt5.QtWidgets import QApplication
+
+    application = QApplication.instance()
+    if application is None:
+        application = QApplication(sys.argv[:1])
+
+    return application
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    """Empty home directory with a new `FileInfo`."""
+
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.setattr(FileInfo, '_FileInfo__instance', None)
+
+    return tmp_path
+
+@pytest.fixture
+def ship():
+    """Ship with a part 'body' that has the sensors 'x' and 'angle' and the
+    engine 'engine', the handles of the part and the devices are 1, 2, 3
+    and 4."""
+
+    space = pymunk.Space()
+    body = pymunk.Body(1, 1)
+    space.add(body)
+
+    ship = Structure('test', space, body)
+
+    part = StructuralPart()
+    ship.addDevice(part, name='body')
+
+    part.addDevice(XPositionSensor(part, 0), name='x')
+    part.addDevice(AngleSensor(part, 0), name='angle')
+    part.addDevice(LinearEngine(part, 0, 1, 0, 0), name='engine')
+
+    return ship
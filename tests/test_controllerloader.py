@@ -0,0 +1,108 @@
+"""Tests of the host of the controller programs."""
+
+import os
+import time
+from queue import Empty, SimpleQueue
+from threading import Thread
+
+import pytest
+
+from src.simulation.tickbarrier import TickBarrier
+from src.storage.loaders import controllerloader
+from src.utils.rwlock import PartLock, ReadWriteLock
+
+@pytest.fixture(params=[True, False], ids=['pidfd', 'polling'])
+def program(request, tmp_path, monkeypatch):
+    """Create a controller program from a shell script, with and without
+    process file descriptors."""
+
+    if not request.param:
+        monkeypatch.delattr(os, 'pidfd_open', raising=False)
+    elif not hasattr(os, 'pidfd_open'):
+        pytest.skip('Process file descriptors are not supported')
+
+    def create(script):
+        path = tmp_path.joinpath(f'controller{len(os.listdir(tmp_path))}')
+        path.write_text(f'#!/bin/sh\n{script}\n')
+        path.chmod(0o755)
+        return str(path)
+
+    return create
+
+def _start(program_path, ship, tick_barrier=None):
+
+    debug_queue = SimpleQueue()
+    controller = controllerloader.loadController(
+        program_path, ship, '{}', debug_queue, PartLock(ReadWriteLock()),
+        tick_barrier=tick_barrier)
+
+    return controller, debug_queue
+
+def _waitFor(condition, timeout=5):
+
+    end = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > end:
+            return False
+        time.sleep(0.01)
+
+    return True
+
+def test_commands_are_answered(program, ship):
+
+    controller, debug_queue = _start(program(
+        'echo "body:engine:set-property intensity 0.5"; read answer\n'
+        'echo "body:engine:get-property intensity"; read answer\n'
+        'echo "answer $answer" >&2'), ship)
+
+    try:
+        assert debug_queue.get(timeout=5) == 'answer 0.5'
+    finally:
+        controller.stop()
+
+def test_stop_many_controllers(program, ship):
+
+    # More controllers than the threads of the host and of the default
+    # executor of the loop
+    path = program('exec sleep 60')
+    controllers = [_start(path, ship)[0] for _ in range(
+        controllerloader.COMMAND_THREADS + 8)]
+
+    def stopAll():
+        for controller in controllers:
+            controller.stop()
+
+    thread = Thread(target=stopAll, daemon=True)
+    thread.start()
+    thread.join(10)
+    assert not thread.is_alive()
+
+    assert _waitFor(lambda: all(controller.process.poll() is not None
+                                for controller in controllers))
+
+def test_exited_controller_is_unregistered(program, ship):
+
+    # The pipes stay open after the exit, the child process keeps them
+    tick_barrier = TickBarrier()
+    controller, _ = _start(program('sleep 2 &\nsleep 0.5\nexit 0'), ship,
+                           tick_barrier=tick_barrier)
+
+    try:
+        assert tick_barrier.isRegistered(controller.process)
+        assert _waitFor(
+            lambda: not tick_barrier.isRegistered(controller.process))
+    finally:
+        controller.stop()
+
+def test_debug_messages_are_forwarded(program, ship):
+
+    controller, debug_queue = _start(program(
+        'echo first >&2; echo second >&2; exec sleep 60'), ship)
+
+    try:
+        assert debug_queue.get(timeout=5) == 'first'
+        assert debug_queue.get(timeout=5) == 'second'
+        with pytest.raises(Empty):
+            debug_queue.get(timeout=0.1)
+    finally:
+        controller.stop()
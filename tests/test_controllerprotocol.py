@@ -0,0 +1,147 @@
+"""Tests of the framing of the binary protocol of the controllers."""
+
+import asyncio
+import struct
+
+import pytest
+
+from src.utils import controllerprotocol
+from src.utils.controllerprotocol import (
+    MAX_REQUEST_SIZE, OPCODE_BATCH, OPCODE_HANDLE, OPCODE_TEXT,
+    PUSH_LINE_PREFIX, PUSH_REQUEST_ID, REQUEST_HEADER, RESPONSE_HEADER,
+    VALUE_BOOL, VALUE_FLOAT, VALUE_INT, VALUE_LIST, VALUE_NONE, VALUE_TEXT
+)
+
+def _decodeValue(data, offset=0):
+
+    tag = data[offset]
+    offset += 1
+
+    if tag == VALUE_NONE:
+        return None, offset
+    if tag == VALUE_BOOL:
+        return bool(data[offset]), offset + 1
+    if tag == VALUE_INT:
+        return struct.unpack_from('<q', data, offset)[0], offset + 8
+    if tag == VALUE_FLOAT:
+        return struct.unpack_from('<d', data, offset)[0], offset + 8
+
+    size, = struct.unpack_from('<I', data, offset)
+    offset += 4
+
+    if tag == VALUE_TEXT:
+        return data[offset:offset + size].decode(), offset + size
+
+    assert tag == VALUE_LIST
+    values = []
+    for _ in range(size):
+        value, offset = _decodeValue(data, offset)
+        values.append(value)
+
+    return values, offset
+
+def _decodeResponse(frame):
+
+    size, request_id = RESPONSE_HEADER.unpack_from(frame)
+    assert size == len(frame) - RESPONSE_HEADER.size
+
+    value, offset = _decodeValue(frame, RESPONSE_HEADER.size)
+    assert offset == len(frame)
+
+    return request_id, value
+
+def _readRequests(data):
+
+    async def read():
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+
+        requests = []
+        while True:
+            request = await controllerprotocol.readRequest(reader)
+            if request is None:
+                return requests
+            requests.append(request)
+
+    return asyncio.run(read())
+
+def _request(request_id, opcode, payload=b''):
+    return REQUEST_HEADER.pack(len(payload), request_id, opcode) + payload
+
+@pytest.mark.parametrize('value', [
+    None, True, False, 0, -5, 2**63 - 1, 1.5, float('inf'), '', 'text ñ',
+    [], [1, 2.5, 'a', None, [True]]
+])
+def test_response_round_trip(value):
+    assert _decodeResponse(controllerprotocol.encodeResponse(7, value)) == \
+        (7, value)
+
+def test_response_of_other_values_is_text():
+
+    assert _decodeResponse(controllerprotocol.encodeResponse(
+        1, 2**70)) == (1, str(2**70))
+    assert _decodeResponse(controllerprotocol.encodeResponse(
+        1, (1, 2))) == (1, [1, 2])
+
+def test_push_frame_and_line():
+
+    readings = [(3, 1.5), (4, -2.0)]
+
+    assert _decodeResponse(controllerprotocol.encodePush(10, readings)) == \
+        (PUSH_REQUEST_ID, [10, 3, 1.5, 4, -2.0])
+    assert controllerprotocol.formatPushLine(10, readings) == \
+        f'{PUSH_LINE_PREFIX}10 3=1.5 4=-2.0'
+
+def test_read_requests():
+
+    data = (_request(1, OPCODE_TEXT, b'0:read') +
+            _request(2, OPCODE_HANDLE, struct.pack('<I', 5) + b'read') +
+            _request(3, OPCODE_TEXT))
+
+    assert _readRequests(data) == [
+        (1, OPCODE_TEXT, b'0:read'),
+        (2, OPCODE_HANDLE, struct.pack('<I', 5) + b'read'),
+        (3, OPCODE_TEXT, b'')
+    ]
+
+    _, _, payload = _readRequests(data)[1]
+    assert controllerprotocol.decodeHandleCommand(payload) == (5, 'read')
+
+def test_truncated_request_ends_the_stream():
+
+    data = _request(1, OPCODE_TEXT, b'0:read')
+    assert _readRequests(data[:-2]) == []
+    assert _readRequests(data[:3]) == []
+
+def test_oversized_request_is_rejected():
+
+    header = REQUEST_HEADER.pack(MAX_REQUEST_SIZE + 1, 1, OPCODE_TEXT)
+    with pytest.raises(ValueError):
+        _readRequests(header)
+
+def test_decode_batch():
+
+    commands = [(1, 'read'), (2, 'set-property intensity 0.5'), (0, '')]
+    payload = struct.pack('<I', len(commands)) + b''.join(
+        struct.pack('<II', handle, len(command)) + command.encode()
+        for handle, command in commands)
+
+    assert _readRequests(_request(4, OPCODE_BATCH, payload)) == \
+        [(4, OPCODE_BATCH, payload)]
+    assert controllerprotocol.decodeBatch(payload) == commands
+
+@pytest.mark.parametrize('payload, ticks', [
+    (b'', 1), (struct.pack('<I', 3), 3), (struct.pack('<I', 0), None),
+    (b'\x01', None)
+])
+def test_decode_wait_ticks(payload, ticks):
+    assert controllerprotocol.decodeWaitTicks(payload) == ticks
+
+@pytest.mark.parametrize('command, ticks', [
+    ('wait-next-tick', 1), ('wait-next-tick 4', 4), ('wait-next-tick 0', None),
+    ('wait-next-tick x', None), ('wait-next-tick 1 2', None),
+    ('wait-next-ticks', None)
+])
+def test_parse_wait_ticks(command, ticks):
+    assert controllerprotocol.parseWaitTicks(command) == ticks
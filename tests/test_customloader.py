@@ -0,0 +1,23 @@
+"""Tests of the base of the loaders of custom models."""
+
+from src.storage.loaders.customloader import CustomLoader
+
+def test_copy_model_does_not_modify_the_model():
+
+    model = {'radius': 'var# size', 'Shape': [{'radius': 'expr# size*2'}]}
+
+    copy = CustomLoader.copyModel(model, {'size': 5})
+
+    assert copy == {'radius': 5, 'Shape': [{'radius': 10}]}
+    assert model == {'radius': 'var# size',
+                     'Shape': [{'radius': 'expr# size*2'}]}
+
+def test_copy_model_without_variables():
+
+    model = {'Shape': [{'radius': 'var# size'}]}
+
+    copy = CustomLoader.copyModel(model)
+    copy['Shape'][0]['radius'] = 1
+
+    assert copy is not model
+    assert model == {'Shape': [{'radius': 'var# size'}]}
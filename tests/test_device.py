@@ -0,0 +1,96 @@
+"""Tests of the command lookup of the devices."""
+
+import shlex
+
+import pytest
+
+from src.devices.device import DefaultDevice, _splitCommand
+from src.devices.sensors import PositionSensor
+
+class _BaseDevice(DefaultDevice):
+
+    def act(self):
+        pass
+
+    __COMMANDS = {
+        'shared': lambda self: 'base',
+        'base-only': lambda self: 'base-only',
+        'fall-through': lambda self: None,
+        'echo': lambda self, *args: ' '.join(args)
+    }
+
+class _SubDevice(_BaseDevice):
+
+    __COMMANDS = {
+        'shared': lambda self: 'sub',
+        'fall-through': lambda self: 'sub',
+        'sub-only': lambda self: 'sub-only',
+        'device-type': lambda self: 'sub-type'
+    }
+
+@pytest.mark.parametrize('command, answer', [
+    ('shared', 'base'),
+    ('base-only', 'base-only'),
+    ('sub-only', 'sub-only'),
+    ('fall-through', 'sub'),
+    ('device-type', 'sub-type'),
+    ('device-desc', 'description'),
+    ('echo a b', 'a b'),
+    ('unknown', 'Invalid command'),
+    ('', 'Invalid command')
+])
+def test_subclass_lookup(command, answer):
+    device = _SubDevice(device_desc='description')
+    assert device.communicate(command) == answer
+
+def test_base_lookup_ignores_subclass():
+
+    device = _BaseDevice()
+
+    assert device.communicate('shared') == 'base'
+    assert device.communicate('sub-only') == 'Invalid command'
+    assert device.communicate('fall-through') == 'Invalid command'
+    assert device.communicate('device-type') == 'none'
+
+def test_extra_commands_are_looked_for_first():
+
+    device = _SubDevice()
+
+    assert device.command(['shared'], {'shared': lambda self: 'extra'}) == \
+        'extra'
+    assert device.command(['shared'], {'shared': lambda self: None}) == 'base'
+    assert device.command(['shared'], None) == 'base'
+
+def test_failing_command():
+
+    device = _SubDevice()
+    assert device.communicate('shared argument') == \
+        'An error ocurred running the command'
+
+def test_multi_sensor_redirect(ship):
+
+    sensor = PositionSensor(ship.accessDevice(0), 0.25)
+
+    assert sensor.communicate('reading-time') == '0.25'
+    assert sensor.communicate('reading-time') == \
+        sensor.accessDevice(0).communicate('reading-time')
+    assert sensor.communicate('device-type') == 'position-sensor'
+    assert sensor.communicate('device-count') == '2'
+
+@pytest.mark.parametrize('input_', [
+    'read',
+    '  set-property   intensity  0.5 ',
+    'a\tb\nc',
+    'say "hello world"',
+    "say 'it''s'",
+    'say it\\ is',
+    'say "quoted \\" quote"',
+    'vertical\x0btab',
+    'file\x1cseparator',
+    'ñandú 1',
+    'say "año nuevo"',
+    'no\u00a0break space',
+    'em\u2003space'
+])
+def test_split_command_matches_shlex(input_):
+    assert _splitCommand(input_) == shlex.split(input_)
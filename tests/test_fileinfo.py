@@ -0,0 +1,169 @@
+"""Tests of the content cache and the file index of `FileInfo`."""
+
+import os
+
+import pytest
+
+from src.storage.fileinfo import FileInfo
+
+def _write(path, text):
+    """Write a file making sure its modification time and the one of its
+    directory change, even on filesystems with a coarse resolution."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    times = [path.stat().st_mtime_ns] if path.exists() else []
+    times.append(path.parent.stat().st_mtime_ns)
+
+    path.write_text(text)
+
+    mtime = max(times) + 10**9
+    os.utime(path, ns=(mtime, mtime))
+    os.utime(path.parent, ns=(mtime, mtime))
+
+def _scenario(name, parent=None):
+
+    text = f'[Scenario]\nname = "{name}"\n'
+    if parent is not None:
+        text += f'\n[Inheritance]\nparent = "{parent}"\n'
+
+    return text
+
+def _newFileInfo(monkeypatch):
+    monkeypatch.setattr(FileInfo, '_FileInfo__instance', None)
+    return FileInfo()
+
+def _enablePersistentCache(home):
+
+    config = home.joinpath('.config/spaceshipcontrol/config.toml')
+    config.parent.mkdir(parents=True, exist_ok=True)
+    config.write_text('[Cache]\npersistent = true\n')
+
+def _scenariosPath(home):
+    return home.joinpath('.local/share/spaceshipcontrol/scenarios')
+
+def test_modified_file_is_read_again(home):
+
+    path = _scenariosPath(home).joinpath('test.toml')
+    _write(path, _scenario('first'))
+    assert FileInfo().loadScenario('test').name == 'first'
+
+    _write(path, _scenario('second'))
+    assert FileInfo().loadScenario('test').name == 'second'
+
+def test_modified_parent_is_read_again(home):
+
+    scenarios = _scenariosPath(home)
+    _write(scenarios.joinpath('base.toml'), _scenario('first'))
+    _write(scenarios.joinpath('child.toml'), '[Inheritance]\nparent = "base"\n')
+    assert FileInfo().loadScenario('child').name == 'first'
+
+    _write(scenarios.joinpath('base.toml'), _scenario('second'))
+    assert FileInfo().loadScenario('child').name == 'second'
+
+def test_file_with_preferred_suffix_shadows_cached_one(home):
+
+    scenarios = _scenariosPath(home)
+    _write(scenarios.joinpath('test.json'), '{"Scenario": {"name": "json"}}')
+    assert FileInfo().loadScenario('test').name == 'json'
+
+    _write(scenarios.joinpath('test.toml'), _scenario('toml'))
+    assert FileInfo().loadScenario('test').name == 'toml'
+
+def test_added_parent_is_found(home):
+
+    scenarios = _scenariosPath(home)
+    _write(scenarios.joinpath('child.toml'), '[Inheritance]\nparent = "base"\n')
+    with pytest.raises(Exception):
+        FileInfo().loadScenario('child')
+
+    _write(scenarios.joinpath('base.toml'), _scenario('base'))
+    assert FileInfo().loadScenario('child').name == 'base'
+
+def test_persistent_cache_is_checked_between_runs(home, monkeypatch):
+
+    _enablePersistentCache(home)
+    path = _scenariosPath(home).joinpath('test.toml')
+    _write(path, _scenario('first'))
+    assert _newFileInfo(monkeypatch).loadScenario('test').name == 'first'
+
+    _write(path, _scenario('second'))
+    assert _newFileInfo(monkeypatch).loadScenario('test').name == 'second'
+
+def test_variables_are_not_persisted(home, monkeypatch):
+
+    _enablePersistentCache(home)
+    _write(_scenariosPath(home).joinpath('test.toml'), _scenario('test'))
+    file_info = _newFileInfo(monkeypatch)
+    cache = home.joinpath('.local/share/spaceshipcontrol/cache')
+
+    file_info.loadScenario('test')
+    files = set(cache.rglob('*'))
+    assert files
+
+    for value in range(3):
+        file_info.loadScenario('test', variables={'value': value})
+    assert set(cache.rglob('*')) == files
+
+def test_directory_metadata_added_later_is_listed(home):
+
+    ships = home.joinpath('.local/share/spaceshipcontrol/ships')
+    _write(ships.joinpath('mine/ship.toml'), '')
+
+    def label():
+        tree = FileInfo().listFilesTree(FileInfo.FileDataType.SHIPMODEL)
+        for child in tree.children:
+            name = getattr(child.name, 'name', child.name)
+            if name == 'mine':
+                return getattr(child.name, 'label', None)
+        return None
+
+    assert label() is None
+
+    _write(ships.joinpath('mine/__metadata__.toml'), 'name = "Mine"\n')
+    assert label() == 'Mine'
+
+    _write(ships.joinpath('mine/__metadata__.toml'), 'name = "Changed"\n')
+    assert label() == 'Changed'
+
+def test_overrides_take_precedence(home):
+
+    _write(_scenariosPath(home).joinpath('test.toml'), """
+[Config]
+variables_enabled = true
+
+[[Variable]]
+id = 'label'
+value = 'file'
+
+[[Variable]]
+id = 'fixed'
+value = 'file'
+override = false
+
+[Scenario]
+name = 'format#{label} {fixed}'
+""")
+
+    file_info = FileInfo()
+    assert file_info.loadScenario('test').name == 'file file'
+    assert file_info.loadScenario(
+        'test', variables={'label': 'variable', 'fixed': 'variable'}).name \
+            == 'file variable'
+    assert file_info.loadScenario(
+        'test', overrides={'label': 'swept', 'fixed': 'swept'}).name \
+            == 'swept swept'
+
+def test_overrides_must_be_declared(home):
+
+    scenarios = _scenariosPath(home)
+    _write(scenarios.joinpath('enabled.toml'),
+           "[Config]\nvariables_enabled = true\n\n"
+           "[[Variable]]\nid = 'label'\nvalue = 'file'\n")
+    _write(scenarios.joinpath('disabled.toml'),
+           "[[Variable]]\nid = 'label'\nvalue = 'file'\n")
+
+    with pytest.raises(ValueError):
+        FileInfo().loadScenario('enabled', overrides={'other': 1})
+    with pytest.raises(ValueError):
+        FileInfo().loadScenario('disabled', overrides={'label': 1})
@@ -0,0 +1,93 @@
+"""Tests of the register files shared with the controllers."""
+
+import json
+import mmap
+import struct
+
+import pytest
+
+from src.simulation.registerfile import ShipRegisterFile
+
+_INT64 = struct.Struct('<q')
+_FLOAT64 = struct.Struct('<d')
+
+@pytest.fixture
+def ship_and_registers(ship, tmp_path):
+
+    registers = ShipRegisterFile(ship, str(tmp_path))
+    layout = json.loads(ship.getInfo('register-layout'))
+
+    with open(layout['path'], 'r+b') as file:
+        memory = mmap.mmap(file.fileno(), layout['size'])
+
+    yield ship, registers, layout, memory
+
+    memory.close()
+    registers.close()
+
+def _setActuator(memory, layout, key, value):
+
+    sequence_offset = layout['header']['actuators-sequence']
+    sequence, = _INT64.unpack_from(memory, sequence_offset)
+    _INT64.pack_into(memory, sequence_offset, sequence + 1)
+
+    _FLOAT64.pack_into(memory, layout['actuators'][key], value)
+    writes_offset = layout['actuator-writes'][key]
+    writes, = _INT64.unpack_from(memory, writes_offset)
+    _INT64.pack_into(memory, writes_offset, writes + 1)
+
+    _INT64.pack_into(memory, sequence_offset, sequence + 2)
+
+def test_sensors_not_read_until_mapped(ship_and_registers):
+
+    ship, registers, layout, memory = ship_and_registers
+    sensor = ship.accessDevice(0).accessDevice(0)
+    offset = layout['sensors']['0:0:']
+
+    calls = []
+    reading = sensor.reading
+    sensor.reading = lambda: calls.append(None) or reading()
+
+    registers.write(1, 0.1)
+    assert not calls
+    assert _INT64.unpack_from(memory, layout['header']['tick'])[0] == 0
+
+    _INT64.pack_into(memory, layout['header']['mapped'], 1)
+    registers.write(2, 0.2)
+    assert calls
+    assert _INT64.unpack_from(memory, layout['header']['tick'])[0] == 2
+    assert _FLOAT64.unpack_from(memory, offset)[0] == pytest.approx(0)
+
+def test_rewritten_setpoint_overrides_message(ship_and_registers):
+
+    ship, registers, layout, memory = ship_and_registers
+    engine = ship.accessDevice(0).accessDevice(2)
+    _INT64.pack_into(memory, layout['header']['mapped'], 1)
+
+    _setActuator(memory, layout, '0:2:intensity', 0.5)
+    registers.applySetpoints()
+    assert engine.getProperty('intensity') == pytest.approx(0.5)
+
+    # Set with a message, the register file must not overwrite it
+    engine.setProperty('intensity', 0.25)
+    registers.applySetpoints()
+    assert engine.getProperty('intensity') == pytest.approx(0.25)
+
+    # Writing the same value again through the register file applies it
+    _setActuator(memory, layout, '0:2:intensity', 0.5)
+    registers.applySetpoints()
+    assert engine.getProperty('intensity') == pytest.approx(0.5)
+
+def test_set_state_keeps_applied_writes(ship_and_registers):
+
+    ship, registers, layout, memory = ship_and_registers
+    engine = ship.accessDevice(0).accessDevice(2)
+    _INT64.pack_into(memory, layout['header']['mapped'], 1)
+    state = registers.getState()
+
+    _setActuator(memory, layout, '0:2:intensity', 0.5)
+    registers.setState(state)
+
+    engine.setProperty('intensity', 0.25)
+    registers.applySetpoints()
+    assert engine.getProperty('intensity') == pytest.approx(0.25)
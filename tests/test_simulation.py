@@ -0,0 +1,101 @@
+"""Tests of the simulation running the example scenarios."""
+
+import pytest
+
+from src.simulation.simulation import Simulation
+
+SCENARIO = 'examples/goals/objective_goto'
+
+def _bodyStates(simulation):
+    return [(tuple(ship.body.position), ship.body.angle,
+             tuple(ship.body.velocity), ship.body.angular_velocity)
+            for ship in simulation.ships]
+
+@pytest.fixture
+def simulation_factory(qt_application):
+
+    simulations = []
+
+    def create(**kwargs):
+        kwargs.setdefault('time_limit', 60)
+        simulation = Simulation(lockstep=True, **kwargs)
+        simulation.loadScenario(SCENARIO)
+        simulations.append(simulation)
+        return simulation
+
+    yield create
+
+    for simulation in simulations:
+        simulation.clear()
+
+def test_seeded_runs_are_reproducible(simulation_factory):
+
+    results = []
+    for _ in range(2):
+        simulation = simulation_factory(seed=7)
+        assert simulation.run()
+        results.append((simulation.statistics(), _bodyStates(simulation)))
+        simulation.clear()
+
+    assert results[0][0]['seed'] == 7
+    assert results[0] == results[1]
+
+def test_restart_restores_initial_state(simulation_factory):
+
+    simulation = simulation_factory(seed=7)
+    initial_bodies = _bodyStates(simulation)
+
+    assert simulation.run()
+    statistics = simulation.statistics()
+    bodies = _bodyStates(simulation)
+    assert bodies != initial_bodies
+
+    assert simulation.restart()
+    assert simulation.clock.tick == 0
+    assert simulation.clock.time == 0
+    assert simulation.objectives_result is None
+    assert _bodyStates(simulation) == initial_bodies
+
+    # The restarted scenario draws the same noise, so it ends the same way
+    assert simulation.run()
+    assert simulation.statistics() == statistics
+    assert _bodyStates(simulation) == bodies
+
+def test_restart_without_saved_state(qt_application):
+    assert not Simulation().restart()
+
+def test_swept_variable_reaches_the_ship(home, qt_application):
+
+    scenarios = home.joinpath('.local/share/spaceshipcontrol/scenarios')
+    scenarios.mkdir(parents=True, exist_ok=True)
+    scenarios.joinpath('sweep.toml').write_text("""
+[Config]
+variables_enabled = true
+
+[[Variable]]
+id = 'start_x'
+value = 0
+
+[Scenario]
+name = 'Sweep'
+
+[[Ship]]
+name = 'FireFive'
+model = 'examples/firefive'
+controller = 'examples/goals/firefive_goto.py'
+x = 'var# start_x'
+y = 0
+""")
+
+    simulation = Simulation()
+    try:
+        simulation.loadScenario('sweep')
+        assert tuple(simulation.ships[0].body.position) == (0, 0)
+
+        simulation.loadScenario('sweep', variables={'scenario': {'start_x': 25}})
+        assert tuple(simulation.ships[0].body.position) == (25, 0)
+
+        with pytest.raises(ValueError):
+            simulation.loadScenario('sweep', variables={'ship': {'start_x': 25}})
+    finally:
+        simulation.clear()
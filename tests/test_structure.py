@@ -0,0 +1,191 @@
+"""Tests of the commands of the ships."""
+
+import json
+
+import pytest
+
+from src.devices.device import DefaultDevice
+from src.devices.sensors import PositionSensor
+
+class _EchoDevice(DefaultDevice):
+
+    def act(self):
+        pass
+
+    __COMMANDS = {
+        'echo': lambda self, *args: ' '.join(args)
+    }
+
+def test_batch_answers(ship):
+
+    answer = ship.communicate(
+        "batch 'body:engine:set-property intensity 0.5' "
+        "'body:engine:get-property intensity' 'body:x:read' "
+        "'0:2:device-type'")
+
+    assert answer == "'<<OK>>' 0.5 0.0 linear-engine"
+
+def test_batch_invalid_device(ship):
+
+    answer = ship.query("batch 'body:x:read' 'nope:read' '@9:read' "
+                        "'body:angle:device-type'")
+
+    assert answer == [0.0, 'Invalid device', 'Invalid device', 'angle-sensor']
+    assert ship.communicate("batch 'nope:read' 'body:x:read'") == \
+        "'Invalid device' 0.0"
+
+def test_empty_batch(ship):
+    assert ship.communicate('batch') == ''
+
+@pytest.mark.parametrize('path', [
+    'body', '0', 'body:x', '0:0', 'body:engine', '0:2', 'body:2', '0:engine'
+])
+def test_handle_addresses_path(ship, path):
+
+    handle = ship.communicate(f'open {path}')
+
+    assert handle == ship.communicate(f'open {path}:')
+    assert ship.communicate(f'@{handle}:device-type') == \
+        ship.communicate(f'{path}:device-type')
+    assert ship.communicate(f'@{handle}:get-info device-name-in-group') == \
+        ship.communicate(f'{path}:get-info device-name-in-group')
+
+def test_handle_shares_state_with_path(ship):
+
+    handle = ship.communicate('open body:engine')
+
+    assert ship.communicate(f'@{handle}:set-property intensity 0.25') == \
+        '<<OK>>'
+    assert ship.communicate('body:engine:get-property intensity') == '0.25'
+    assert ship.communicate('0:2:set-property intensity 0.75') == '<<OK>>'
+    assert ship.communicate(f'@{handle}:get-property intensity') == '0.75'
+
+@pytest.mark.parametrize('command', [
+    'open nope', 'open body:nope', 'open body:x:0', '@9:read', '@-1:read',
+    '@body:read', '@1'
+])
+def test_invalid_handle(ship, command):
+    assert ship.communicate(command) == 'Invalid device'
+
+def test_arguments_with_separator(ship):
+
+    part = ship.accessDevice(0)
+    part.addDevice(_EchoDevice(), name='echo')
+
+    # The text before the last ':' is not a path, so the command is resolved
+    # one level at a time
+    assert ship.communicate('body:echo:echo a:b') == 'a:b'
+    assert ship.communicate('0:3:echo body:x') == 'body:x'
+    assert ship.communicate("body:echo:echo 'c d:e'") == 'c d:e'
+    assert ship.communicate('body:engine:set-property intensity 0:5') == \
+        'An error ocurred running the command'
+
+def _walk(description):
+
+    yield description
+    for child in description.get('children', ()):
+        yield from _walk(child)
+
+def test_describe_tree(ship):
+
+    tree = json.loads(ship.communicate('describe-tree'))
+
+    assert tree['type'] == 'structure'
+    assert tree['handle'] == 0
+    assert tree['info']['is-device-group'] == 'yes'
+
+    part, = tree['children']
+    assert part['type'] == 'structural-part'
+    assert part['name'] == 'body'
+    assert part['handle'] == int(ship.communicate('open body'))
+
+    assert [child['name'] for child in part['children']] == \
+        ['x', 'angle', 'engine']
+    for child in part['children']:
+        assert child['handle'] == \
+            int(ship.communicate(f'open body:{child["name"]}'))
+        assert child['type'] == \
+            ship.communicate(f'body:{child["name"]}:device-type')
+        assert 'children' not in child
+
+    x_sensor, _, engine = part['children']
+    assert x_sensor['reading-time'] == 0
+    assert x_sensor['max-error'] is None
+    assert x_sensor['max-offset'] is None
+    assert 'reading-time' not in engine
+    assert engine['properties'] == ['intensity', 'angle']
+
+def test_describe_tree_keys(ship):
+
+    tree = json.loads(ship.communicate('describe-tree'))
+    descriptions = list(_walk(tree))
+
+    assert sorted(description['handle'] for description in descriptions) == \
+        list(range(5))
+    for description in descriptions:
+        assert {'type', 'description', 'name', 'info', 'properties',
+                'handle'} <= description.keys()
+
+def _subscribedHandles(ship, ticks):
+    return [[handle for handle, _ in ship.subscriptionReadings(tick)]
+            for tick in ticks]
+
+def test_subscription_period(ship):
+
+    assert ship.communicate('subscribe body:x every 2') == '2'
+    assert ship.communicate('subscribe body:angle every 3 ticks') == '3'
+
+    assert _subscribedHandles(ship, range(1, 7)) == \
+        [[], [2], [3], [2], [], [2, 3]]
+
+def test_subscription_default_period(ship):
+
+    assert ship.communicate('subscribe body:x') == '2'
+    assert ship.communicate('subscribe 0:1 every 1 tick') == '3'
+
+    assert _subscribedHandles(ship, range(1, 4)) == [[2, 3]] * 3
+
+def test_subscription_new_period(ship):
+
+    ship.communicate('subscribe body:x every 2')
+    ship.communicate('subscribe body:x every 3')
+
+    assert _subscribedHandles(ship, range(1, 7)) == \
+        [[], [], [2], [], [], [2]]
+
+def test_subscription_readings(ship):
+
+    ship.body.position = (3, 0)
+    ship.communicate('subscribe body:x every 2')
+
+    assert ship.subscriptionReadings(4) == [(2, 3)]
+
+@pytest.mark.parametrize('period', [
+    'every', 'every 0', 'every -1', 'every two', 'each 2', 'every 2 seconds',
+    'every 2 ticks more'
+])
+def test_subscription_invalid_period(ship, period):
+
+    assert ship.communicate(f'subscribe body:x {period}') == \
+        'An error ocurred running the command'
+    assert not ship.hasSubscriptions()
+
+def test_subscription_multi_sensor(ship):
+
+    part = ship.accessDevice(0)
+    part.addDevice(PositionSensor(part, 0), name='position')
+
+    assert ship.communicate('subscribe body:position every 2') == '6 7'
+    assert _subscribedHandles(ship, range(1, 3)) == [[], [6, 7]]
+    assert ship.communicate('subscribe body:engine') == '<<Not a sensor>>'
+    assert ship.communicate('subscribe nope') == 'Invalid device'
+
+def test_unsubscribe(ship):
+
+    ship.communicate('subscribe body:x every 2')
+    ship.communicate('subscribe body:angle')
+
+    assert ship.communicate('unsubscribe body:x') == '<<OK>>'
+    assert _subscribedHandles(ship, range(1, 3)) == [[3], [3]]
+    assert ship.communicate('unsubscribe') == '<<OK>>'
+    assert not ship.hasSubscriptions()